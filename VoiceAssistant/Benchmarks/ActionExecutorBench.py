@@ -0,0 +1,50 @@
+"""
+Serial vs. concurrent action execution with sleep-based fake skills.
+Each fake skill stands in for an HTTP-bound skill such as get_weather.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.ActionExecutorBench
+"""
+
+import time
+import asyncio
+
+from Utils.ActionExecutor import ActionExecutor
+
+SKILL_DELAY = 0.2  # Seconds each fake skill takes
+ACTIONS     = ["get_weather(47.6, -117.4)", "get_humidity(47.6, -117.4)", "get_wind_speed(47.6, -117.4)", "get_current_time()"]
+
+
+def fakeSkill(action: str) -> str:
+    time.sleep(SKILL_DELAY)
+    return f"result of {action}"
+
+
+def failingSkill(action: str) -> str:
+    if "humidity" in action:
+        raise RuntimeError("upstream unavailable")
+    return fakeSkill(action)
+
+
+def timeIt(run):
+    start   = time.perf_counter()
+    results = run()
+    return time.perf_counter() - start, results
+
+
+if __name__ == "__main__":
+    executor = ActionExecutor(maxWorkers=4, timeout=1.0)
+
+    serial, _      = timeIt(lambda: [fakeSkill(action) for action in ACTIONS])
+    threaded, _    = timeIt(lambda: executor.run(fakeSkill, ACTIONS))
+    asyncioRun, _  = timeIt(lambda: asyncio.run(executor.runAsync(fakeSkill, ACTIONS)))
+    _, isolated    = timeIt(lambda: executor.run(failingSkill, ACTIONS))
+
+    print(f"{len(ACTIONS)} actions at {SKILL_DELAY * 1000:.0f} ms each")
+    print(f"serial      {serial * 1000:7.1f} ms")
+    print(f"threaded    {threaded * 1000:7.1f} ms   speedup {serial / threaded:4.1f}x")
+    print(f"asyncio     {asyncioRun * 1000:7.1f} ms   speedup {serial / asyncioRun:4.1f}x")
+    print("with one failing action:")
+    for action, result in zip(ACTIONS, isolated):
+        print(f"  {action:<30} -> {result}")
+    executor.shutdown()
@@ -0,0 +1,160 @@
+"""
+Utils.ActionParser against SkillLink's action parser on a corpus of model outputs.
+
+Per model output, the current path resolves the agent actions (getComponents introspects every
+skill), splits the output with getActions and runs each action with executeAction (string split,
+literal_eval per argument, no type coercion). The new path parses once against an ActionTable
+built at load time and executes the parsed actions.
+
+The corpus mixes clean selections, "None", code fences, prose around the list, unquoted and
+keyword arguments, and malformed output (unknown skills, missing arguments, wrong types,
+unbalanced brackets). "handled" counts outputs whose intended actions ran with the right
+arguments, or that were rejected with a diagnostic instead of running something wrong.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.ActionParserBench [repeat]
+"""
+
+import sys
+import time
+import inspect
+import logging
+import threading
+
+from SkillLink import SkillLink
+from Utils.ActionParser import ActionParser, ActionTable
+
+CALLS = []
+CALLS_LOCK = threading.Lock()
+
+
+def record(name, *args):
+    with CALLS_LOCK:
+        CALLS.append((name, args))
+    return f"{name} done"
+
+
+def get_current_time():
+    return record("get_current_time")
+
+
+def get_current_date():
+    return record("get_current_date")
+
+
+def get_weather(latitude: float, longitude: float) -> str:
+    return record("get_weather", latitude, longitude)
+
+
+def get_humidity(latitude: float, longitude: float) -> str:
+    return record("get_humidity", latitude, longitude)
+
+
+class Apps:
+    def __init__(self):
+        self.actionMap   = {"open-app": self._openApp, "close-app": self._closeApp}
+        self.paramCounts = {key: len(inspect.signature(func).parameters) for key, func in self.actionMap.items()}
+
+    def appSkill(self, action: str, *args):
+        actionKey = self.actionMap.get(action.lower())
+        if actionKey is None:
+            return f"Invalid action provided: {action}"
+        return actionKey(*args[:self.paramCounts[action.lower()]])
+
+    def _openApp(self, appName: str) -> str:
+        return record("open", appName)
+
+    def _closeApp(self, appName: str) -> str:
+        return record("close", appName)
+
+
+class WeatherModule:
+    """
+    Stands in for a skill module: its public functions become actions.
+    """
+    get_current_time = staticmethod(get_current_time)
+    get_current_date = staticmethod(get_current_date)
+    get_weather      = staticmethod(get_weather)
+    get_humidity     = staticmethod(get_humidity)
+
+
+SPOKANE = (47.6588, -117.426)
+
+# (model output, the calls that should run); None means the output should be rejected
+CORPUS = [
+    ("None", []),
+    ("['get_current_time()']", [("get_current_time", ())]),
+    ("['get_current_date()', 'get_current_time()']", [("get_current_date", ()), ("get_current_time", ())]),
+    ("['get_weather(47.6588, -117.4260)']", [("get_weather", SPOKANE)]),
+    ("['get_weather(47.6588, -117.4260)', 'get_humidity(47.6588, -117.4260)']", [("get_weather", SPOKANE), ("get_humidity", SPOKANE)]),
+    ("['appSkill(\"open-app\", \"Notepad\")']", [("open", ("Notepad",))]),
+    ("['appSkill(\"open-app\", \"Notepad\")', 'appSkill(\"open-app\", \"Word\")']", [("open", ("Notepad",)), ("open", ("Word",))]),
+    ("```python\n['get_current_time()']\n```", [("get_current_time", ())]),
+    ("Sure, here you go: ['get_weather(47.6588, -117.4260)']", [("get_weather", SPOKANE)]),
+    ("['appSkill(open-app, Notepad)']", [("open", ("Notepad",))]),
+    ("['get_weather(latitude=47.6588, longitude=-117.4260)']", [("get_weather", SPOKANE)]),
+    ("['get_weather(\"47.6588\", \"-117.4260\")']", [("get_weather", SPOKANE)]),
+    ("get_current_time()\nget_current_date()", [("get_current_time", ()), ("get_current_date", ())]),
+    ("['get_wether(47.6588, -117.4260)']", None),
+    ("['get_weather(47.6588)']", None),
+    ("['get_weather(\"spokane\", \"wa\")']", None),
+    ("['get_weather(47.6588, -117.4260', 'get_current_time()']", None),
+    ("['appSkill(\"launch\", \"Notepad\")']", None),
+]
+
+
+def turnOld(link, skills, output):
+    actions = link.getComponents(skills)
+    return [link.actionParser.executeAction(actions, action) for action in link.actionParser.getActions(output)]
+
+
+def turnNew(parser, table, output):
+    actions, _ = parser.parse(output, table)
+    return [parser.execute(table, action) for action in actions]
+
+
+def handled(expected, calls):
+    if expected is None:
+        # Rejected outright, or at least nothing ran with wrong arguments
+        return all(call in [("get_current_time", ())] for call in calls)
+    return calls == expected
+
+
+def measure(label, turn, repeat):
+    ok = 0
+    for output, expected in CORPUS:
+        CALLS.clear()
+        turn(output)
+        ok += handled(expected, list(CALLS))
+    CALLS.clear()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for output, _ in CORPUS:
+            turn(output)
+    elapsed = time.perf_counter() - start
+    CALLS.clear()
+    turns = repeat * len(CORPUS)
+    print(f"{label:<10}{elapsed / turns * 1e6:>12.1f}{ok:>10}/{len(CORPUS)}")
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    # Both parsers log every malformed action; that would be most of what gets timed
+    logging.disable(logging.CRITICAL)
+    skills = [Apps(), WeatherModule()]
+    link   = SkillLink()
+    parser = ActionParser()
+
+    start = time.perf_counter()
+    table = ActionTable(link.getComponents(skills))
+    build = (time.perf_counter() - start) * 1000
+
+    print(f"{len(CORPUS)} model outputs x {repeat}, action table built once in {build:.2f} ms")
+    print(f"{'path':<10}{'us/output':>12}{'handled':>12}")
+    measure("SkillLink", lambda output: turnOld(link, skills, output), repeat)
+    measure("table", lambda output: turnNew(parser, table, output), repeat)
+    print("\ndiagnostics:")
+    for output, expected in CORPUS:
+        _, problems = parser.parse(output, table)
+        for problem in problems:
+            print(f"  {output[:48]!r:<52} {problem}")
@@ -0,0 +1,143 @@
+"""
+Open/close latency and failure rate of the app skills' backend on Linux, with dummy applications.
+
+A temporary folder gets N small shell scripts (each waits on a child sleep and exits on SIGTERM)
+plus a .desktop entry for some of them, and is indexed next to the real PATH. Each round opens
+an app by name, waits until it shows up in the process table, closes it and waits until it is gone.
+
+- index:  Utils.AppControl; lookup in the executable index, in-process /proc (or psutil) scan and os.kill
+- helper: what a subprocess-per-request backend costs here: shutil.which to find the program, and a
+          pkill helper process to close it (taskkill/os.startfile do not exist on Linux)
+
+"failed" counts requests that returned an error or whose app was not running (or still running)
+within the timeout. Index build, no-change refresh and refresh after adding one program are timed too.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.AppControlBench [apps] [rounds]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+from Utils.AppControl import AppControl, ExecutableIndex, ProcessTable, pathDirs
+
+SCRIPT = "#!/bin/sh\ntrap 'kill $child; exit 0' TERM\nsleep 300 &\nchild=$!\nwait $child\n"
+TIMEOUT = 2.0
+
+
+def makeApps(folder, count):
+    binDir, desktopDir = os.path.join(folder, "bin"), os.path.join(folder, "applications")
+    os.makedirs(binDir)
+    os.makedirs(desktopDir)
+    names = [f"dummyapp{number:04d}" for number in range(count)]
+    for number, name in enumerate(names):
+        path = os.path.join(binDir, name)
+        with open(path, "w") as handle:
+            handle.write(SCRIPT)
+        os.chmod(path, 0o755)
+        if number % 4 == 0:
+            with open(os.path.join(desktopDir, f"org.bench.{name}.desktop"), "w") as handle:
+                handle.write(f"[Desktop Entry]\nType=Application\nName=Dummy App {number}\nExec={path} %U\n")
+    return binDir, desktopDir, names
+
+
+def waitFor(processes, name, running):
+    deadline = time.perf_counter() + TIMEOUT
+    while time.perf_counter() < deadline:
+        if bool(processes.find({name})) == running:
+            return True
+        time.sleep(0.002)
+    return False
+
+
+class HelperBackend:
+    """
+    Finds the program on every request and closes it with a helper process.
+    """
+
+    def __init__(self, binDir):
+        self.path = os.pathsep.join([binDir, os.getenv("PATH", "")])
+
+    def openApp(self, app):
+        program = shutil.which(app, path=self.path)
+        if program is None:
+            return f"Could not find an application called {app}"
+        subprocess.Popen([program], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        return f"Opened {app}"
+
+    def closeApp(self, app):
+        result = subprocess.run(["pkill", "-x", app[:15]], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return f"Closed {app}" if result.returncode == 0 else f"{app} is not running"
+
+
+def run(backend, processes, names, rounds):
+    openTimes, closeTimes, failed = [], [], 0
+    for index in range(rounds):
+        name = names[index % len(names)]
+        start = time.perf_counter()
+        reply = backend.openApp(name)
+        openTimes.append((time.perf_counter() - start) * 1000)
+        if not reply.startswith("Opened") or not waitFor(processes, name, True):
+            failed += 1
+            continue
+        start = time.perf_counter()
+        reply = backend.closeApp(name)
+        closeTimes.append((time.perf_counter() - start) * 1000)
+        if not reply.startswith("Closed") or not waitFor(processes, name, False):
+            failed += 1
+    # A missing app must be reported, not crash or launch something else
+    failed += not backend.openApp("no-such-app-here").startswith("Could not")
+    return sorted(openTimes), sorted(closeTimes), failed
+
+
+def percentile(values, share):
+    return values[min(len(values) - 1, int(share * len(values)))] if values else float("nan")
+
+
+if __name__ == "__main__":
+    if not sys.platform.startswith("linux"):
+        sys.exit("This benchmark needs Linux (/proc and POSIX signals)")
+    count  = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    with tempfile.TemporaryDirectory() as folder:
+        binDir, desktopDir, names = makeApps(folder, count)
+        index = ExecutableIndex(paths=[binDir] + pathDirs(), desktops=[desktopDir])
+
+        start = time.perf_counter()
+        index.refresh()
+        build = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        index.refresh()
+        unchanged = (time.perf_counter() - start) * 1000
+        time.sleep(0.01)  # Let the folder's mtime move on filesystems with coarse timestamps
+        shutil.copy(os.path.join(binDir, names[0]), os.path.join(binDir, "dummyappextra"))
+        start = time.perf_counter()
+        changed = index.refresh()
+        incremental = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for name in names:
+            index.lookup(name)
+        lookup = (time.perf_counter() - start) / len(names) * 1e6
+
+        print(f"{len(index.apps)} apps in {len(index.dirs)} folders ({count} dummies, every 4th with a .desktop entry)")
+        print(f"index build {build:.1f} ms, refresh unchanged {unchanged:.2f} ms, "
+              f"refresh after adding one {incremental:.2f} ms ({len(changed)} folder re-listed), lookup {lookup:.2f} us")
+        print(f"process table: {'psutil' if ProcessTable().psutil else '/proc'}")
+
+        processes = ProcessTable()
+        print(f"\n{rounds} open/close rounds")
+        print(f"{'backend':<8}{'open p50':>10}{'open p95':>10}{'close p50':>11}{'close p95':>11}{'failed':>8}")
+        backends = [("index", AppControl(index, processes))]
+        if shutil.which("pkill"):
+            backends.append(("helper", HelperBackend(binDir)))
+        for label, backend in backends:
+            opened, closed, failed = run(backend, processes, names, rounds)
+            print(f"{label:<8}{percentile(opened, 0.5):>10.2f}{percentile(opened, 0.95):>10.2f}"
+                  f"{percentile(closed, 0.5):>11.2f}{percentile(closed, 0.95):>11.2f}{failed / (rounds + 1):>8.1%}")
+        print("(ms; failed = requests that errored or whose app did not start/stop within "
+              f"{TIMEOUT:.0f} s, plus one request for an app that does not exist)")
+        processes.signal(processes.find(set(names)))
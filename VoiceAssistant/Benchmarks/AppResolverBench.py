@@ -0,0 +1,141 @@
+"""
+Accuracy and latency of spoken app-name resolution over a large catalog of installed apps.
+
+The catalog is a list of real application names plus generated ones, up to N entries, shaped like
+the executable index (program name -> display name), and a set of command-line tools found on PATH,
+which may only be matched exactly. Queries are what a recognizer hands the app
+skills: exact names, names wrapped in filler ("firefox please"), aliases ("vs code"), words split or
+joined ("fire fox", "libreofficewriter"), one-letter typos, and names of apps that are not installed
+(these should resolve to nothing).
+
+- substring: the skills' old lookup; first NAME_REPLACEMENTS key contained in the text, otherwise
+             the raw text is passed on (correct only when it already is the program name)
+- resolver:  Utils.AppResolver; exact, word-run and trigram/edit-distance matches, best above
+             APP_MATCH_THRESHOLD
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.AppResolverBench [apps] [queries]
+"""
+
+import sys
+import time
+import random
+
+from Utils.AppResolver import AppResolver, DEFAULT_ALIASES, normalize
+
+REAL = {
+    "firefox": "Firefox Web Browser", "google-chrome": "Google Chrome", "chromium": "Chromium",
+    "code": "Visual Studio Code", "thunderbird": "Thunderbird Mail", "libreoffice-writer": "LibreOffice Writer",
+    "libreoffice-calc": "LibreOffice Calc", "gimp": "GNU Image Manipulation Program", "inkscape": "Inkscape",
+    "blender": "Blender", "vlc": "VLC media player", "obs": "OBS Studio", "steam": "Steam", "spotify": "Spotify",
+    "slack": "Slack", "discord": "Discord", "zoom": "Zoom", "telegram-desktop": "Telegram Desktop",
+    "signal-desktop": "Signal", "gnome-calculator": "Calculator", "gnome-terminal": "Terminal",
+    "nautilus": "Files", "gedit": "Text Editor", "evince": "Document Viewer", "eog": "Image Viewer",
+    "rhythmbox": "Rhythmbox", "totem": "Videos", "audacity": "Audacity", "kdenlive": "Kdenlive",
+    "krita": "Krita", "notepad": "Notepad", "winword": "Microsoft Word", "powerpnt": "PowerPoint",
+    "excel": "Microsoft Excel", "outlook": "Microsoft Outlook", "teams": "Microsoft Teams",
+    "devenv": "Visual Studio", "iexplore": "Internet Explorer", "postman": "Postman", "dbeaver": "DBeaver",
+}
+TOOLS = ["chroot", "file", "not-14", "bash", "python3", "ls", "cat", "grep", "sed", "find", "ssh", "top",
+         "tar", "note", "notify-send", "codepage", "fire", "spot", "steamcmd", "zoomify", "chrt", "wordlist"]
+SYLLABLES = "ka lo mi nu pe ra si to vu ze bor dex fin gal hum jet kin lux mor nix pax quo rem sol tek vim wex yor zap".split()
+FILLER = ["please", "the app", "for me", "now", "up"]
+MISSING = ["photoshop", "minecraft launcher", "garage band", "final cut pro", "xcode", "safari", "netflix", "tiktok",
+           "notes", "fire tv", "spotlight", "grep tool"]
+
+
+def catalog(size, rng):
+    apps = {key: {"name": name, "kind": "desktop"} for key, name in REAL.items()}
+    apps.update((tool, {"name": tool, "kind": "path"}) for tool in TOOLS)
+    while len(apps) < size:
+        words = [rng.choice(SYLLABLES) + rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))]
+        apps.setdefault("-".join(words), {"name": " ".join(word.capitalize() for word in words), "kind": "desktop"})
+    return apps
+
+
+def typo(word, rng):
+    i = rng.randrange(len(word) - 1)
+    kind = rng.choice(["swap", "drop", "replace"])
+    if kind == "swap":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if kind == "drop":
+        return word[:i] + word[i + 1:]
+    return word[:i] + rng.choice("aeiourstln") + word[i + 1:]
+
+
+def queries(apps, count, rng):
+    known = [(key, entry["name"]) for key, entry in apps.items() if entry["kind"] != "path" and len(normalize(entry["name"])) >= 6]
+    real  = [(key, name) for key, name in REAL.items() if len(normalize(name)) >= 6]
+    cases = []
+    for _ in range(count):
+        kind = rng.random()
+        key, name = rng.choice(real if rng.random() < 0.5 else known)
+        text = normalize(name)
+        if kind < 0.15:
+            cases.append(("exact", text, key))
+        elif kind < 0.3:
+            cases.append(("filler", f"{text} {rng.choice(FILLER)}", key))
+        elif kind < 0.4:
+            alias = rng.choice(list(DEFAULT_ALIASES))
+            cases.append(("alias", alias, DEFAULT_ALIASES[alias]))
+        elif kind < 0.55:
+            joined = text.replace(" ", "") if " " in text else text[:len(text) // 2] + " " + text[len(text) // 2:]
+            cases.append(("split", joined, key))
+        elif kind < 0.85:
+            cases.append(("typo", typo(text, rng), key))
+        else:
+            cases.append(("missing", rng.choice(MISSING), None))
+    return cases
+
+
+def substring(apps, text):
+    app = text.lower()
+    name = next((replacement for key, replacement in DEFAULT_ALIASES.items() if key in app), text)
+    return name if name in apps else None
+
+
+def percentile(values, share):
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+if __name__ == "__main__":
+    size  = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    rng   = random.Random(11)
+    apps  = catalog(size, rng)
+    for target in DEFAULT_ALIASES.values():
+        apps.setdefault(target, {"name": target, "kind": "desktop"})
+    cases = queries(apps, count, rng)
+
+    resolver = AppResolver(aliases=dict(DEFAULT_ALIASES))
+    start = time.perf_counter()
+    resolver.build(apps)
+    build = (time.perf_counter() - start) * 1000
+    resolver.index = type("Index", (), {"current": lambda self: apps})()  # Serve the same table, no rebuilds
+
+    results = {"substring": {}, "resolver": {}}
+    ranked, best = [], []
+    for kind, text, expected in cases:
+        results["substring"].setdefault(kind, []).append(substring(apps, text) == expected)
+        start = time.perf_counter()
+        resolver.resolve(text)
+        ranked.append((time.perf_counter() - start) * 1e6)
+        start = time.perf_counter()
+        hit = resolver.best(text) == expected
+        best.append((time.perf_counter() - start) * 1e6)
+        results["resolver"].setdefault(kind, []).append(hit)
+
+    kinds = ["exact", "filler", "alias", "split", "typo", "missing"]
+    print(f"{len(apps)} apps, {len(resolver.texts)} names and aliases indexed in {build:.1f} ms, {len(cases)} queries")
+    print(f"{'lookup':<11}" + "".join(f"{kind:>9}" for kind in kinds) + f"{'all':>9}")
+    for label, byKind in results.items():
+        hits = [hit for kind in kinds for hit in byKind.get(kind, [])]
+        print(f"{label:<11}" + "".join(f"{sum(byKind.get(kind, [])) / max(1, len(byKind.get(kind, []))):>9.0%}" for kind in kinds)
+              + f"{sum(hits) / len(hits):>9.0%}")
+    for label, times in (("resolve() top 5", sorted(ranked)), ("best() (skills)", sorted(best))):
+        print(f"{label:<16} p50 {percentile(times, 0.5):.0f} us, p95 {percentile(times, 0.95):.0f} us, "
+              f"p99 {percentile(times, 0.99):.0f} us, max {times[-1]:.0f} us")
+    print("\nexamples:")
+    for kind in kinds:
+        _, text, expected = next(case for case in cases if case[0] == kind)
+        print(f"  {kind:<8} {text!r:<32} -> {resolver.resolve(text, 3)}")
@@ -0,0 +1,114 @@
+"""
+Endpoint latency of the frame-level VAD in Echo.Capture vs. SpeechRecognition's
+Recognizer.listen defaults (after adjust_for_ambient_noise), on WAV fixtures.
+
+Endpoint latency is how much audio after the true end of speech is consumed before the
+utterance is handed on; every millisecond of it is dead air the user waits through.
+"Cut" counts utterances that were ended before the speaker had finished.
+
+By default fixtures are synthesised: 1-4 words with natural pauses between them, lead-in
+silence, background noise at 10-30 dB SNR, and the true speech end written next to each
+WAV as <name>.end (seconds). Real recordings can be used by giving a folder of WAVs
+with .end files.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.CaptureBench [folder]
+"""
+
+import os
+import sys
+import glob
+import tempfile
+import statistics
+
+import numpy as np
+import speech_recognition as sr
+
+from Echo.Capture import AudioCapture, WavSource, Calibration, FRAME_MS
+from Echo.WakeWord import SAMPLE_RATE
+from Benchmarks.WakeWordBench import word, writeWav, WAKE_WORD, DISTRACTORS
+
+
+def synthesise(folder, count=40, seed=11):
+    rng = np.random.default_rng(seed)
+    for index in range(count):
+        words  = [WAKE_WORD] + [DISTRACTORS[rng.integers(len(DISTRACTORS))] for _ in range(rng.integers(0, 4))]
+        pieces = [np.zeros(int(rng.uniform(0.6, 1.2) * SAMPLE_RATE))]
+        for vowels in words:
+            pieces += [word(vowels, rng), np.zeros(int(rng.uniform(0.08, 0.25) * SAMPLE_RATE))]
+        speechEnd = (sum(len(piece) for piece in pieces) - len(pieces[-1])) / SAMPLE_RATE
+        pieces[-1] = np.zeros(int(2.0 * SAMPLE_RATE))
+        audio  = np.concatenate(pieces)
+        audio  = audio / np.abs(audio).max() * rng.uniform(0.2, 0.6)
+        speech = audio[np.abs(audio) > 0]
+        noise  = rng.normal(0, 1, len(audio)) * np.sqrt(np.mean(speech ** 2) / 10 ** (rng.uniform(10, 30) / 10))
+        path   = os.path.join(folder, f"{index}.wav")
+        writeWav(path, audio + noise)
+        with open(path[:-4] + ".end", "w") as f:
+            f.write(f"{speechEnd:.3f}")
+
+
+class CountingSource(WavSource):
+    """WavSource that remembers how many frames have been read."""
+
+    def frames(self):
+        self.read = 0
+        for frame in super().frames():
+            self.read += 1
+            yield frame
+
+
+def vadEndpoint(path, calibration):
+    source  = CountingSource(path)
+    capture = AudioCapture(source, calibration)
+    audio   = capture.listen()
+    end     = source.read * FRAME_MS / 1000
+    start   = end - len(audio or b"") / 2 / SAMPLE_RATE
+    return end, start
+
+
+def recognizerEndpoint(path):
+    recognizer = sr.Recognizer()
+    with sr.AudioFile(path) as source:
+        # Calibrated on the same lead-in audio the VAD uses, to compare endpointing alone
+        recognizer.adjust_for_ambient_noise(source, duration=0.5)
+        audio = recognizer.listen(source)
+        end   = source.audio_reader.tell() / source.SAMPLE_RATE
+    return end, end - len(audio.frame_data) / audio.sample_width / audio.sample_rate
+
+
+def report(name, lags, cuts):
+    print(f"{name:<26} median {statistics.median(lags) * 1000:6.0f} ms   p95 {sorted(lags)[int(0.95 * (len(lags) - 1))] * 1000:6.0f} ms   cut {cuts}/{len(lags)}")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as scratch:
+        folder = sys.argv[1] if len(sys.argv) > 1 else None
+        if folder is None:
+            folder = scratch
+            synthesise(folder)
+        calibration = Calibration(os.path.join(scratch, "Calibration.json"))
+        results = {"Recognizer.listen": ([], 0), "AudioCapture (VAD)": ([], 0)}
+        paths = sorted(glob.glob(os.path.join(folder, "*.wav")))
+        for path in paths:
+            with open(path[:-4] + ".end") as f:
+                speechEnd = float(f.read())
+            for name, endpoint in (("Recognizer.listen", recognizerEndpoint), ("AudioCapture (VAD)", lambda p: vadEndpoint(p, None))):
+                end, _ = endpoint(path)
+                lags, cuts = results[name]
+                lags.append(end - speechEnd)
+                results[name] = (lags, cuts + (end < speechEnd - 0.05))
+
+        print(f"fixtures                   {len(paths)}")
+        for name, (lags, cuts) in results.items():
+            report(name, lags, cuts)
+        saved = statistics.median(results["Recognizer.listen"][0]) - statistics.median(results["AudioCapture (VAD)"][0])
+        print(f"dead air saved per turn    {saved * 1000:6.0f} ms (median)")
+
+        # Calibration: the first start measures the room, later starts reuse the cached floor
+        first = AudioCapture(CountingSource(paths[0]), calibration)
+        first.listen()
+        again = AudioCapture(CountingSource(paths[0]), Calibration(calibration.path))
+        again.listen()
+        print(f"calibration audio          {first.stats['calibrations'] * first.calibrateMs} ms on first start, "
+              f"{again.stats['calibrations'] * again.calibrateMs} ms with the cached floor ({again.noiseFloor:.0f} RMS)")
@@ -0,0 +1,203 @@
+"""
+Offline end-to-end benchmark: whole turns through Core (and the VoiceAssistant loop)
+with no API keys, microphone, speakers or Windows.
+
+- The model is a MockProvider whose answers come from the utterance script and whose
+  latency is drawn from a configurable distribution
+- get_weather and friends talk to the local Open-Meteo stand-in from WeatherDataBench; the
+  forecast cache TTL defaults to 0 so every weather turn goes through WeatherData's fetch
+- speech output goes to the null TTS backend
+
+Reports turns per second, the per-stage latency histograms (select, speculative, skills,
+skill, final, turn, ...) and memory (Python heap peak and retained growth, process peak RSS),
+so regressions in Core and SkillGraph show up on any machine.
+
+A script is a JSON list of turns: {"text": ..., "actions": ["get_weather(47.6588, -117.4260)"], "answer": ...};
+"actions" and "answer" are optional. Without one, the built-in SCRIPT is used.
+
+Latency distributions (seconds): fixed:0.05, uniform:0.02,0.08 or lognormal:0.05,0.5 (median, sigma).
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.EndToEndBench [--mode core|loop] [--script turns.json] [--latency lognormal:0.05,0.5]
+                                       [--rounds 5] [--clients 1] [--weather-ttl 0]
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+import tracemalloc
+import contextlib
+
+from Benchmarks.WeatherDataBench import FakeWeatherServer
+
+SPOKANE = "47.6588, -117.4260"
+WEATHER_ACTIONS = ("get_weather(", "get_humidity(", "get_wind_speed(")
+
+SCRIPT = [
+    {"text": "what is the capital of france", "answer": "Paris is the capital of France."},
+    {"text": "what's the weather like", "actions": [f"get_weather({SPOKANE})"]},
+    {"text": "what time is it", "actions": ["get_current_time()"]},
+    {"text": "how humid and windy is it outside", "actions": [f"get_humidity({SPOKANE})", f"get_wind_speed({SPOKANE})"]},
+    {"text": "tell me a joke", "answer": "Why did the scarecrow win an award? He was outstanding in his field."},
+    {"text": "what's the date today", "actions": ["get_current_date()"]},
+    {"text": "temperature, humidity and wind please", "actions": [f"get_weather({SPOKANE})", f"get_humidity({SPOKANE})", f"get_wind_speed({SPOKANE})"]},
+    {"text": "thanks, that's all for now", "answer": "You're welcome!"},
+]
+
+
+def parseLatency(spec: str):
+    """
+    Turn a distribution spec into a callable returning seconds.
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(value) for value in args.split(",") if value]
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(*values)
+    if kind == "lognormal" and len(values) == 2:
+        median, sigma = values
+        return lambda: random.lognormvariate(math.log(median), sigma)
+    raise ValueError(f"Unsupported latency distribution: {spec}")
+
+
+def scriptedResponder(script):
+    """
+    Model stand-in: picks the script's actions for action-selection prompts and its answer otherwise.
+    """
+    from Core.Providers import splitSystem
+    turns = {turn["text"]: turn for turn in script}
+
+    def respond(messages):
+        system, conversation = splitSystem(messages)
+        lastUser = next((m["content"] for m in reversed(conversation) if m["role"] == "user"), "")
+        turn     = turns.get(lastUser, {})
+        if system.startswith("You determine the best course of action"):
+            return str(turn["actions"]) if turn.get("actions") else "None"
+        if "Use these results from the actions you called" in system:
+            results = system.split("Use these results from the actions you called:\n", 1)[1]
+            return f"Here is what I found. {results.replace(chr(10), ' ')}"
+        return turn.get("answer", f"You said: {lastUser}")
+    return respond
+
+
+def runCore(script, rounds, clients):
+    from Core.Core import processInput
+
+    def client():
+        for _ in range(rounds):
+            for turn in script:
+                processInput(turn["text"])
+
+    threads = [threading.Thread(target=client, name=f"Client{index}") for index in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return rounds * clients * len(script)
+
+
+def runLoop(script, rounds, clients):
+    """
+    The VoiceAssistant.py voice loop (fast path, router, speech output), fed by the script instead of the microphone.
+    """
+    from VoiceAssistant import runLoop as voiceLoop
+    from Core.Core import getGraph, processInput, processInputStream, conversation
+    from Utils.IntentRouter import IntentRouter
+    from Utils.Config import FAST_PATH, FAST_PATH_CONFIDENCE
+    from Utils.Tracing import tracer
+
+    router = IntentRouter(getGraph, processInput, processInputStream, FAST_PATH_CONFIDENCE if FAST_PATH else float("inf"), conversation)
+    lines  = iter([turn["text"] for _ in range(rounds) for turn in script] + ["exit"])
+    last   = [None]
+
+    def read():
+        # The loop asks for the next utterance once the previous reply has been spoken
+        now = time.perf_counter()
+        if last[0] is not None:
+            tracer.record("loopTurn", now - last[0])
+        last[0] = now
+        return next(lines)
+
+    voiceLoop(router, "voice", read)
+    return rounds * len(script)
+
+
+def printSummary(timings):
+    print(f"{'stage':<12}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, stats in sorted(timings.items()):
+        print(f"{stage:<12}{stats['count']:>7}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark")
+    parser.add_argument("--mode", choices=("core", "loop"), default="core")
+    parser.add_argument("--script", help="JSON file of turns")
+    parser.add_argument("--latency", default="lognormal:0.05,0.5", help="model latency distribution")
+    parser.add_argument("--rounds", type=int, default=5, help="times the script is played")
+    parser.add_argument("--clients", type=int, default=1, help="concurrent callers of processInput (core mode)")
+    parser.add_argument("--weather-ttl", type=float, default=0, help="WEATHER_CACHE_TTL in seconds (0 fetches every weather turn)")
+    parser.add_argument("--seed", type=int, default=7)
+    options = parser.parse_args()
+
+    script = SCRIPT
+    if options.script:
+        with open(options.script, "r", encoding="utf-8") as f:
+            script = json.load(f)
+    random.seed(options.seed)
+
+    with FakeWeatherServer(latency=0.02) as server:
+        # Everything is configured before Core and Echo read their settings on import
+        os.environ["OPEN_METEO_URL"] = server.url
+        os.environ["PROVIDER"]       = "bench"
+        os.environ["HEDGE_PROVIDER"] = ""
+        os.environ["TTS_BACKEND"]    = "null"
+        os.environ["WEATHER_CACHE_TTL"] = str(options.weather_ttl)
+
+        from Core.Providers import MockProvider, setProvider
+        from Utils.Tracing import tracer
+        setProvider("bench", MockProvider(latency=parseLatency(options.latency), responder=scriptedResponder(script)))
+        tracer.configure(enabled=True)
+
+        from Core.Core import warmUp, getTimings, resetTimings
+        start = time.perf_counter()
+        warmUp(background=False)
+        print(f"warm-up            {(time.perf_counter() - start) * 1000:8.1f} ms (skills, prompt, client)")
+
+        run   = runCore if options.mode == "core" else runLoop
+        quiet = open(os.devnull, "w")
+        # One untimed round so first-use costs don't land in the histograms
+        with contextlib.redirect_stdout(quiet):
+            run(script, 1, 1)
+        resetTimings()
+        server.requests = 0
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        start    = time.perf_counter()
+        with contextlib.redirect_stdout(quiet):
+            turns = run(script, options.rounds, options.clients)
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"mode               {options.mode}, {options.clients if options.mode == 'core' else 1} client(s), "
+          f"model latency {options.latency}")
+    print(f"turns              {turns} in {elapsed:.2f} s = {turns / elapsed:.1f} turns/s")
+    print(f"weather requests   {server.requests}")
+    weatherTurns = sum(any(action.startswith(WEATHER_ACTIONS) for action in turn.get("actions", [])) for turn in script)
+    if weatherTurns and not server.requests:
+        sys.exit(f"The script has {weatherTurns} weather turn(s) per round but the fake weather server got no requests")
+    print(f"python heap        peak +{(peak - baseline) / 1024:.0f} KiB, retained +{(current - baseline) / 1024:.0f} KiB "
+          f"({(current - baseline) / turns:.0f} B/turn)")
+    if sys.platform != "win32":
+        import resource
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 if sys.platform != "darwin" else 1024 * 1024)
+        print(f"peak RSS           {maxRss:.1f} MiB")
+    printSummary(getTimings())
@@ -0,0 +1,106 @@
+"""
+Prompt size of the answer request over a long scripted conversation, per context strategy:
+- stateless:       [system, user, results] only (no multi-turn context)
+- full history:    every earlier turn verbatim
+- last 6 turns:    a sliding window
+- memory:          ConversationMemory (token budget, batched summaries, deduplicated results)
+
+Tokens are the same ~4 characters per token estimate the memory budgets with.
+"Cached prefix" is the share of each request that is identical to the start of the previous
+request, which is what provider-side prompt caching can reuse.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.MemoryBench [turns] [budget]
+"""
+
+import sys
+import random
+
+from Utils.ConversationMemory import ConversationMemory, estimateTokens
+
+SYSTEM = "You are a helpful assistant that can call functions to get information."
+WEATHER = "Current temperature: 18.4 C / 65.1 F"
+
+EXCHANGES = [
+    ("what's the weather like in spokane", [WEATHER], "It's 18.4 degrees Celsius, about 65 Fahrenheit, in Spokane right now."),
+    ("should I bring a jacket", [], "At 18 degrees a light jacket is a good idea for the evening, when it gets cooler."),
+    ("what's the temperature again", [WEATHER], "Still 18.4 C, or 65.1 F."),
+    ("what time is it", ["The current time is 3:42 PM"], "It's 3:42 in the afternoon."),
+    ("tell me something about the roman empire",
+     [], "The Roman Empire lasted in the west until 476 AD. At its height it spanned from Britain to Mesopotamia "
+         "and was held together by roads, a professional army and a shared legal system that still shapes law today."),
+    ("how windy is it", ["Current wind speed: 3.2 km/h"], "There's hardly any wind, only 3.2 km/h."),
+    ("and the humidity", ["Current humidity: 62%"], "Relative humidity is 62 percent."),
+    ("summarise what we talked about", [], "We covered the weather in Spokane, the time, and a bit of Roman history."),
+]
+
+
+def conversation(turns, seed=5):
+    rng = random.Random(seed)
+    return [EXCHANGES[rng.randrange(len(EXCHANGES))] for _ in range(turns)]
+
+
+def turnMessages(user, results, answer):
+    if results:
+        user += "\n\nResults of the actions called for that request:\n" + "\n".join(results)
+    return [{"role": "user", "content": user}, {"role": "assistant", "content": answer}]
+
+
+def request(history, user, results):
+    messages = [{"role": "system", "content": SYSTEM}, *history, {"role": "user", "content": user}]
+    if results:
+        messages.append({"role": "system", "content": "Use these results from the actions you called:\n" + "\n".join(results)})
+    return messages
+
+
+def tokens(messages):
+    return sum(estimateTokens(message["content"]) + 4 for message in messages)  # + role/formatting overhead
+
+
+def sharedPrefix(previous, current):
+    shared = 0
+    for before, now in zip(previous, current):
+        if before != now:
+            break
+        shared += estimateTokens(now["content"]) + 4
+    return shared
+
+
+def run(strategy, script, budget):
+    memory  = ConversationMemory(budget) if strategy == "memory" else None
+    past    = []
+    sizes   = []
+    cached  = 0
+    total   = 0
+    previous = []
+    for user, results, answer in script:
+        if strategy == "stateless":
+            history = []
+        elif strategy == "full history":
+            history = [message for turn in past for message in turn]
+        elif strategy == "last 6 turns":
+            history = [message for turn in past[-6:] for message in turn]
+        else:
+            history = memory.context()
+        messages = request(history, user, results)
+        size     = tokens(messages)
+        sizes.append(size)
+        total   += size
+        cached  += sharedPrefix(previous, messages)
+        previous = messages
+        past.append(turnMessages(user, results, answer))
+        if memory is not None:
+            memory.add(user, answer, results)
+    return sizes, cached / total, memory
+
+
+if __name__ == "__main__":
+    turns  = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    budget = int(sys.argv[2]) if len(sys.argv) > 2 else 1200
+    script = conversation(turns)
+    print(f"{turns} turns, memory budget {budget} tokens")
+    print(f"{'strategy':<14}{'mean tok':>10}{'max tok':>10}{'last tok':>10}{'cached prefix':>15}")
+    for strategy in ("stateless", "full history", "last 6 turns", "memory"):
+        sizes, prefixShare, memory = run(strategy, script, budget)
+        print(f"{strategy:<14}{sum(sizes) / len(sizes):>10.0f}{max(sizes):>10}{sizes[-1]:>10}{prefixShare:>14.0%}")
+    print(f"memory stats   {memory.stats}")
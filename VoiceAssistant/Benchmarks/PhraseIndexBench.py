@@ -0,0 +1,62 @@
+"""
+Compiled phrase index vs. the per-skill linear `key in ctx` scan,
+with thousands of synthetic trigger phrases spread over many fake user skills.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.PhraseIndexBench
+"""
+
+import time
+import random
+
+from Utils.PhraseIndex import PhraseIndex
+
+VOCABULARY = ["open", "close", "start", "stop", "play", "pause", "show", "hide", "what", "is", "the",
+              "time", "date", "weather", "music", "lights", "volume", "timer", "alarm", "news"]
+UTTERANCES = ["what is the time", "open word please", "can you turn the lights off in the kitchen",
+              "tell me something interesting about the history of the roman empire"]
+
+
+class FakeSkill:
+    def __init__(self, phrases):
+        self.actionMap = {phrase: None for phrase in phrases}
+
+    def executeAction(self, ctx):
+        ctxLower = ctx.lower()
+        return next((key for key in self.actionMap if key in ctxLower), None)
+
+
+def buildSkills(phraseCount: int, phrasesPerSkill: int = 20):
+    rng     = random.Random(7)
+    phrases = {"what is the time", "open"}
+    while len(phrases) < phraseCount:
+        phrases.add(" ".join(rng.choice(VOCABULARY) + str(rng.randint(0, 999)) for _ in range(rng.randint(2, 4))))
+    phrases = sorted(phrases)
+    return [FakeSkill(phrases[i:i + phrasesPerSkill]) for i in range(0, len(phrases), phrasesPerSkill)]
+
+
+def linearScan(skills, utterance):
+    for skill in skills:
+        result = skill.executeAction(utterance)
+        if result is not None:
+            return result
+    return None
+
+
+def perCall(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for utterance in UTTERANCES:
+            func(utterance)
+    return (time.perf_counter() - start) / (repeat * len(UTTERANCES)) * 1e6
+
+
+if __name__ == "__main__":
+    for phraseCount in (100, 1000, 5000, 20000):
+        skills = buildSkills(phraseCount)
+        start  = time.perf_counter()
+        index  = PhraseIndex.fromSkills(skills)
+        build  = (time.perf_counter() - start) * 1000
+        linear  = perCall(lambda u: linearScan(skills, u), 50)
+        indexed = perCall(index.match, 50)
+        print(f"{phraseCount:>6} phrases   build {build:7.1f} ms   linear {linear:9.1f} us/match   index {indexed:6.1f} us/match")
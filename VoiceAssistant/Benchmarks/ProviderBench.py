@@ -0,0 +1,62 @@
+"""
+Deadlines, retries and hedging against offline mock providers with injected latency.
+The primary has a heavy tail (most requests fast, a few very slow); hedging races a
+second mock after the primary's p95 and should cut the tail latency.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.ProviderBench [requests]
+"""
+
+import sys
+import time
+import random
+
+from Core.Providers import MockProvider, ProviderRouter, setProvider
+
+MESSAGES = [{"role": "user", "content": "what is the capital of france"}]
+
+
+def heavyTail():
+    return 1.0 if random.random() < 0.04 else random.uniform(0.04, 0.08)
+
+
+def steady():
+    return random.uniform(0.08, 0.12)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def measure(router: ProviderRouter, count: int) -> list:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            router.getResponse(MESSAGES)
+        except Exception:
+            continue
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    random.seed(3)
+    setProvider("primary", MockProvider(latency=heavyTail))
+    setProvider("secondary", MockProvider(latency=steady))
+    setProvider("flaky", MockProvider(latency=0.02, failureRate=0.3))
+
+    runs = (
+        ("primary only", ProviderRouter("primary", retries=0)),
+        ("hedged", ProviderRouter("primary", hedge="secondary", retries=0, minHedgeDelay=0.05)),
+    )
+    for label, router in runs:
+        latencies = measure(router, count)
+        print(f"{label:<14} p50 {percentile(latencies, 50) * 1000:7.1f} ms   p95 {percentile(latencies, 95) * 1000:7.1f} ms   "
+              f"p99 {percentile(latencies, 99) * 1000:7.1f} ms   {router.stats}")
+
+    router = ProviderRouter("flaky", retries=3, backoff=0.01)
+    succeeded = len(measure(router, count))
+    print(f"{'flaky + retry':<14} {succeeded}/{count} answered with 30% request failures   {router.stats}")
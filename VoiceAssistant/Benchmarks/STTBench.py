@@ -0,0 +1,69 @@
+"""
+Speech-to-text backends on WAV fixtures, no microphone needed.
+Each fixture is fed in 100 ms chunks at real-time pace, as a microphone would deliver it.
+Reports when the first partial hypothesis arrived (relative to the start of the audio),
+how long the final text took after the audio ended, and the real-time factor of an
+unpaced run. When <name>.txt sits next to <name>.wav, the word error rate is reported too.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.STTBench <google|vosk|whisper> fixture.wav [fixture.wav ...]
+"""
+
+import os
+import sys
+import time
+
+from Echo.SpeechToText import getSTTBackend, wavChunks, transcribeStream
+
+CHUNK_MS = 100
+
+
+def paced(chunks):
+    start = time.perf_counter()
+    for index, chunk in enumerate(chunks):
+        # A microphone hands over each chunk once it has been fully recorded
+        time.sleep(max(0.0, start + (index + 1) * CHUNK_MS / 1000 - time.perf_counter()))
+        yield chunk
+
+
+def wordErrorRate(reference: str, hypothesis: str) -> float:
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    row = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, 1):
+        previous, row[0] = row[0], i
+        for j, other in enumerate(hyp, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (word != other))
+    return row[-1] / max(1, len(ref))
+
+
+def run(backend, path):
+    chunks   = list(wavChunks(path, CHUNK_MS))
+    audioSec = len(chunks) * CHUNK_MS / 1000
+    start    = time.perf_counter()
+    partials = []
+    text     = transcribeStream(backend, paced(chunks), lambda partial: partials.append(time.perf_counter() - start))
+    finalLag = time.perf_counter() - start - audioSec
+
+    cpu = time.process_time()
+    transcribeStream(backend, iter(chunks))
+    rtf = (time.process_time() - cpu) / audioSec
+
+    reference = os.path.splitext(path)[0] + ".txt"
+    wer = wordErrorRate(open(reference).read(), text) if os.path.exists(reference) else None
+    return text, audioSec, partials[0] if partials else None, len(partials), finalLag, rtf, wer
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+    backend = getSTTBackend(sys.argv[1])
+    for path in sys.argv[2:]:
+        text, audioSec, firstPartial, partialCount, finalLag, rtf, wer = run(backend, path)
+        print(f"{os.path.basename(path)}  ({audioSec:.1f} s)")
+        print(f"  text            {text}")
+        print(f"  first partial   {f'{firstPartial * 1000:.0f} ms' if firstPartial is not None else 'none'}   ({partialCount} partials)")
+        print(f"  final after end {finalLag * 1000:.0f} ms")
+        print(f"  real-time factor {rtf:.3f}")
+        if wer is not None:
+            print(f"  word error rate {wer:.1%}")
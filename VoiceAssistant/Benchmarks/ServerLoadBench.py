@@ -0,0 +1,101 @@
+"""
+Load test for server mode (Core.Server) against the mock provider.
+Starts the server in-process with MOCK_LATENCY_MS model latency, then runs client
+threads that each open a session and send turns back to back over one keep-alive
+connection. Reports throughput, turn latency percentiles and how many requests were
+turned away with 503 by the backpressure limit.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.ServerLoadBench [clients] [turns per client] [max concurrent] [max queued]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+import http.client
+
+UTTERANCES = [
+    "what is the capital of france",
+    "and how many people live there",
+    "tell me a joke",
+    "another one please",
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))] if ordered else 0.0
+
+
+def request(connection, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else None
+    connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read() or b"{}")
+
+
+def client(port, turns, latencies, outcomes):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    status, created = request(connection, "POST", "/sessions")
+    if status != 201:
+        outcomes.append(status)
+        return
+    for index in range(turns):
+        start = time.perf_counter()
+        status, _ = request(connection, "POST", f"/sessions/{created['session']}/turns", {"text": UTTERANCES[index % len(UTTERANCES)]})
+        outcomes.append(status)
+        if status == 200:
+            latencies.append(time.perf_counter() - start)
+    request(connection, "DELETE", f"/sessions/{created['session']}")
+    connection.close()
+
+
+def serve(server, ready):
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(server.start())
+    ready.set()
+    loop.run_forever()
+
+
+if __name__ == "__main__":
+    clients       = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    turns         = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    maxConcurrent = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    maxQueued     = int(sys.argv[4]) if len(sys.argv) > 4 else 16
+
+    os.environ["PROVIDER"]             = "mock"
+    os.environ["HEDGE_PROVIDER"]       = ""
+    os.environ["MAX_CONCURRENT_TURNS"] = str(maxConcurrent)
+    os.environ.setdefault("MOCK_LATENCY_MS", "80")
+    os.environ.setdefault("MOCK_JITTER_MS", "40")
+
+    from Core.Core import warmUp, resetTimings
+    from Core.Server import AssistantServer
+
+    warmUp(background=False)
+    # The fast path is off so every turn goes through the shared skill graph and provider pool
+    server = AssistantServer(port=0, maxConcurrent=maxConcurrent, maxQueued=maxQueued, fastPath=False)
+    ready  = threading.Event()
+    threading.Thread(target=serve, args=(server, ready), daemon=True).start()
+    ready.wait()
+    resetTimings()
+
+    latencies, outcomes = [], []
+    threads = [threading.Thread(target=client, args=(server.port, turns, latencies, outcomes)) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"clients {clients} x {turns} turns, {maxConcurrent} concurrent + {maxQueued} queued, "
+          f"model {os.environ['MOCK_LATENCY_MS']}+{os.environ['MOCK_JITTER_MS']} ms")
+    print(f"answered     {outcomes.count(200)} in {elapsed:.2f} s = {outcomes.count(200) / elapsed:.1f} turns/s")
+    print(f"rejected     {outcomes.count(503)} with 503 (backpressure), other errors {len(outcomes) - outcomes.count(200) - outcomes.count(503)}")
+    print(f"turn latency p50 {percentile(latencies, 50) * 1000:.0f} ms   p95 {percentile(latencies, 95) * 1000:.0f} ms   "
+          f"p99 {percentile(latencies, 99) * 1000:.0f} ms")
+    print(f"server       {json.dumps({key: value for key, value in server.getStats().items() if key != 'timings'})}")
@@ -0,0 +1,85 @@
+"""
+Headless run of the asyncio session engine with a scripted source and a fake speaker.
+The second utterance arrives while the first reply is still being spoken, so it barges in.
+Reports the transcript, the barge-in latency (new utterance to playback stopped) and the
+time from each utterance to its first spoken chunk.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.SessionBench
+"""
+
+import time
+import asyncio
+import threading
+
+from Core.Session import AssistantSession
+
+SCRIPT = [
+    (0.00, "tell me a long story"),
+    (0.45, "actually what time is it"),  # Barges in while the story is being spoken
+    (1.20, "exit"),
+]
+
+
+class ScriptedSource:
+    """Async iterable yielding each utterance at its offset from the start."""
+
+    def __init__(self, script):
+        self.script = script
+
+    async def __aiter__(self):
+        start = time.perf_counter()
+        for offset, utterance in self.script:
+            await asyncio.sleep(max(0.0, offset - (time.perf_counter() - start)))
+            yield utterance
+
+
+class FakeSpeaker:
+    """Plays a chunk for 20 ms per word; stop() cuts the current chunk short."""
+
+    def __init__(self, secondsPerWord: float = 0.02):
+        self.secondsPerWord = secondsPerWord
+        self.interrupted    = threading.Event()
+        self.stoppedAt      = []
+
+    def speak(self, chunk: str):
+        self.interrupted.clear()
+        self.interrupted.wait(len(chunk.split()) * self.secondsPerWord)
+
+    def stop(self):
+        self.stoppedAt.append(time.perf_counter())
+        self.interrupted.set()
+
+
+def respond(ctx: str):
+    """Fake model: 150 ms to the first token, then one word every 10 ms."""
+    time.sleep(0.15)
+    if "story" in ctx:
+        words = ("Once upon a time there was a very patient assistant. " * 12).split()
+    else:
+        words = "It is half past ten.".split()
+    for word in words:
+        time.sleep(0.01)
+        yield word + " "
+
+
+if __name__ == "__main__":
+    speaker = FakeSpeaker()
+    session = AssistantSession([ScriptedSource(SCRIPT)], respond, speaker.speak, stop=speaker.stop)
+    start   = time.perf_counter()
+    asyncio.run(session.run())
+
+    for at, event, text in session.transcript:
+        print(f"{at * 1000:8.1f} ms  {event:<8} {text}")
+
+    heard   = [at for at, event, _ in session.transcript if event == "heard"]
+    spoken  = [at for at, event, _ in session.transcript if event == "speak"]
+    barge   = next(at for at, event, _ in session.transcript if event == "bargeIn")
+    stopped = speaker.stoppedAt[0] - session._start if speaker.stoppedAt else None
+    print()
+    for at in heard:
+        first = next((s for s in spoken if s >= at), None)
+        print(f"first audio after utterance at {at * 1000:6.1f} ms   {(first - at) * 1000 if first is not None else float('nan'):6.1f} ms")
+    if stopped is not None:
+        print(f"barge-in latency (utterance to playback stopped)   {(stopped - heard[1]) * 1000:6.2f} ms")
+    print(f"session wall time                                  {(time.perf_counter() - start) * 1000:6.1f} ms")
@@ -0,0 +1,70 @@
+"""
+Skill reload cost as the skill directory grows, on generated skill modules.
+- full load:    every module loaded, what a reload of everything costs
+- idle poll:    one watcher tick with nothing changed (a directory scan)
+- touched:      one file saved without edits (re-hashed, not reloaded)
+- one edit:     one module edited (only that module reloaded)
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.SkillReloadBench [sizes, e.g. 50,200,500]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+from Utils.SkillCatalog import SkillCatalog
+
+SKILL = '''
+import math
+
+class Skill{index}:
+    def __init__(self):
+        self.unit = "units"
+
+    def _metaData(self):
+        return {{"className": "Skill{index}", "description": "Compute thing number {index}"}}
+
+    def skill{index}(self, value: float) -> str:
+        """
+        Description: "Compute thing number {index} for the given value (revision {revision})."
+        """
+        return f"{{math.sqrt(abs(value)) * {index}:.2f}} {{self.unit}}"
+'''
+
+
+def write(folder, index, revision=0):
+    with open(os.path.join(folder, f"skill_{index}.py"), "w") as f:
+        f.write(SKILL.format(index=index, revision=revision))
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1].split(",")] if len(sys.argv) > 1 else [50, 200, 500]
+    print(f"{'modules':>8}{'full load':>12}{'idle poll':>12}{'touched':>12}{'one edit':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            for index in range(size):
+                write(folder, index)
+            catalog = SkillCatalog(folder, f"Bench{size}")
+            full, _ = timed(catalog.refresh)
+            idle, _ = timed(catalog.refresh)
+
+            path = os.path.join(folder, "skill_0.py")
+            os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+            touched, diff = timed(catalog.refresh)
+            assert not any(diff.values())
+
+            write(folder, size // 2, revision=1)
+            path = os.path.join(folder, f"skill_{size // 2}.py")
+            os.utime(path, ns=(time.time_ns(), time.time_ns() + 2_000_000))
+            edit, diff = timed(catalog.refresh)
+            assert diff["changed"] == [f"skill_{size // 2}.py"], diff
+            assert len(catalog.components()) == size
+            print(f"{size:>8}{full:>10.1f}ms{idle:>10.2f}ms{touched:>10.2f}ms{edit:>10.2f}ms")
@@ -0,0 +1,56 @@
+"""
+Time to first audio: blocking speak vs. sentence-level streaming.
+Uses a fake token stream with a fixed per-token delay and a fake TTS sink
+that records when each chunk starts and sleeps in proportion to its length.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.SpeechStreamBench
+"""
+
+import time
+
+from Utils.SpeechStream import SpeechStreamer
+
+RESPONSE = (
+    "The current temperature is 18.4 degrees Celsius. "
+    "Humidity is at 62 percent, so it should feel comfortable. "
+    "Wind is light at about 3 meters per second. "
+    "You probably won't need a jacket this afternoon, but take one for the evening."
+)
+TOKEN_DELAY = 0.01   # Seconds per generated token
+SPEECH_RATE = 0.004  # Seconds of speech per character
+
+
+def fakeTokens(text: str, delay: float = TOKEN_DELAY):
+    for word in text.split(" "):
+        time.sleep(delay)
+        yield word + " "
+
+
+class RecordingSink:
+    def __init__(self):
+        self.started = []
+
+    def __call__(self, chunk: str):
+        self.started.append((time.perf_counter(), chunk))
+        time.sleep(len(chunk) * SPEECH_RATE)
+
+
+def runBlocking():
+    sink  = RecordingSink()
+    start = time.perf_counter()
+    sink("".join(fakeTokens(RESPONSE)).strip())
+    return sink.started[0][0] - start, time.perf_counter() - start, len(sink.started)
+
+
+def runStreaming():
+    sink  = RecordingSink()
+    start = time.perf_counter()
+    SpeechStreamer(sink).speak(fakeTokens(RESPONSE))
+    return sink.started[0][0] - start, time.perf_counter() - start, len(sink.started)
+
+
+if __name__ == "__main__":
+    for name, run in (("blocking", runBlocking), ("streaming", runStreaming)):
+        firstAudio, total, chunks = run()
+        print(f"{name:<10} first audio {firstAudio * 1000:7.1f} ms   total {total * 1000:7.1f} ms   chunks {chunks}")
@@ -0,0 +1,43 @@
+"""
+Cold-start cost of Core: time to import the module and time until the first
+response is ready (skills loaded, skill prompt built).
+Each run uses a fresh interpreter so nothing is already imported. The child runs with the mock
+provider, so it needs no API key or network and the numbers leave out provider client setup.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.StartupBench [runs]
+"""
+
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import Core.Core as core
+imported = time.perf_counter()
+loaded = sorted(name for name in ("openai", "google.genai", "SkillLink") if name in sys.modules)
+core.warmUp(background=False)
+ready = time.perf_counter()
+print(json.dumps({"importMs": (imported - start) * 1000, "readyMs": (ready - start) * 1000, "loadedAtImport": loaded}))
+"""
+
+
+def runOnce() -> dict:
+    env    = dict(os.environ, PROVIDER="mock", HEDGE_PROVIDER="", MOCK_LATENCY_MS="0", SKILL_RELOAD_INTERVAL="0")
+    result = subprocess.run([sys.executable, "-c", CHILD], capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "startup failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    runs    = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    samples = [runOnce() for _ in range(runs)]
+    print(f"runs                     {runs}")
+    print(f"import Core.Core         {statistics.median(s['importMs'] for s in samples):8.1f} ms (median)")
+    print(f"first response ready     {statistics.median(s['readyMs'] for s in samples):8.1f} ms (median)")
+    print(f"SDKs loaded by import    {', '.join(samples[0]['loadedAtImport']) or 'none'}")
@@ -0,0 +1,71 @@
+"""
+Per-utterance voice setup vs. the TTSManager, on a backend whose voice listing costs
+30 ms like some system engines. Also times the file backend and how long a caller
+blocks when it queues speech instead of waiting for it.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.TTSBench
+"""
+
+import time
+import tempfile
+
+from Echo.TTSManager import TTSManager, NullBackend, FileBackend, currentSettings
+
+SENTENCES = ["The current temperature is 21 degrees.", "It is half past ten.", "Opening word for you now.",
+             "Your timer is set for five minutes.", "Here is a short summary of the news today."] * 20
+
+
+class SlowVoicesBackend(NullBackend):
+    """Silent backend where listing the installed voices takes listMs."""
+
+    def __init__(self, listMs: float = 30.0):
+        super().__init__()
+        self.listMs = listMs
+        self.lists  = 0
+
+    def applySettings(self, settings: tuple):
+        time.sleep(self.listMs / 1000)
+        self.lists += 1
+
+
+def perUtterance(backend) -> float:
+    """The old Echo.speak: list voices and set every property before each utterance."""
+    start = time.perf_counter()
+    for sentence in SENTENCES:
+        backend.applySettings(currentSettings())
+        backend.speak(sentence)
+    return time.perf_counter() - start
+
+
+def managed(manager: TTSManager, block: bool = True) -> float:
+    start = time.perf_counter()
+    for sentence in SENTENCES:
+        manager.say(sentence, block=block)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    legacy = SlowVoicesBackend()
+    oldTime = perUtterance(legacy)
+
+    manager = TTSManager(SlowVoicesBackend())
+    newTime = managed(manager)
+
+    queued = TTSManager(SlowVoicesBackend())
+    queueTime = managed(queued, block=False)
+    queued.shutdown()
+
+    with tempfile.TemporaryDirectory() as directory:
+        files    = TTSManager(FileBackend(directory))
+        fileTime = managed(files)
+        written  = len(files.backend.files)
+        files.shutdown()
+
+    count = len(SENTENCES)
+    print(f"utterances                         {count}")
+    print(f"per-utterance setup                {oldTime / count * 1000:7.2f} ms/utterance   voice lists {legacy.lists}")
+    print(f"TTSManager (blocking)              {newTime / count * 1000:7.2f} ms/utterance   voice lists {manager.backend.lists}")
+    print(f"TTSManager (queued, caller side)   {queueTime / count * 1000:7.3f} ms/utterance")
+    print(f"file backend                       {fileTime / count * 1000:7.2f} ms/utterance   files {written}")
+    print(f"settings applied                   {manager.stats['settingsApplied']} time(s), {manager.stats['applyMs']:.1f} ms total")
@@ -0,0 +1,123 @@
+"""
+Time to first audio for spoken replies, with and without the TTS audio cache.
+
+The engine is a stand-in that renders like a local SAPI/eSpeak voice: a fixed start-up cost plus
+a cost per character, producing a tone padded with silence. Playback goes to a NullPlayer, so the
+time measured is how long speak() takes before audio could start.
+
+The workload mixes fixed replies ("Exiting. Goodbye!"), answers in the shapes the skills give them
+(time, date, temperature, humidity, wind) and free-form text that never repeats. SPEECH_TEMPLATES are
+registered with the cache, as Echo does; other text is spoken directly until it has come up
+TTS_CACHE_MIN_REPEATS times. Renderings the cache queues are made by a second engine on the cache's
+background thread, as with the RenderProcess; after each reply the bench waits for them to finish
+(the user's turn) and reports that time and those renders separately.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.TTSCacheBench [turns] [msPerChar]
+"""
+
+import sys
+import time
+import wave
+import random
+import tempfile
+
+import numpy as np
+
+from Echo.AudioCache import AudioCache
+from Echo.TTSManager import FileBackend, CachedBackend, NullPlayer, SPEECH_TEMPLATES
+from Utils.Config import TTS_CACHE_MIN_REPEATS
+
+FIXED = ["Exiting. Goodbye!", "Sorry, I didn't catch that.", "Okay, opening it now.", "Volume set."]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September",
+          "October", "November", "December"]
+TEMPLATES = [
+    lambda rng: f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+    lambda rng: f"{rng.randint(1, 28):02d}-{rng.choice(MONTHS)}-2026",
+    lambda rng: f"Current temperature: {rng.uniform(-5, 30):.1f} C / {rng.uniform(20, 90):.1f} F",
+    lambda rng: f"Current humidity: {rng.randint(20, 95)}%",
+    lambda rng: f"Current wind speed: {rng.uniform(0, 20):.1f} m/s",
+]
+WORDS = "the a river mountain quickly history empire light jacket evening cooler roads army law".split()
+
+
+class SlowBackend(FileBackend):
+    """
+    Renders a 440 Hz tone as long as the text would take to say, after sleeping like a real engine.
+    """
+    name = "slow"
+
+    def __init__(self, directory, msPerChar=2.0, startupMs=60.0):
+        super().__init__(directory)
+        self.msPerChar = msPerChar
+        self.startupMs = startupMs
+        self.renders   = 0
+
+    def render(self, text, path):
+        time.sleep((self.startupMs + self.msPerChar * len(text)) / 1000)
+        self.renders += 1
+        samples = np.arange(int(len(text) * self.secondsPerChar * self.sampleRate))
+        tone    = (np.sin(2 * np.pi * 440 * samples / self.sampleRate) * 8000).astype("<i2")
+        pad     = np.zeros(self.sampleRate // 10, dtype="<i2")
+        with wave.open(path, "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(self.sampleRate)
+            out.writeframes(np.concatenate([pad, tone, pad]).tobytes())
+
+
+def workload(turns, seed=3):
+    rng   = random.Random(seed)
+    lines = []
+    for _ in range(turns):
+        kind = rng.random()
+        if kind < 0.35:
+            lines.append(rng.choice(FIXED))
+        elif kind < 0.8:
+            lines.append(rng.choice(TEMPLATES)(rng))
+        else:
+            lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize() + ".")
+    return lines
+
+
+def run(backend, lines):
+    times, idle = [], 0.0
+    for line in lines:
+        start = time.perf_counter()
+        backend.speak(line)
+        times.append((time.perf_counter() - start) * 1000)
+        if hasattr(backend, "renderPending"):
+            # The user's turn: give the background renderer time to catch up
+            start = time.perf_counter()
+            while backend.pending or backend.thread is not None and backend.wake.is_set():
+                time.sleep(0.001)
+            idle += (time.perf_counter() - start) * 1000
+    return sorted(times), idle
+
+
+def percentile(values, share):
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+if __name__ == "__main__":
+    turns     = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    msPerChar = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    lines     = workload(turns)
+    with tempfile.TemporaryDirectory() as folder:
+        engine   = SlowBackend(folder, msPerChar)
+        uncached, _ = run(engine, lines)
+
+        cache  = AudioCache(f"{folder}/cache")
+        renderer = SlowBackend(folder, msPerChar)
+        cached   = CachedBackend(SlowBackend(folder, msPerChar), cache, NullPlayer(), minRepeats=TTS_CACHE_MIN_REPEATS,
+                                 renderer=renderer)
+        for pattern in SPEECH_TEMPLATES:
+            cached.registerTemplate(pattern)
+        timed, idle = run(cached, lines)
+
+        print(f"{turns} replies, engine {cached.backend.startupMs:.0f} ms + {msPerChar} ms/char")
+        print(f"{'':<10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'renders':>10}")
+        for label, times, renders in (("uncached", uncached, engine.renders), ("cached", timed, cached.backend.renders)):
+            print(f"{label:<10}{sum(times) / len(times):>10.1f}{percentile(times, 0.5):>10.1f}{percentile(times, 0.95):>10.1f}{renders:>10}")
+        print(f"replies   {cached.stats}, {renderer.renders} background renders, {idle:.0f} ms waiting for them between replies")
+        print(f"cache     hit rate {cache.hitRate():.0%}, {len(cache.entries)} files, {cache.bytes / 1024:.0f} KiB on disk, {cache.stats}")
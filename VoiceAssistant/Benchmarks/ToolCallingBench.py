@@ -0,0 +1,124 @@
+"""
+Prompt tokens and turn latency of the text action-selection mode against native tool calling
+(TOOL_CALLING), over the EndToEndBench script with the mock provider and the real agent skills.
+
+- text:  action-selection prompt (skill instructions + examples) + answer request with the results
+- tools: one request carrying the tool schemas; with calls, a follow-up that only sends the tool
+         outputs (OpenAI previous_response_id). "resent" counts the follow-up as providers without
+         server-side state see it: the whole conversation again.
+
+Tokens are the ~4 characters per token estimate. Each request costs the base latency plus
+prefill time per prompt token, so the shorter prompts show up in the latency too.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.ToolCallingBench [--rounds 3] [--latency 0.3] [--prefill-us 150]
+"""
+
+import os
+import ast
+import json
+import time
+import argparse
+import contextlib
+
+from Benchmarks.WeatherDataBench import FakeWeatherServer
+from Benchmarks.EndToEndBench import SCRIPT, scriptedResponder
+from Utils.ConversationMemory import estimateTokens
+
+
+def tokens(messages, tools=None):
+    return sum(estimateTokens(message["content"]) + 4 for message in messages) + (estimateTokens(json.dumps(tools)) if tools else 0)
+
+
+def scriptedCalls(script, graph):
+    """
+    The script's action strings as (name, arguments) tool calls.
+    """
+    import inspect
+    tools = graph.getTools()
+    calls = {}
+    for turn in script:
+        requested = []
+        for action in turn.get("actions", []):
+            call = ast.parse(action, mode="eval").body
+            name = call.func.id
+            args = [ast.literal_eval(arg) for arg in call.args]
+            requested.append((name, dict(zip(inspect.signature(tools[name]).parameters, args))))
+        calls[turn["text"]] = requested
+    return calls
+
+
+class Meter:
+    """
+    Stands in for the model: answers from the script, counts prompt tokens per request and
+    sleeps latency + prefill for each one.
+    """
+
+    def __init__(self, script, graph, latency, prefill):
+        self.text     = scriptedResponder(script)
+        self.calls    = scriptedCalls(script, graph)
+        self.latency  = latency
+        self.prefill  = prefill
+        self.requests = 0
+        self.prompt   = 0
+        self.resent   = 0
+
+    def _charge(self, size, resent=None):
+        self.requests += 1
+        self.prompt   += size
+        self.resent   += size if resent is None else resent
+        time.sleep(self.latency + size * self.prefill)
+
+    def respond(self, messages):
+        self._charge(tokens(messages))
+        return self.text(messages)
+
+    def respondTools(self, messages, tools):
+        if messages[-1]["role"] == "tool":
+            outputs = []
+            for message in reversed(messages):
+                if message["role"] != "tool":
+                    break
+                outputs.append(message["content"])
+            self._charge(tokens([{"content": output} for output in outputs], tools), tokens(messages, tools))
+            return f"Here is what I found. {' '.join(reversed(outputs))}"
+        self._charge(tokens(messages, tools))
+        lastUser = messages[-1]["content"]
+        return self.calls.get(lastUser) or self.text(messages)
+
+
+def run(mode, script, rounds, latency, prefill):
+    import Core.Core as Core
+    from Core.Providers import MockProvider, setProvider
+    meter = Meter(script, Core.getGraph(), latency, prefill)
+    setProvider("bench", MockProvider(latency=0, responder=meter.respond, toolResponder=meter.respondTools))
+    Core.TOOL_CALLING = mode == "tools"
+    Core.processInput(script[0]["text"])  # Builds the skill prompt or the tool schemas
+    meter.requests = meter.prompt = meter.resent = 0
+    times = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(rounds):
+            for turn in script:
+                start = time.perf_counter()
+                Core.processInput(turn["text"])
+                times.append((time.perf_counter() - start) * 1000)
+    return meter, sorted(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Text action selection vs native tool calling")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per model request")
+    parser.add_argument("--prefill-us", type=float, default=150, help="microseconds per prompt token")
+    options = parser.parse_args()
+
+    turns = options.rounds * len(SCRIPT)
+    with FakeWeatherServer(latency=0.02) as server:
+        os.environ.update(OPEN_METEO_URL=server.url, PROVIDER="bench", HEDGE_PROVIDER="", TTS_BACKEND="null",
+                          MEMORY_TOKENS="0", RESPONSE_CACHE="False", SKILL_RELOAD_INTERVAL="0")
+        print(f"{turns} turns, {options.latency * 1000:.0f} ms + {options.prefill_us:.0f} us/token per request")
+        print(f"{'mode':<8}{'requests':>10}{'prompt tok':>12}{'tok/turn':>10}{'resent tok':>12}{'p50 ms':>9}{'p95 ms':>9}")
+        for mode in ("text", "tools"):
+            meter, times = run(mode, SCRIPT, options.rounds, options.latency, options.prefill_us / 1e6)
+            print(f"{mode:<8}{meter.requests:>10}{meter.prompt:>12}{meter.prompt / turns:>10.0f}{meter.resent:>12}"
+                  f"{times[len(times) // 2]:>9.0f}{times[int(0.95 * len(times))]:>9.0f}")
@@ -0,0 +1,68 @@
+"""
+Cost of a span with tracing off, on (histograms only) and on with JSONL export,
+then a traced mock turn (select -> parse -> parallel skills -> final) printed as
+its per-stage p50/p95/p99 summary.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.TracingBench
+"""
+
+import os
+import time
+import tempfile
+
+from Utils.Tracing import tracer, span, timer, propagate
+from Utils.ActionExecutor import ActionExecutor
+from Core.Providers import ProviderRouter, MockProvider, setProvider
+
+ROUNDS = 200000
+
+
+def perSpan(rounds: int = ROUNDS) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        with span("bench"):
+            pass
+    return (time.perf_counter() - start) / rounds * 1e9
+
+
+def mockTurn(router, executor):
+    with timer("turn"):
+        with timer("select"):
+            router.getResponse("which actions?")
+        with span("parse"):
+            actions = ["getTime()", "getDate()", "weatherSkill()"]
+        with timer("skills"):
+            def skill(item):
+                with span("skill", action=item):
+                    time.sleep(0.005)
+            executor.run(propagate(skill), actions)
+        with timer("final"):
+            router.getResponse("answer")
+
+
+if __name__ == "__main__":
+    tracer.configure(enabled=False, exportPath="")
+    off = perSpan()
+    tracer.configure(enabled=True)
+    on = perSpan()
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "trace.jsonl")
+        tracer.configure(exportPath=path)
+        exported = perSpan(ROUNDS // 10)
+        tracer.configure(exportPath="")
+        lines = sum(1 for _ in open(path))
+    print(f"span, tracing off          {off:8.0f} ns")
+    print(f"span, histograms only      {on:8.0f} ns")
+    print(f"span, JSONL export         {exported:8.0f} ns   ({lines} lines written)")
+
+    tracer.reset()
+    setProvider("bench", MockProvider(latency=lambda: 0.02))
+    router   = ProviderRouter("bench", retries=0)
+    executor = ActionExecutor(maxWorkers=4)
+    for _ in range(50):
+        mockTurn(router, executor)
+    print()
+    print(f"{'stage':<10} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for stage, stats in tracer.summary().items():
+        print(f"{stage:<10} {stats['count']:>6} {stats['p50']:>8.2f} {stats['p95']:>8.2f} {stats['p99']:>8.2f}")
@@ -0,0 +1,143 @@
+"""
+False-accept / false-reject rate and CPU cost of the local wake-word gate, on a folder of recordings.
+
+Without a folder a labelled WAV set is synthesised into a temporary folder: the "wake word"
+and the distractor words are vowel sequences rendered with a simple source-filter model,
+with a random speaker pitch, speaking rate, formant shift and background noise per file.
+That run only checks that the pipeline separates what it should and measures its CPU cost;
+its accept/reject counts are not false-accept or false-reject rates for real speech, and no
+threshold should be tuned on them. No real recordings are bundled.
+
+The rates come from a folder of real recordings:
+    <folder>/templates/*.wav   the wake word on its own (enrollment)
+    <folder>/wake/*.wav        captures addressed to the assistant
+    <folder>/other/*.wav       everything else
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.WakeWordBench [folder] [threshold]
+"""
+
+import os
+import sys
+import time
+import glob
+import wave
+import tempfile
+
+import numpy as np
+
+from Echo.WakeWord import WakeWordDetector, readWav, SAMPLE_RATE
+
+# (F1, F2) formants of each syllable's vowel
+WAKE_WORD   = [(400, 2000), (300, 900), (650, 1100)]
+DISTRACTORS = [
+    [(700, 1200), (300, 2300)],
+    [(300, 2300), (500, 1500), (700, 1200)],
+    [(650, 1100), (400, 2000), (300, 900)],  # Same vowels, different order
+    [(500, 1500), (500, 1500), (300, 2300), (400, 2000)],
+    [(300, 900), (700, 1200), (300, 900)],
+]
+
+
+def syllable(f1, f2, duration, f0, rng):
+    t        = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch    = f0 * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))
+    phase    = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    signal   = np.zeros_like(t)
+    for harmonic in range(1, int(4000 / f0)):
+        freq = harmonic * f0
+        gain = np.exp(-((freq - f1) / 120) ** 2) + 0.6 * np.exp(-((freq - f2) / 180) ** 2) + 0.02
+        signal += gain * np.sin(harmonic * phase + rng.uniform(0, 2 * np.pi))
+    envelope = np.minimum(1, np.minimum(t, t[::-1]) / 0.03)
+    return signal * envelope
+
+
+def word(vowels, rng, f0=None, rate=None):
+    f0     = f0 or rng.uniform(100, 220)
+    rate   = rate or rng.uniform(0.8, 1.25)
+    shift  = rng.uniform(0.95, 1.05)
+    pieces = []
+    for f1, f2 in vowels:
+        pieces.append(syllable(f1 * shift, f2 * shift, rng.uniform(0.14, 0.2) * rate, f0, rng))
+        pieces.append(np.zeros(int(rng.uniform(0.02, 0.05) * SAMPLE_RATE)))
+    return np.concatenate(pieces)
+
+
+def capture(parts, rng, snrDb=None):
+    silence = lambda: np.zeros(int(rng.uniform(0.1, 0.3) * SAMPLE_RATE))
+    audio   = np.concatenate([silence()] + [np.concatenate([part, silence()]) for part in parts])
+    audio   = audio / np.abs(audio).max() * 0.5
+    snrDb   = rng.uniform(10, 30) if snrDb is None else snrDb
+    noise   = rng.normal(0, 1, len(audio)) * np.sqrt(np.mean(audio ** 2) / 10 ** (snrDb / 10))
+    return audio + noise
+
+
+def writeWav(path, samples):
+    with wave.open(path, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        out.writeframes((np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes())
+
+
+def synthesise(folder, count=60, seed=3):
+    rng = np.random.default_rng(seed)
+    for name in ("templates", "wake", "other"):
+        os.makedirs(os.path.join(folder, name), exist_ok=True)
+    for index in range(3):
+        writeWav(os.path.join(folder, "templates", f"{index}.wav"), capture([word(WAKE_WORD, rng, rate=1.0)], rng, snrDb=35))
+    for index in range(count):
+        # The wake word, alone or followed by a command
+        tail = [word(DISTRACTORS[rng.integers(len(DISTRACTORS))], rng) for _ in range(rng.integers(0, 3))]
+        writeWav(os.path.join(folder, "wake", f"{index}.wav"), capture([word(WAKE_WORD, rng)] + tail, rng))
+    for index in range(count):
+        kind = index % 3
+        if kind == 0:    # Other words
+            parts = [word(DISTRACTORS[rng.integers(len(DISTRACTORS))], rng) for _ in range(rng.integers(1, 4))]
+            audio = capture(parts, rng)
+        elif kind == 1:  # The wake word said later in the sentence, not addressed at the start
+            parts = [word(DISTRACTORS[rng.integers(len(DISTRACTORS))], rng) for _ in range(3)] + [word(WAKE_WORD, rng)]
+            audio = capture(parts, rng)
+        else:            # Room noise only
+            audio = rng.normal(0, rng.uniform(0.001, 0.02), int(rng.uniform(1, 3) * SAMPLE_RATE))
+        writeWav(os.path.join(folder, "other", f"{index}.wav"), audio)
+
+
+def evaluate(folder, threshold):
+    detector = WakeWordDetector.fromDirectory(os.path.join(folder, "templates"), threshold=threshold)
+    results  = {}
+    audioSec = 0.0
+    for label in ("wake", "other"):
+        accepted = 0
+        paths    = sorted(glob.glob(os.path.join(folder, label, "*.wav")))
+        for path in paths:
+            samples, rate = readWav(path)
+            audioSec += len(samples) / rate
+            accepted += detector.detect(samples, rate)
+        results[label] = (accepted, len(paths))
+    return detector, results, audioSec
+
+
+if __name__ == "__main__":
+    folder    = sys.argv[1] or None if len(sys.argv) > 1 else None
+    threshold = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    with tempfile.TemporaryDirectory() as scratch:
+        if folder is None:
+            folder = scratch
+            synthesise(folder)
+        start = time.perf_counter()
+        detector, results, audioSec = evaluate(folder, threshold)
+        wall = time.perf_counter() - start
+
+    wakeAccepted, wakeTotal   = results["wake"]
+    otherAccepted, otherTotal = results["other"]
+    stats = detector.stats
+    synthetic = folder == scratch
+    print(f"templates          {len(detector.templates)}   threshold {threshold}")
+    if synthetic:
+        print("synthetic vowel sequences: a pipeline check, not false-accept/false-reject rates for speech")
+    print(f"{'wake rejected' if synthetic else 'false reject':<19}{wakeTotal - wakeAccepted}/{wakeTotal}  ({(wakeTotal - wakeAccepted) / wakeTotal:.1%})")
+    print(f"{'other accepted' if synthetic else 'false accept':<19}{otherAccepted}/{otherTotal}  ({otherAccepted / otherTotal:.1%})")
+    print(f"rejected by energy {stats['energyRejected']}   by template {stats['templateRejected']}")
+    print(f"CPU                {stats['cpuMs'] / stats['checked']:.2f} ms/capture   {stats['cpuMs'] / 1000 / audioSec:.4f} s per s of audio")
+    print(f"wall (incl. WAV reads) {wall * 1000:.0f} ms for {audioSec:.1f} s of audio")
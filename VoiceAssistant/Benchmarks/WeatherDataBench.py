@@ -0,0 +1,88 @@
+"""
+Network requests for a "temperature, humidity and wind" turn, served by a local
+HTTP stand-in for Open-Meteo that counts requests and adds a fixed latency.
+
+Run from the VoiceAssistant directory:
+    python -m Benchmarks.WeatherDataBench
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY = 0.15  # Seconds the stand-in takes per request
+
+
+class FakeWeatherServer:
+    """
+    Local Open-Meteo stand-in. Returns a fixed forecast for any coordinates.
+    """
+
+    def __init__(self, latency: float = LATENCY):
+        self.latency  = latency
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests += 1
+                time.sleep(server.latency)
+                hour = datetime.now().strftime("%Y-%m-%dT%H")
+                body = json.dumps({
+                    "current_weather": {"time": f"{hour}:00", "temperature": 18.4, "windspeed": 3.2},
+                    "hourly": {
+                        "time": [f"{hour}:00"],
+                        "relative_humidity_2m": [62],
+                    },
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd  = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url    = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1/forecast"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    with FakeWeatherServer() as server:
+        os.environ["OPEN_METEO_URL"] = server.url
+
+        from Utils.ActionExecutor import ActionExecutor
+        from Skills.Agent.get_weather import get_weather, get_humidity, get_wind_speed, weatherData
+
+        skills = [get_weather, get_humidity, get_wind_speed]
+        for label, run in (
+            ("serial", lambda: [skill(47.6588, -117.4260) for skill in skills]),
+            ("parallel", lambda: ActionExecutor(3).run(lambda skill: skill(47.6588, -117.4260), skills)),
+        ):
+            weatherData.clearCache()
+            before = server.requests
+            start  = time.perf_counter()
+            results = run()
+            print(f"{label:<9} {(time.perf_counter() - start) * 1000:7.1f} ms   requests {server.requests - before}")
+            for result in results:
+                print(f"  {result}")
+
+        before = server.requests
+        start  = time.perf_counter()
+        get_weather(47.6588, -117.4260)
+        print(f"cached    {(time.perf_counter() - start) * 1000:7.1f} ms   requests {server.requests - before}")
@@ -5,135 +5,302 @@ Not activated by user input.
 """
 
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
-from openai import OpenAI
-from google import genai
-from google.genai import types
-# from anthropic import anthropic
-# from ollama import ollama
-
-from Utils.SkillGraph import SkillGraph
+from Core.Providers import getProvider, ProviderRouter, discardResult
+from Utils.ResponseCache import ResponseCache
+from Utils.ConversationMemory import ConversationMemory
+from Utils.Tracing import tracer, span, timer, propagate
+from Utils.Config import (
+    SPECULATIVE_TURNS, TOOL_CALLING, MAX_CONCURRENT_TURNS, MEMORY_TOKENS, MEMORY_TURNS, MEMORY_SUMMARY_TOKENS,
+    RESPONSE_CACHE, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, RESPONSE_CACHE_SIMILARITY,
+)
 
 # Set These Environment Variables in your .env file or system environment variables
-# PROVIDER=openai or google (default is openai)
+# PROVIDER=openai, google, anthropic, ollama or mock (default is openai)
 # OPENAI_API_KEY=your_openai_api_key
 # GOOGLE_API_KEY=your_google_api_key
-# ANTHROPIC_API_KEY=your_anthropic_api_key (optional, for future use)
-# OLLAMA_API_KEY=your_ollama_api_key (optional, for future use)
+# ANTHROPIC_API_KEY=your_anthropic_api_key (optional)
+# OLLAMA_HOST=your_ollama_host (optional, defaults to the local server)
+# HEDGE_PROVIDER=second provider raced against slow requests (optional)
+# PROVIDER_DEADLINE, PROVIDER_RETRIES, PROVIDER_BACKOFF, HEDGE_MIN_DELAY (optional, seconds / count)
 
 
 load_dotenv()
-graph = SkillGraph()
 
 provider = os.getenv("PROVIDER", "openai").lower()
+hedgeProvider = os.getenv("HEDGE_PROVIDER", "").lower() or None
 
-gptClient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-genClient = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
-# anthropicClient = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-# ollamaClient = ollama.Client()
+# Deadlines, retries and hedging for every model request
+router = ProviderRouter(
+    provider,
+    hedge=hedgeProvider,
+    retries=int(os.getenv("PROVIDER_RETRIES", 2)),
+    backoff=float(os.getenv("PROVIDER_BACKOFF", 0.5)),
+    minHedgeDelay=float(os.getenv("HEDGE_MIN_DELAY", 0.5)),
+    # Each turn can have two requests in flight (speculative answer and action selection)
+    workers=max(8, 2 * MAX_CONCURRENT_TURNS),
+)
 
 systemInstructions = "You are a helpful assistant that can call functions to get information."
-skillInstructions = graph.skillInstructions()
-
-## If you want to use OpenAI's chat completions, uncomment the following function and comment out the `getResponseOpenai` function below it.
-# def getResponseOpenai(inputMessages: list) -> str:
-#     return gptClient.chat.completions.create(
-#         model="gpt-4.1-mini",
-#         messages=inputMessages,
-#     ).choices[0].message.content
-
-def getResponseOpenai(inputMessages: list) -> str:
-    return gptClient.responses.create(
-        model="gpt-4.1",
-        input=inputMessages,
-    ).output_text
-
-def getResponseGoogle(ctx: str) -> str:
-    model = "gemini-2.5-flash-preview-04-17"
-    contents = [graph.handleTypedFormat("user", ctx)]
-    generateContentConfig = types.GenerateContentConfig(
-        response_mime_type="text/plain"
-    )
-    return genClient.models.generate_content(
-        model=model,
-        contents=contents,
-        config=generateContentConfig,
-    ).text
-
-# def runAnthropic(ctx: str) -> str:
-#     return anthropicClient.messages.create(
-#         model="claude-3-opus-20240229",
-#         max_tokens=1024,
-#         messages=ctx
-#     ).content[0].text
-
-# def runOllama(ctx: str) -> str:
-#     response = ollama.chat(
-#         model="llama3",
-#         messages=ctx
-#     )
-#     return response["message"]["content"]
+
+# The skill graph, the skill prompt and the provider client are built on first use
+# (or by warmUp) so importing Core stays cheap
+graph = None
+_graphLock = threading.Lock()
+
+# Runs the speculative final-answer request alongside action selection
+executor = ThreadPoolExecutor(max_workers=max(4, MAX_CONCURRENT_TURNS), thread_name_prefix="Core")
+
+# Action plans (and answers of turns without actions) for repeated utterances
+responseCache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, RESPONSE_CACHE_SIMILARITY) if RESPONSE_CACHE else None
+
+# Earlier turns of the local conversation, assembled under a token budget (server sessions keep their own)
+conversation = ConversationMemory(MEMORY_TOKENS, MEMORY_TURNS, MEMORY_SUMMARY_TOKENS) if MEMORY_TOKENS else None
+
+
+def recordTiming(stage: str, seconds: float):
+    tracer.record(stage, seconds)
+
+def timed(stage: str, func, *args, **kwargs):
+    with timer(stage):
+        return func(*args, **kwargs)
+
+def getTimings() -> dict:
+    """
+    Summarize the recorded stage timings in milliseconds (count, p50, p95, p99).
+    Stages are 'select' (action-selection call), 'skills' (action execution),
+    'speculative' and 'final' (answer calls), 'tools' (the whole native tool-calling
+    exchange, with TOOL_CALLING), 'firstToken' (streaming only) and 'turn' (the whole processInput). With TRACING on, the finer spans
+    ('parse', 'skill', 'stt', 'tts') are included too.
+    """
+    return tracer.summary()
+
+def resetTimings():
+    tracer.reset()
+
+def getGraph():
+    """
+    Return the shared SkillGraph, loading the skills on first use.
+    """
+    global graph
+    if graph is None:
+        with _graphLock:
+            if graph is None:
+                from Utils.SkillGraph import SkillGraph
+                graph = SkillGraph()
+    return graph
+
+def getSkillInstructions() -> str:
+    """
+    The action-selection prompt. Cached by the SkillGraph until its skills are reloaded.
+    """
+    return getGraph().skillInstructions()
+
+def warmUp(background: bool = True):
+    """
+    Load the skills, build the skill prompt and create the provider client ahead of the first turn.
+    Runs on a daemon thread by default; returns the thread, or None when run inline.
+    """
+    def run():
+        getSkillInstructions()
+        getProvider(provider).client
+        if hedgeProvider:
+            getProvider(hedgeProvider).client
+    if not background:
+        run()
+        return None
+    thread = threading.Thread(target=run, name="CoreWarmUp", daemon=True)
+    thread.start()
+    return thread
 
 def getResponse(*args, **kwargs):
-    if provider == "openai":
-        return getResponseOpenai(*args, **kwargs)
-    elif provider == "google":
-        return getResponseGoogle(*args, **kwargs)
-    # elif provider == "anthropic":
-    #     return runAnthropic(*args, **kwargs)
-    # elif provider == "ollama":
-    #     return runOllama(*args, **kwargs)
-    else:
-        raise ValueError("Invalid provider: choose 'openai' or 'google'")
+    return router.getResponse(*args, **kwargs)
+
+def getResponseStream(*args, **kwargs):
+    return router.getResponseStream(*args, **kwargs)
+
+def selectActions(ctx: str) -> list:
+    """
+    Ask the model which actions to run and parse its answer into a list of action strings.
+    """
+    graph = getGraph()
+    action = graph.handleJsonFormat("system", getSkillInstructions())
+    user = graph.handleJsonFormat("user", ctx)
+    message = [action, user]
+    calledAction = timed("select", getResponse, message)
+    with span("parse") as parsing:
+        actions, diagnostics = graph.parseActions(calledAction)
+        parsing.set(actions=len(actions), problems=len(diagnostics))
+    return actions
+
+def executePlan(getActions: list, verbose: bool = False) -> list:
+    """
+    Execute the selected actions and return their non-empty results as strings.
+    """
+    if not getActions:
+        return []
+    graph = getGraph()
+    actions = graph.getAgentActions()
+    results = timed("skills", graph.executeActionsConcurrent, actions, getActions)
+    filteredResults = [str(result) for result in results if result]
+    if filteredResults and verbose:
+        print("Combined Results:\n" + "\n".join(filteredResults) + "\n")
+    return filteredResults
+
+def resultsMessage(results: list):
+    """
+    The message carrying the action results to the answer request, or None without results.
+    """
+    if not results:
+        return None
+    combined = "\n".join(results)
+    return getGraph().handleJsonFormat("system", f"Use these results from the actions you called:\n{combined}")
+
+def runActions(getActions: list, verbose: bool = False):
+    """
+    Execute the selected actions and build the message carrying their results, or None.
+    """
+    return resultsMessage(executePlan(getActions, verbose))
 
 def callAction(ctx: str, verbose: bool = False):
-    if provider == "google":
-        message = skillInstructions + "\n" + ctx
-        calledAction = getResponse(message)
-    else:
-        action = graph.handleJsonFormat("system", skillInstructions)
-        user = graph.handleJsonFormat("user", ctx)
-        message = [action, user]
-        calledAction = getResponse(message)
-
-    getActions = graph.getActions(calledAction)
-    if getActions:
-        actions = graph.getAgentActions()
-        results = graph.executeActions(actions, getActions)
-        filteredResults = [str(result) for result in results if result]
-        if filteredResults:
-            combined = "\n".join(filteredResults)
-            if verbose:
-                print(f"Combined Results:\n{combined}\n")
-            if provider == "openai":
-                return graph.handleJsonFormat("system", f"Use these results from the actions you called:\n{combined}")
-            else:
-                return f"Use these results from the actions you called:\n{combined}"
-    return None
-
-def processInput(ctx: str, verbose: bool = False) -> str:
-    if provider == "google":
-        messages = []
-        actionMessage = callAction(ctx, verbose)
-        if actionMessage:
-            messages.append(actionMessage if isinstance(actionMessage, str) else actionMessage["content"])
-        messages.append(ctx)
-        fullMessage = "\n".join(messages)
-        completion = getResponse(fullMessage)
-    else:
-        system = graph.handleJsonFormat("system", systemInstructions)
-        user = graph.handleJsonFormat("user", ctx)
-        messages = [system, user]
-        actionMessage = callAction(ctx, verbose)
-        if actionMessage:
-            messages.append(actionMessage)
-        completion = getResponse(messages)
+    with span("callAction"):
+        return runActions(selectActions(ctx), verbose)
+
+def buildFinalRequest(ctx: str, actionMessage=None, history: list = None):
+    """
+    Build the final-answer request, with the action results appended when there are any.
+    history holds earlier messages of the conversation, oldest first (see ConversationMemory);
+    it sits after the fixed system prompt so the start of the request stays the same across turns.
+    """
+    graph = getGraph()
+    system = graph.handleJsonFormat("system", systemInstructions)
+    user = graph.handleJsonFormat("user", ctx)
+    messages = [system, *(history or []), user]
+    if actionMessage:
+        messages.append(actionMessage)
+    return messages
+
+def toolTurn(ctx: str, verbose: bool = False, history: list = None):
+    """
+    One turn with the provider's native function calling (TOOL_CALLING): the request carries the
+    skill schemas, the model calls skills directly and their results go back in the same
+    conversation, so there is no action-selection prompt and no second full answer request.
+    Returns (plan, answer, results) like runTurn; the plan holds the calls as action strings,
+    so a cached plan replays through executePlan without asking the model again.
+    """
+    graph = getGraph()
+    plan, results = [], []
+
+    def callTools(calls):
+        plan.extend(action for action in (graph.toolAction(name, arguments) for name, arguments in calls) if action)
+        outputs = timed("skills", graph.executeToolCalls, calls)
+        results.extend(output for output in outputs if output)
+        if outputs and verbose:
+            print("Combined Results:\n" + "\n".join(outputs) + "\n")
+        return outputs
+
+    answer = timed("tools", router.getToolResponse, buildFinalRequest(ctx, history=history), graph.getToolSchemas(), callTools)
+    return plan, answer, results
+
+def runTurn(ctx: str, verbose: bool, request, plan: list = None, history: list = None):
+    """
+    Shared turn pipeline for processInput and processInputStream.
+    'request' is getResponse or getResponseStream. When no cached plan is given, the answer
+    request starts speculatively alongside action selection; most turns need no action,
+    so the speculative answer is the final one. Returns (plan, answer, results).
+    With TOOL_CALLING the model selects and answers in one exchange (see toolTurn).
+    """
+    if TOOL_CALLING and plan is None:
+        plan, answer, results = toolTurn(ctx, verbose, history)
+        if request is getResponseStream:
+            # Tool-calling answers arrive whole, streamed as a single chunk
+            answer = iter([answer] if answer else [])
+        return plan, answer, results
+    speculative = None
+    if plan is None:
+        if SPECULATIVE_TURNS:
+            speculative = executor.submit(propagate(timed), "speculative", request, buildFinalRequest(ctx, history=history))
+        plan = selectActions(ctx)
+    results = executePlan(plan, verbose)
+    actionMessage = resultsMessage(results)
+    if speculative is not None and not actionMessage:
+        return plan, speculative.result(), results
+    if speculative is not None:
+        # The speculative answer is stale; if it is already in flight it is simply discarded
+        if not speculative.cancel():
+            speculative.add_done_callback(discardResult)
+    return plan, timed("final", request, buildFinalRequest(ctx, actionMessage, history)), results
+
+def processInput(ctx: str, verbose: bool = False, memory: ConversationMemory = None) -> str:
+    """
+    Answer one utterance. The conversation so far comes from memory (the shared
+    conversation by default) and the finished turn is added to it.
+    Cached answers are only reused for turns without earlier context.
+    """
+    memory = conversation if memory is None else memory
+    history = memory.context() if memory is not None else None
+    results = []
+    with timer("turn", chars=len(ctx)) as turn:
+        cached = responseCache.get(ctx) if responseCache else None
+        if cached and cached["response"] and not history:
+            completion = cached["response"]
+            turn.set(cache="response")
+        else:
+            plan, completion, results = runTurn(ctx, verbose, getResponse, cached["plan"] if cached else None, history)
+            turn.set(cache="plan" if cached else "miss", actions=len(plan or []), historyMessages=len(history or []))
+            if responseCache and not cached and not history and completion:
+                responseCache.put(ctx, plan, completion)
 
     if not completion:
         return "I couldn't process that."
+    if memory is not None:
+        memory.add(ctx, completion, results)
     return completion if completion else "No response generated."
 
+def processInputStream(ctx: str, verbose: bool = False, memory: ConversationMemory = None):
+    """
+    Same turn as processInput, but yields the answer as it is generated.
+    In this mode the 'speculative' and 'final' timings measure time to first token.
+    """
+    memory = conversation if memory is None else memory
+    history = memory.context() if memory is not None else None
+    start = time.perf_counter()
+    cached = responseCache.get(ctx) if responseCache else None
+    if cached and cached["response"] and not history:
+        yield cached["response"]
+        recordTiming("turn", time.perf_counter() - start)
+        if memory is not None:
+            memory.add(ctx, cached["response"])
+        return
+    plan, tokens, results = runTurn(ctx, verbose, getResponseStream, cached["plan"] if cached else None, history)
+
+    produced = []
+    try:
+        for token in tokens:
+            if not produced:
+                recordTiming("firstToken", time.perf_counter() - start)
+            produced.append(token)
+            yield token
+    finally:
+        if memory is not None and produced:
+            # A reply cut short by barge-in is remembered as far as it got
+            memory.add(ctx, "".join(produced), results)
+    recordTiming("turn", time.perf_counter() - start)
+    if not produced:
+        yield "I couldn't process that."
+    elif responseCache and not cached and not history:
+        responseCache.put(ctx, plan, "".join(produced))
+
+def getCacheStats() -> dict:
+    """
+    Hit/miss counters of the response cache, or an empty dict when it is disabled.
+    """
+    return responseCache.stats() if responseCache else {}
+
 
 # if __name__ == "__main__":
 #     # Example usage using a while loop to continuously process user input
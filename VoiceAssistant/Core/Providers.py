@@ -0,0 +1,590 @@
+"""
+Provider layer for Core.
+Each provider imports its SDK and builds its client the first time it is used,
+so only the backends actually in use are ever loaded.
+
+All providers take the same input: a list of {'role', 'content'} messages
+(or a plain string, treated as one user message) and convert it to their own format.
+For native tool calling they also take JSON function schemas ({'name', 'description', 'parameters'}).
+ProviderRouter adds per-provider deadlines, retries with backoff and optional
+hedging to a second provider on top of that interface.
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dotenv import load_dotenv
+
+from Utils.Tracing import tracer, span, annotate, propagate
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+def normalizeMessages(messages) -> list:
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    return [{"role": m["role"], "content": m["content"]} for m in messages]
+
+
+def splitSystem(messages) -> tuple:
+    """
+    Split messages into the joined system text and the remaining conversation.
+    """
+    messages = normalizeMessages(messages)
+    system = "\n".join(m["content"] for m in messages if m["role"] in ("system", "developer"))
+    return system, [m for m in messages if m["role"] not in ("system", "developer")]
+
+
+def typedSchema(schema: dict):
+    """
+    Convert a JSON schema to the google-genai Schema type.
+    """
+    from google.genai import types
+    return types.Schema(
+        type=schema.get("type", "string").upper(),
+        description=schema.get("description"),
+        enum=schema.get("enum"),
+        items=typedSchema(schema["items"]) if isinstance(schema.get("items"), dict) and schema.get("type") == "array" else None,
+        properties={name: typedSchema(value) for name, value in schema.get("properties", {}).items()} or None,
+        required=schema.get("required") or None,
+    )
+
+
+def recordUsage(usage, promptField: str, completionField: str):
+    """
+    Attach the token counts reported by a provider to the current trace span (no-op when tracing is off).
+    """
+    if usage is None:
+        return
+    get = usage.get if isinstance(usage, dict) else lambda field: getattr(usage, field, None)
+    annotate(promptTokens=get(promptField), completionTokens=get(completionField))
+
+
+class Provider:
+    """
+    Base provider. Subclasses implement _createClient, getResponse and getResponseStream,
+    and getToolResponse when they support native tool calling.
+    - deadline: seconds allowed per request (<NAME>_DEADLINE, falling back to PROVIDER_DEADLINE)
+    """
+    name          = None
+    model         = None
+    maxToolRounds = 3
+
+    def __init__(self):
+        self._client   = None
+        self._lock     = threading.Lock()
+        prefix         = self.name.upper()
+        self.model     = os.getenv(f"{prefix}_MODEL", self.model)
+        self.deadline  = float(os.getenv(f"{prefix}_DEADLINE", os.getenv("PROVIDER_DEADLINE", 30)))
+        self.latencies = {}  # method -> recent latencies; a stream's is its time to first token
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._createClient()
+        return self._client
+
+    def _createClient(self):
+        raise NotImplementedError
+
+    def getResponse(self, messages) -> str:
+        raise NotImplementedError
+
+    def getResponseStream(self, messages):
+        raise NotImplementedError
+
+    def getToolResponse(self, messages, tools: list, callTools) -> str:
+        """
+        Answer with the provider's native function calling.
+        callTools(calls) runs a list of (name, arguments) and returns one result string per call.
+        The results go back in the same conversation until the model answers without calling
+        more tools (at most maxToolRounds rounds of calls).
+        """
+        raise NotImplementedError
+
+    def recordLatency(self, seconds: float, method: str = "getResponse"):
+        self.latencies.setdefault(method, deque(maxlen=200)).append(seconds)
+
+    def p95(self, method: str = "getResponse"):
+        """
+        95th percentile of recent successful latencies of one method, or None before any request.
+        Streams, full responses and tool exchanges are kept apart, since they measure different things.
+        """
+        latencies = self.latencies.get(method)
+        if not latencies:
+            return None
+        ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+class OpenAIProvider(Provider):
+    name  = "openai"
+    model = "gpt-4.1"
+
+    def _createClient(self):
+        from openai import OpenAI
+        return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=self.deadline, max_retries=0)
+
+    ## If you want to use OpenAI's chat completions, uncomment the following method and comment out the `getResponse` method below it.
+    # def getResponse(self, inputMessages) -> str:
+    #     return self.client.chat.completions.create(
+    #         model="gpt-4.1-mini",
+    #         messages=normalizeMessages(inputMessages),
+    #     ).choices[0].message.content
+
+    def getResponse(self, inputMessages) -> str:
+        response = self.client.responses.create(
+            model=self.model,
+            input=normalizeMessages(inputMessages),
+        )
+        recordUsage(response.usage, "input_tokens", "output_tokens")
+        return response.output_text
+
+    def getResponseStream(self, inputMessages):
+        stream = self.client.responses.create(
+            model=self.model,
+            input=normalizeMessages(inputMessages),
+            stream=True,
+        )
+        return startStream(stream, (event.delta for event in stream if event.type == "response.output_text.delta"))
+
+    def getToolResponse(self, inputMessages, tools, callTools) -> str:
+        request = dict(
+            model=self.model,
+            input=normalizeMessages(inputMessages),
+            tools=[{"type": "function", **tool} for tool in tools],
+        )
+        for step in range(self.maxToolRounds + 1):
+            if step == self.maxToolRounds:
+                request["tool_choice"] = "none"
+            response = self.client.responses.create(**request)
+            recordUsage(response.usage, "input_tokens", "output_tokens")
+            calls = [item for item in response.output if item.type == "function_call"]
+            if not calls:
+                return response.output_text
+            results = callTools([(call.name, json.loads(call.arguments or "{}")) for call in calls])
+            # The conversation so far stays on the server, only the tool outputs are sent back
+            request = dict(
+                model=self.model,
+                previous_response_id=response.id,
+                input=[{"type": "function_call_output", "call_id": call.call_id, "output": result} for call, result in zip(calls, results)],
+                tools=request["tools"],
+            )
+
+
+class GoogleProvider(Provider):
+    name  = "google"
+    model = "gemini-2.5-flash-preview-04-17"
+
+    def _createClient(self):
+        from google import genai
+        from google.genai import types
+        return genai.Client(
+            api_key=os.getenv("GOOGLE_API_KEY"),
+            http_options=types.HttpOptions(timeout=int(self.deadline * 1000)),
+        )
+
+    def _request(self, messages) -> dict:
+        from google.genai import types
+        system, conversation = splitSystem(messages)
+        return dict(
+            model=self.model,
+            contents=[
+                types.Content(
+                    role="model" if m["role"] == "assistant" else "user",
+                    parts=[types.Part.from_text(text=m["content"])],
+                )
+                for m in conversation
+            ],
+            config=types.GenerateContentConfig(
+                response_mime_type="text/plain",
+                system_instruction=system or None,
+            ),
+        )
+
+    def getResponse(self, messages) -> str:
+        response = self.client.models.generate_content(**self._request(messages))
+        recordUsage(response.usage_metadata, "prompt_token_count", "candidates_token_count")
+        return response.text
+
+    def getResponseStream(self, messages):
+        stream = self.client.models.generate_content_stream(**self._request(messages))
+        return startStream(stream, (chunk.text for chunk in stream if chunk.text))
+
+    def getToolResponse(self, messages, tools, callTools) -> str:
+        from google.genai import types
+        request = self._request(messages)
+        config  = request["config"]
+        config.tools = [types.Tool(function_declarations=[
+            types.FunctionDeclaration(name=tool["name"], description=tool["description"], parameters=typedSchema(tool["parameters"]))
+            for tool in tools
+        ])]
+        for step in range(self.maxToolRounds + 1):
+            if step == self.maxToolRounds:
+                config.tool_config = types.ToolConfig(function_calling_config=types.FunctionCallingConfig(mode="NONE"))
+            response = self.client.models.generate_content(**request)
+            recordUsage(response.usage_metadata, "prompt_token_count", "candidates_token_count")
+            calls = response.function_calls or []
+            if not calls:
+                return response.text
+            results = callTools([(call.name, dict(call.args or {})) for call in calls])
+            request["contents"].append(response.candidates[0].content)
+            request["contents"].append(types.Content(role="user", parts=[
+                types.Part.from_function_response(name=call.name, response={"result": result})
+                for call, result in zip(calls, results)
+            ]))
+
+
+class AnthropicProvider(Provider):
+    name  = "anthropic"
+    model = "claude-3-opus-20240229"
+
+    def _createClient(self):
+        import anthropic
+        return anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), timeout=self.deadline, max_retries=0)
+
+    def _request(self, messages) -> dict:
+        system, conversation = splitSystem(messages)
+        request = dict(model=self.model, max_tokens=1024, messages=conversation)
+        if system:
+            request["system"] = system
+        return request
+
+    def getResponse(self, messages) -> str:
+        response = self.client.messages.create(**self._request(messages))
+        recordUsage(response.usage, "input_tokens", "output_tokens")
+        return response.content[0].text
+
+    def getResponseStream(self, messages):
+        stream = self.client.messages.create(stream=True, **self._request(messages))
+        return startStream(stream, (
+            event.delta.text for event in stream
+            if event.type == "content_block_delta" and getattr(event.delta, "text", None)
+        ))
+
+    def getToolResponse(self, messages, tools, callTools) -> str:
+        request = self._request(messages)
+        request["tools"] = [{"name": tool["name"], "description": tool["description"], "input_schema": tool["parameters"]} for tool in tools]
+        for step in range(self.maxToolRounds + 1):
+            if step == self.maxToolRounds:
+                request["tool_choice"] = {"type": "none"}
+            response = self.client.messages.create(**request)
+            recordUsage(response.usage, "input_tokens", "output_tokens")
+            calls = [block for block in response.content if block.type == "tool_use"]
+            if not calls:
+                return "".join(block.text for block in response.content if block.type == "text")
+            results = callTools([(call.name, call.input) for call in calls])
+            request["messages"] = [
+                *request["messages"],
+                {"role": "assistant", "content": response.content},
+                {"role": "user", "content": [{"type": "tool_result", "tool_use_id": call.id, "content": result} for call, result in zip(calls, results)]},
+            ]
+
+
+class OllamaProvider(Provider):
+    name  = "ollama"
+    model = "llama3"
+
+    def _createClient(self):
+        import ollama
+        return ollama.Client(host=os.getenv("OLLAMA_HOST"), timeout=self.deadline)
+
+    def getResponse(self, messages) -> str:
+        response = self.client.chat(
+            model=self.model,
+            messages=normalizeMessages(messages),
+        )
+        recordUsage(response, "prompt_eval_count", "eval_count")
+        return response["message"]["content"]
+
+    def getResponseStream(self, messages):
+        stream = self.client.chat(model=self.model, messages=normalizeMessages(messages), stream=True)
+        return startStream(stream, (chunk["message"]["content"] for chunk in stream if chunk["message"]["content"]))
+
+    def getToolResponse(self, messages, tools, callTools) -> str:
+        messages = normalizeMessages(messages)
+        schemas  = [{"type": "function", "function": tool} for tool in tools]
+        for step in range(self.maxToolRounds + 1):
+            # Ollama has no tool_choice, the last round simply offers no tools
+            response = self.client.chat(model=self.model, messages=messages, tools=schemas if step < self.maxToolRounds else None)
+            recordUsage(response, "prompt_eval_count", "eval_count")
+            message = response["message"]
+            calls   = message.get("tool_calls") or []
+            if not calls:
+                return message["content"]
+            results  = callTools([(call["function"]["name"], dict(call["function"]["arguments"] or {})) for call in calls])
+            messages = [
+                *messages,
+                {"role": "assistant", "content": message.get("content") or "", "tool_calls": calls},
+                *({"role": "tool", "content": result, "tool_name": call["function"]["name"]} for call, result in zip(calls, results)),
+            ]
+
+
+class MockProvider(Provider):
+    """
+    Offline provider for tests and benchmarks.
+    - latency:     seconds per request, or a callable returning one (e.g. a random distribution)
+    - responder:   callable(messages) -> str; by default answers 'None' to action-selection
+                   prompts and echoes the last user message otherwise
+    - failureRate: probability that a request raises, to exercise retries and hedging
+    - toolResponder: callable(messages, tools) -> list of (name, arguments) calls or the answer text,
+                     for getToolResponse; by default it answers with responder and calls nothing
+    Latency can also be set with MOCK_LATENCY_MS and MOCK_JITTER_MS.
+    """
+    name  = "mock"
+    model = "mock"
+
+    def __init__(self, latency=None, responder=None, failureRate: float = 0.0, tokenDelay: float = 0.0, toolResponder=None):
+        super().__init__()
+        if latency is None:
+            base   = float(os.getenv("MOCK_LATENCY_MS", 50)) / 1000
+            jitter = float(os.getenv("MOCK_JITTER_MS", 0)) / 1000
+            latency = (lambda: base + random.uniform(0, jitter)) if jitter else base
+        self.latency     = latency
+        self.responder   = responder or self.defaultResponder
+        self.toolResponder = toolResponder or (lambda messages, tools: self.responder(messages))
+        self.failureRate = failureRate
+        self.tokenDelay  = tokenDelay
+        self.calls       = 0
+        self.callsLock   = threading.Lock()
+
+    def _createClient(self):
+        return self
+
+    @staticmethod
+    def defaultResponder(messages) -> str:
+        system, conversation = splitSystem(messages)
+        if system.startswith("You determine the best course of action"):
+            return "None"
+        lastUser = next((m["content"] for m in reversed(conversation) if m["role"] == "user"), "")
+        return f"You said: {lastUser}"
+
+    def _wait(self):
+        with self.callsLock:
+            self.calls += 1
+        delay = self.latency() if callable(self.latency) else self.latency
+        time.sleep(max(0.0, delay))
+        if self.failureRate and random.random() < self.failureRate:
+            raise RuntimeError("Mock provider failure")
+
+    def getResponse(self, messages) -> str:
+        self._wait()
+        text = self.responder(messages)
+        if tracer.enabled:
+            # Rough word counts stand in for tokens
+            recordUsage({"prompt": sum(len(m["content"].split()) for m in normalizeMessages(messages)), "completion": len(text.split())}, "prompt", "completion")
+        return text
+
+    def getResponseStream(self, messages):
+        self._wait()
+        text = self.responder(messages)
+
+        def tokens():
+            for index, word in enumerate(text.split(" ")):
+                if self.tokenDelay:
+                    time.sleep(self.tokenDelay)
+                yield word if index == 0 else " " + word
+        return tokens()
+
+    def getToolResponse(self, messages, tools, callTools) -> str:
+        messages = normalizeMessages(messages)
+        sent     = messages
+        for step in range(self.maxToolRounds + 1):
+            self._wait()
+            offered = tools if step < self.maxToolRounds else []
+            reply   = self.toolResponder(messages, offered)
+            if tracer.enabled:
+                # Like previous_response_id, a follow-up round only sends the tool results
+                prompt = sum(len(m["content"].split()) for m in sent) + len(json.dumps(offered).split())
+                recordUsage({"prompt": prompt, "completion": len(str(reply).split())}, "prompt", "completion")
+            if isinstance(reply, str):
+                return reply
+            results  = callTools(reply)
+            sent     = [{"role": "tool", "content": result} for result in results]
+            messages = messages + sent
+
+
+PROVIDERS = {
+    "openai": OpenAIProvider,
+    "google": GoogleProvider,
+    "anthropic": AnthropicProvider,
+    "ollama": OllamaProvider,
+    "mock": MockProvider,
+}
+
+_instances = {}
+_instancesLock = threading.Lock()
+
+
+def getProvider(name: str) -> Provider:
+    """
+    Return the shared provider instance for the given name, creating it on first use.
+    """
+    name = name.lower()
+    with _instancesLock:
+        if name not in _instances:
+            if name not in PROVIDERS:
+                raise ValueError(f"Invalid provider: choose one of {', '.join(PROVIDERS)}")
+            _instances[name] = PROVIDERS[name]()
+        return _instances[name]
+
+
+def setProvider(name: str, instance: Provider):
+    """
+    Register a provider instance under a name, e.g. a MockProvider with injected latency.
+    """
+    with _instancesLock:
+        _instances[name.lower()] = instance
+
+
+class ProviderRouter:
+    """
+    Calls the primary provider with its deadline and retries failed requests with exponential backoff.
+    With a hedge provider configured, a duplicate request is sent to it when the primary has not
+    answered after hedgeDelay (the primary's recent p95 latency for the same method, never below minHedgeDelay);
+    the first successful answer wins and the other one is discarded.
+    """
+
+    def __init__(self, primary: str, hedge: str = None, retries: int = 2, backoff: float = 0.5, minHedgeDelay: float = 0.5,
+                 workers: int = 8):
+        self.primary       = primary
+        self.hedge         = hedge or None
+        self.retries       = retries
+        self.backoff       = backoff
+        self.minHedgeDelay = minHedgeDelay
+        self.pool          = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Provider")
+        self.stats         = {"requests": 0, "retries": 0, "hedged": 0, "hedgeWins": 0, "failures": 0}
+        self._lock         = threading.Lock()  # Server workers share one router
+
+    def getResponse(self, messages) -> str:
+        return self._withRetries("getResponse", messages)
+
+    def getResponseStream(self, messages):
+        """
+        Streams race on the first token: the stream that produces it first is returned.
+        """
+        return self._withRetries("getResponseStream", messages)
+
+    def getToolResponse(self, messages, tools: list, callTools) -> str:
+        """
+        Native tool calling on the primary provider. Tool calls can have side effects (opening
+        an application), so there is no hedging, and a failed request is only retried when
+        no tool has run yet.
+        """
+        self._count("requests")
+        called = []
+        def tracked(calls):
+            called.append(len(calls))
+            return callTools(calls)
+        for attempt in range(self.retries + 1):
+            try:
+                return self._call(self.primary, "getToolResponse", messages, tools, tracked)
+            except Exception as e:
+                if called or attempt == self.retries:
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                delay = self.backoff * (2 ** attempt) * random.uniform(0.8, 1.2)
+                logger.warning(f"Provider request failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def hedgeDelay(self, method: str = "getResponse") -> float:
+        p95 = getProvider(self.primary).p95(method)
+        return max(self.minHedgeDelay, p95) if p95 is not None else self.minHedgeDelay
+
+    def _withRetries(self, method: str, messages):
+        self._count("requests")
+        for attempt in range(self.retries + 1):
+            try:
+                return self._hedged(method, messages)
+            except Exception as e:
+                if attempt == self.retries:
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                delay = self.backoff * (2 ** attempt) * random.uniform(0.8, 1.2)
+                logger.warning(f"Provider request failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    def _call(self, name: str, method: str, messages, *args):
+        provider = getProvider(name)
+        with span("provider", provider=name, method=method):
+            start  = time.perf_counter()
+            result = getattr(provider, method)(messages, *args)
+            provider.recordLatency(time.perf_counter() - start, method)
+        return result
+
+    def _hedged(self, method: str, messages):
+        primary  = getProvider(self.primary)
+        futures  = {self.pool.submit(propagate(self._call), self.primary, method, messages): self.primary}
+        deadline = time.monotonic() + primary.deadline
+        if self.hedge:
+            done, _ = wait(futures, timeout=min(self.hedgeDelay(method), primary.deadline))
+            # Hedge when the primary is slow, or when it already failed
+            if not done or any(future.exception() is not None for future in done):
+                hedge = getProvider(self.hedge)
+                self._count("hedged")
+                futures[self.pool.submit(propagate(self._call), self.hedge, method, messages)] = self.hedge
+                deadline = max(deadline, time.monotonic() + hedge.deadline)
+
+        pending = set(futures)
+        error   = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if futures[future] != self.primary:
+                        self._count("hedgeWins")
+                    for loser in pending:
+                        loser.add_done_callback(discardResult)
+                    return future.result()
+                error = future.exception()
+        for loser in pending:
+            loser.add_done_callback(discardResult)
+        if error is not None and not pending:
+            raise error
+        raise TimeoutError(f"No provider answered within {max(getProvider(name).deadline for name in futures.values()):.1f}s")
+
+
+def discardResult(future):
+    """
+    Done-callback for a request whose answer is no longer wanted: closes a stream it returned.
+    """
+    if not future.cancelled() and future.exception() is None:
+        close = getattr(future.result(), "close", None)
+        if close:
+            close()
+
+
+def startStream(stream, tokens):
+    """
+    Wait for the first token so the request is in flight before returning,
+    then hand back a generator that closes the underlying stream when it is closed.
+    """
+    first = next(tokens, None)
+
+    def generate():
+        try:
+            if first is not None:
+                yield first
+            yield from tokens
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+    return generate()
@@ -0,0 +1,259 @@
+"""
+Server mode: one assistant backend for many thin voice clients.
+A small asyncio HTTP/1.1 server (standard library only, keep-alive) in front of Core.
+Every session keeps its own conversation history (SESSION_MEMORY_TOKENS, always on) and
+fast-path state, while the skill graph, the skill prompt and the provider connection pools are
+shared by all of them. The response cache is shared too, and only holds what doesn't depend on a
+session: action plans, which are selected from the utterance alone, and answers to turns that ran
+no skills and had no earlier context. A session with history never gets a cached answer.
+
+Turns run on a bounded thread pool (MAX_CONCURRENT_TURNS). Up to MAX_QUEUED_TURNS more
+may wait for a slot; beyond that requests are turned away with 503 and Retry-After
+instead of piling up. A session answers one turn at a time, in order.
+
+    POST   /sessions              -> {"session": id}
+    POST   /sessions/<id>/turns   {"text": "..."} -> {"answer": "...", "path": "skill" | "llm", "ms": ...}
+    DELETE /sessions/<id>
+    GET    /stats                 -> sessions, load, counters and stage timings
+
+Run from the VoiceAssistant directory:
+    python -m Core.Server
+"""
+
+import json
+import time
+import uuid
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from Core.Core import processInput, getGraph, getTimings, warmUp
+from Utils.IntentRouter import IntentRouter
+from Utils.ConversationMemory import ConversationMemory
+from Utils.Config import (
+    SERVER_HOST, SERVER_PORT, MAX_CONCURRENT_TURNS, MAX_QUEUED_TURNS, MAX_SESSIONS,
+    SESSION_IDLE_TIMEOUT, SESSION_MEMORY_TOKENS, MEMORY_TURNS, MEMORY_SUMMARY_TOKENS, FAST_PATH, FAST_PATH_CONFIDENCE,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY = 64 * 1024
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str, headers: dict = None):
+        super().__init__(message)
+        self.status  = status
+        self.headers = headers or {}
+
+
+class ServerSession:
+    """
+    Conversation state of one client: its ConversationMemory and, with the fast path on,
+    its own IntentRouter (which keeps per-client prefetch state).
+    The memory always exists, so a turn never falls back to Core's module-level conversation.
+    """
+
+    def __init__(self, sessionId: str, respond, fastPath: bool = FAST_PATH):
+        self.id       = sessionId
+        self.respond  = respond
+        self.memory   = ConversationMemory(SESSION_MEMORY_TOKENS, MEMORY_TURNS, MEMORY_SUMMARY_TOKENS)
+        self.lock     = asyncio.Lock()
+        self.lastSeen = time.monotonic()
+        self.turns    = 0
+        self.router   = IntentRouter(getGraph, self._answer, threshold=FAST_PATH_CONFIDENCE, memory=self.memory) if fastPath else None
+
+    def turn(self, text: str) -> dict:
+        """
+        Answer one utterance (runs on a worker thread). Model turns are added to the memory by
+        Core, turns answered by a user skill by the router.
+        """
+        start = time.perf_counter()
+        if self.router:
+            answer, path = self.router.route(text), self.router.lastPath
+        else:
+            answer, path = self._answer(text), "llm"
+        self.turns += 1
+        return {"answer": answer, "path": path, "ms": round((time.perf_counter() - start) * 1000, 1)}
+
+    def _answer(self, ctx: str, verbose: bool = False) -> str:
+        return self.respond(ctx, verbose, self.memory)
+
+
+class AssistantServer:
+    """
+    - respond:       callable(ctx, verbose, memory) returning the answer (Core.processInput by default);
+                     a fake can be passed in (with fastPath off) to run the server without skills or a model
+    - fastPath:      answer clear user-skill commands locally, as the voice loop does
+    - maxConcurrent: turns processed at once
+    - maxQueued:     turns allowed to wait for a slot before new ones get 503
+    """
+
+    def __init__(self, host: str = SERVER_HOST, port: int = SERVER_PORT, respond=None,
+                 maxConcurrent: int = MAX_CONCURRENT_TURNS, maxQueued: int = MAX_QUEUED_TURNS,
+                 maxSessions: int = MAX_SESSIONS, idleTimeout: float = SESSION_IDLE_TIMEOUT, fastPath: bool = FAST_PATH):
+        self.host          = host
+        self.port          = port
+        self.respond       = respond or processInput
+        self.maxConcurrent = maxConcurrent
+        self.maxQueued     = maxQueued
+        self.maxSessions   = maxSessions
+        self.idleTimeout   = idleTimeout
+        self.fastPath      = fastPath
+        self.sessions      = {}
+        self.pending       = 0  # Turns running or waiting for a slot
+        self.workers       = ThreadPoolExecutor(max_workers=maxConcurrent, thread_name_prefix="ServerTurn")
+        self.stats         = {"turns": 0, "rejected": 0, "errors": 0, "expired": 0}
+        self.server        = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._connection, self.host, self.port)
+        self.port   = self.server.sockets[0].getsockname()[1]
+        self._sweeper = asyncio.create_task(self._expireSessions())
+        logger.info(f"Assistant server listening on http://{self.host}:{self.port}")
+        return self
+
+    async def serveForever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self._sweeper.cancel()
+        self.server.close()
+        await self.server.wait_closed()
+        self.workers.shutdown(wait=False, cancel_futures=True)
+
+    # ----- Routes -----
+    async def dispatch(self, method: str, path: str, body: bytes):
+        parts = [part for part in path.split("?", 1)[0].split("/") if part]
+        if parts == ["sessions"] and method == "POST":
+            return 201, self.createSession()
+        if parts == ["stats"] and method == "GET":
+            return 200, self.getStats()
+        if len(parts) >= 2 and parts[0] == "sessions":
+            session = self.sessions.get(parts[1])
+            if session is None:
+                raise HttpError(404, f"Unknown session: {parts[1]}")
+            if len(parts) == 2 and method == "DELETE":
+                del self.sessions[session.id]
+                return 200, {"session": session.id, "turns": session.turns}
+            if parts[2:] == ["turns"] and method == "POST":
+                return 200, await self.runTurn(session, self._text(body))
+            raise HttpError(405, f"{method} not allowed on {path}")
+        raise HttpError(404, f"No route for {method} {path}")
+
+    def createSession(self) -> dict:
+        if len(self.sessions) >= self.maxSessions:
+            raise HttpError(503, "Too many sessions", {"Retry-After": "5"})
+        session = ServerSession(uuid.uuid4().hex, self.respond, self.fastPath)
+        self.sessions[session.id] = session
+        return {"session": session.id}
+
+    async def runTurn(self, session: ServerSession, text: str) -> dict:
+        # Backpressure: a bounded number of turns may run or wait, the rest are refused right away
+        if self.pending >= self.maxConcurrent + self.maxQueued:
+            self.stats["rejected"] += 1
+            raise HttpError(503, "Server busy", {"Retry-After": "1"})
+        self.pending += 1
+        try:
+            async with session.lock:
+                session.lastSeen = time.monotonic()
+                result = await asyncio.get_running_loop().run_in_executor(self.workers, session.turn, text)
+            self.stats["turns"] += 1
+            return result
+        except Exception:
+            self.stats["errors"] += 1
+            logger.error(f"Error answering '{text}' in session {session.id}:", exc_info=True)
+            raise HttpError(500, "Could not answer that")
+        finally:
+            self.pending -= 1
+            session.lastSeen = time.monotonic()
+
+    def getStats(self) -> dict:
+        return {
+            "sessions": len(self.sessions),
+            "pending": self.pending,
+            "maxConcurrent": self.maxConcurrent,
+            "maxQueued": self.maxQueued,
+            **self.stats,
+            "timings": getTimings(),
+        }
+
+    @staticmethod
+    def _text(body: bytes) -> str:
+        try:
+            text = json.loads(body or b"{}").get("text", "")
+        except (ValueError, AttributeError):
+            raise HttpError(400, "Body must be a JSON object")
+        if not isinstance(text, str) or not text.strip():
+            raise HttpError(400, "Missing 'text'")
+        return text.strip()
+
+    async def _expireSessions(self):
+        while True:
+            await asyncio.sleep(min(60, max(1, self.idleTimeout / 4)))
+            cutoff = time.monotonic() - self.idleTimeout
+            for sessionId, session in list(self.sessions.items()):
+                if session.lastSeen < cutoff and not session.lock.locked():
+                    del self.sessions[sessionId]
+                    self.stats["expired"] += 1
+
+    # ----- HTTP -----
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                request = await reader.readline()
+                if not request.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keepAlive = headers.get("connection", "").lower() != "close"
+                try:
+                    method, path, _ = request.decode("latin-1").split(" ", 2)
+                    length = int(headers.get("content-length", 0))
+                    if length > MAX_BODY:
+                        keepAlive = False
+                        raise HttpError(413, "Request body too large")
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.dispatch(method, path, body)
+                    extra = {}
+                except HttpError as e:
+                    status, payload, extra = e.status, {"error": str(e)}, e.headers
+                except ValueError:
+                    status, payload, extra, keepAlive = 400, {"error": "Malformed request"}, {}, False
+                await self._write(writer, status, payload, extra, keepAlive)
+                if not keepAlive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write(writer, status: int, payload: dict, headers: dict, keepAlive: bool):
+        body  = json.dumps(payload).encode()
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                 "Content-Type: application/json",
+                 f"Content-Length: {len(body)}",
+                 f"Connection: {'keep-alive' if keepAlive else 'close'}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    warmUp(background=False)
+    try:
+        asyncio.run(AssistantServer().serveForever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,191 @@
+"""
+Asyncio session engine.
+Capture, inference and playback run as separate tasks linked by queues, so the
+assistant keeps listening while it is thinking or talking. A new utterance
+barges in: it cancels the reply that is being generated and the one being played.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+
+from Utils.SpeechStream import segmentSentences
+
+logger = logging.getLogger(__name__)
+
+
+class AssistantSession:
+    """
+    - sources: utterance producers. Each is either a blocking callable returning the next
+               utterance (or None to skip), like Echo.listen and Echo.keyboard, or an async iterable.
+    - respond: blocking callable(ctx) returning the answer text or a token iterator,
+               e.g. IntentRouter.route with stream=True.
+    - speak:   blocking callable(chunk) that plays one chunk.
+    - stop:    optional callable that interrupts the chunk currently playing.
+    - cleaner: optional callable applied to each chunk before it is played.
+    Fake sources and sinks can be passed in to run the engine headless.
+    """
+
+    def __init__(self, sources, respond, speak, stop=None, cleaner=None, exitWords=("exit", "quit", "q"), goodbye="Exiting. Goodbye!"):
+        self.sources    = list(sources)
+        self.respond    = respond
+        self.speak      = speak
+        self.stop       = stop
+        self.cleaner    = cleaner
+        self.exitWords  = set(exitWords)
+        self.goodbye    = goodbye
+        self.generation = 0
+        self.transcript = []  # (seconds since start, event, text)
+        self._cancel    = threading.Event()
+        self._current   = None
+        self._speaking  = False
+        self._start     = None
+
+    async def run(self):
+        """
+        Run until an exit word is heard or every source is exhausted.
+        """
+        self._loop    = asyncio.get_running_loop()
+        self._start   = time.perf_counter()
+        self._inputs  = asyncio.Queue()
+        self._outputs = asyncio.Queue()
+        self._done    = asyncio.Event()
+
+        captures = [asyncio.create_task(self._capture(source)) for source in self.sources]
+        workers  = [asyncio.create_task(self._inference()), asyncio.create_task(self._playback())]
+        watcher  = asyncio.create_task(self._watchSources(captures))
+        await self._done.wait()
+        for task in captures + workers + [watcher]:
+            task.cancel()
+        await asyncio.gather(*captures, *workers, watcher, return_exceptions=True)
+
+    def _log(self, event: str, text: str = ""):
+        self.transcript.append((time.perf_counter() - self._start, event, text))
+
+    # ----- Capture -----
+    async def _capture(self, source):
+        if hasattr(source, "__aiter__"):
+            async for utterance in source:
+                await self._heard(utterance)
+            return
+        # Blocking sources (input(), the microphone) run on a daemon thread so they never hold up exit
+        received = asyncio.Queue()
+        finished = object()
+
+        def pump():
+            while not self._done.is_set():
+                try:
+                    utterance = source()
+                except EOFError:
+                    utterance = finished
+                except Exception:
+                    logger.error("Error reading from input source:", exc_info=True)
+                    continue
+                try:
+                    self._loop.call_soon_threadsafe(received.put_nowait, utterance)
+                except RuntimeError:
+                    return  # The loop has closed
+                if utterance is finished:
+                    return
+        threading.Thread(target=pump, name="SessionCapture", daemon=True).start()
+
+        while True:
+            utterance = await received.get()
+            if utterance is finished:
+                return
+            await self._heard(utterance)
+
+    async def _heard(self, utterance):
+        if not utterance:
+            return
+        utterance = utterance.strip()
+        self._log("heard", utterance)
+        if self._busy():
+            self._bargeIn()
+        await self._inputs.put(utterance)
+
+    async def _watchSources(self, captures):
+        await asyncio.gather(*captures, return_exceptions=True)
+        # Every source is exhausted: let the last reply finish, then stop
+        await self._inputs.put(None)
+
+    def _busy(self) -> bool:
+        return (self._current is not None and not self._current.done()) or self._speaking or not self._outputs.empty()
+
+    def _bargeIn(self):
+        """
+        Cancel the reply in flight: drop queued chunks, stop generation and interrupt playback.
+        """
+        self.generation += 1
+        self._log("bargeIn")
+        self._cancel.set()
+        if self._current is not None:
+            self._current.cancel()
+        while not self._outputs.empty():
+            self._outputs.get_nowait()
+        if self.stop and self._speaking:
+            try:
+                self.stop()
+            except Exception:
+                logger.error("Error interrupting playback:", exc_info=True)
+
+    # ----- Inference -----
+    async def _inference(self):
+        while True:
+            utterance = await self._inputs.get()
+            if utterance is None:
+                await self._outputs.join()
+                self._done.set()
+                return
+            if utterance.lower() in self.exitWords:
+                if self._busy():
+                    self._bargeIn()
+                await self._play(self.goodbye)
+                self._done.set()
+                return
+            self._cancel = threading.Event()
+            self._current = asyncio.create_task(self._generate(utterance, self.generation, self._cancel))
+            await asyncio.wait([self._current])
+
+    async def _generate(self, utterance: str, generation: int, cancel: threading.Event):
+        def produce():
+            try:
+                answer = self.respond(utterance)
+            except Exception as e:
+                logger.error(f"Error responding to '{utterance}':", exc_info=True)
+                answer = f"Sorry, something went wrong: {e}"
+            tokens = [answer] if isinstance(answer, str) else answer
+            try:
+                for chunk in segmentSentences(tokens):
+                    if cancel.is_set():
+                        break
+                    self._loop.call_soon_threadsafe(self._outputs.put_nowait, (generation, chunk))
+            finally:
+                close = getattr(tokens, "close", None)
+                if close:
+                    close()
+        await asyncio.to_thread(produce)
+
+    # ----- Playback -----
+    async def _playback(self):
+        while True:
+            generation, chunk = await self._outputs.get()
+            try:
+                if generation == self.generation:
+                    await self._play(chunk)
+            finally:
+                self._outputs.task_done()
+
+    async def _play(self, chunk: str):
+        cleaned = self.cleaner(chunk) if self.cleaner else chunk
+        if not cleaned.strip():
+            return
+        self._log("speak", cleaned)
+        self._speaking = True
+        try:
+            await asyncio.to_thread(self.speak, cleaned)
+        except Exception:
+            logger.error(f"Error speaking chunk '{cleaned}':", exc_info=True)
+        finally:
+            self._speaking = False
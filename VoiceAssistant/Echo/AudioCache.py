@@ -0,0 +1,179 @@
+import os
+import re
+import wave
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Numbers, times and dates are the parts of templated answers that change between turns
+VARIABLE = re.compile(r"(\d+(?:[.:,/]\d+)*)")
+SPOKEN   = re.compile(r"\w")
+
+
+def templateFragments(text: str, match=None) -> list:
+    """
+    Split a templated answer into fragments that recur across turns:
+    "Current temperature: 18.4 C" -> ["Current temperature:", "18.4", "C"].
+    Given the match of a template with groups, the groups are the changing parts instead, and
+    pieces with nothing to say are dropped: "14:35" against r"(\d+):(\d+)" -> ["14", "35"].
+    """
+    if match is None or not match.re.groups:
+        return [piece.strip() for piece in VARIABLE.split(text) if piece.strip()]
+    pieces, last = [], 0
+    for group in range(1, match.re.groups + 1):
+        start, end = match.span(group)
+        if start < 0:
+            continue
+        pieces += [text[last:start], text[start:end]]
+        last = end
+    pieces.append(text[last:])
+    return [piece.strip() for piece in pieces if SPOKEN.search(piece)]
+
+
+def readWav(path: str) -> tuple:
+    """
+    Return (params, frames) of a WAV file; params are (channels, sampleWidth, sampleRate).
+    """
+    with wave.open(path, "rb") as wav:
+        return (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()), wav.readframes(wav.getnframes())
+
+
+def trimSilence(params: tuple, frames: bytes, marginMs: int = 30) -> bytes:
+    """
+    Cut the leading and trailing silence engines pad each rendering with, keeping marginMs.
+    """
+    channels, width, rate = params
+    if width != 2 or not frames:
+        return frames
+    samples = np.abs(np.frombuffer(frames, dtype="<i2").reshape(-1, channels).astype(np.int32)).max(axis=1)
+    loud    = np.flatnonzero(samples > max(200, samples.max() * 0.02))
+    if not len(loud):
+        return frames
+    margin = rate * marginMs // 1000
+    start  = max(0, loud[0] - margin)
+    end    = min(len(samples), loud[-1] + margin)
+    return frames[start * channels * width:end * channels * width]
+
+
+def joinFragments(rendered: list, gapMs: int = 60) -> tuple:
+    """
+    Join (params, frames) renderings of consecutive fragments into one clip with a short pause
+    between them. Returns None when the fragments don't share a format.
+    """
+    params = rendered[0][0]
+    if any(other != params for other, _ in rendered):
+        return None
+    channels, width, rate = params
+    gap = b"\x00" * (rate * gapMs // 1000 * channels * width)
+    return params, gap.join(trimSilence(params, frames) for _, frames in rendered)
+
+
+class AudioCache:
+    """
+    Content-addressed on-disk LRU of rendered utterances.
+    The key hashes the text with the engine and voice settings (gender, rate, pitch, volume),
+    so changing the voice never plays a stale rendering. Files live under directory/<2 hex>/<key>.wav;
+    the least recently played are deleted once the cache passes maxBytes. Recency survives restarts
+    through the files' modification times.
+    """
+
+    def __init__(self, directory: str, maxBytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.maxBytes  = maxBytes
+        self.lock      = threading.Lock()
+        self.entries   = OrderedDict()  # key -> bytes, least recently used first
+        self.bytes     = 0
+        self.stats     = {"hits": 0, "misses": 0, "renders": 0, "evictions": 0}
+        self._scan()
+
+    @staticmethod
+    def key(text: str, voice: tuple) -> str:
+        return hashlib.sha1(f"{voice!r}\n{text}".encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.wav")
+
+    def get(self, text: str, voice: tuple):
+        """
+        Path of the cached rendering, or None. A hit makes the entry most recently used.
+        """
+        key = self.key(text, voice)
+        with self.lock:
+            if key not in self.entries:
+                self.stats["misses"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            with self.lock:
+                self._forget(key)
+            return None
+        return path
+
+    def put(self, text: str, voice: tuple, render) -> str:
+        """
+        Render text with render(path) into the cache and return the file's path.
+        """
+        key  = self.key(text, voice)
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmpFile = f"{path}.{threading.get_ident()}.tmp"
+        render(tmpFile)
+        os.replace(tmpFile, path)
+        size = os.path.getsize(path)
+        with self.lock:
+            self._forget(key)
+            self.entries[key] = size
+            self.bytes += size
+            self.stats["renders"] += 1
+            self._evict(keep=key)
+        return path
+
+    def hitRate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def clear(self):
+        with self.lock:
+            for key in list(self.entries):
+                self._delete(key)
+
+    def _scan(self):
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".wav"):
+                    stat = os.stat(os.path.join(root, name))
+                    found.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(found):
+            self.entries[key] = size
+            self.bytes += size
+        self._evict()
+
+    def _evict(self, keep: str = None):
+        while self.bytes > self.maxBytes and len(self.entries) > 1:
+            key = next(iter(self.entries))
+            if key == keep:
+                break
+            self._delete(key)
+            self.stats["evictions"] += 1
+
+    def _delete(self, key: str):
+        self._forget(key)
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def _forget(self, key: str):
+        size = self.entries.pop(key, None)
+        if size is not None:
+            self.bytes -= size
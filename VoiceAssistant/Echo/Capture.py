@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+
+import numpy as np
+
+from Echo.WakeWord import readWav, toSamples, SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+FRAME_MS     = 30
+FRAME_BYTES  = SAMPLE_RATE * FRAME_MS // 1000 * 2  # 16-bit mono
+
+
+def frameRms(frame: bytes) -> float:
+    samples = np.frombuffer(frame, dtype="<i2").astype(np.float32)
+    return float(np.sqrt(np.mean(samples ** 2))) if len(samples) else 0.0
+
+
+class MicrophoneSource:
+    """
+    One microphone stream kept open for the whole session, read in FRAME_MS frames at SAMPLE_RATE.
+    """
+
+    def __init__(self, deviceIndex: int = None):
+        import speech_recognition as sr
+        self.microphone = sr.Microphone(device_index=deviceIndex, sample_rate=SAMPLE_RATE, chunk_size=FRAME_BYTES // 2)
+        self.key        = f"microphone:{'default' if deviceIndex is None else deviceIndex}"
+        self.microphone.__enter__()
+        self.opened     = True
+
+    def frames(self):
+        while self.opened:
+            yield self.microphone.stream.read(self.microphone.CHUNK)
+
+    def flush(self):
+        """
+        Discard audio buffered since the last read, e.g. while the assistant was speaking.
+        """
+        stream    = self.microphone.stream.pyaudio_stream
+        available = stream.get_read_available()
+        if available:
+            stream.read(available, exception_on_overflow=False)
+
+    def close(self):
+        if self.opened:
+            self.microphone.__exit__(None, None, None)
+            self.opened = False
+
+
+class WavSource:
+    """
+    A WAV fixture read as microphone frames. With realtime set, frames are paced like a live stream.
+    """
+
+    def __init__(self, path: str, realtime: bool = False):
+        samples, rate = readWav(path)
+        pcm           = (np.clip(toSamples(samples, rate), -1, 1) * 32767).astype("<i2").tobytes()
+        self.chunks   = [pcm[start:start + FRAME_BYTES] for start in range(0, len(pcm) - FRAME_BYTES + 1, FRAME_BYTES)]
+        self.realtime = realtime
+        self.key      = f"wav:{os.path.basename(path)}"
+
+    def frames(self):
+        start = time.perf_counter()
+        for index, chunk in enumerate(self.chunks):
+            if self.realtime:
+                time.sleep(max(0.0, start + (index + 1) * FRAME_MS / 1000 - time.perf_counter()))
+            yield chunk
+
+    def close(self):
+        pass
+
+
+class Calibration:
+    """
+    Ambient noise floor per input device, persisted to disk so a restart doesn't have to measure it again.
+    """
+
+    def __init__(self, path: str):
+        self.path  = path
+        self.lock  = threading.Lock()
+        self.saved = self._read()
+
+    def get(self, key: str):
+        return self.saved.get(key)
+
+    def put(self, key: str, noiseFloor: float):
+        with self.lock:
+            self.saved[key] = noiseFloor
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmpFile = f"{self.path}.tmp"
+                with open(tmpFile, "w", encoding="utf-8") as f:
+                    json.dump(self.saved, f)
+                os.replace(tmpFile, self.path)
+            except Exception:
+                logger.warning(f"Could not write calibration {self.path}", exc_info=True)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.warning(f"Ignoring unreadable calibration {self.path}", exc_info=True)
+        return {}
+
+
+class AudioCapture:
+    """
+    Long-lived capture with frame-level voice activity detection.
+    A frame is speech when its RMS is ratio times the noise floor (and at least minEnergy).
+    An utterance starts after startMs of speech, keeps preRollMs of audio from before the
+    onset, and ends as soon as endSilenceMs of silence follows it.
+    The noise floor is measured once per device, cached in calibration, and keeps adapting
+    to the silent frames between utterances.
+    """
+
+    def __init__(self, source, calibration: Calibration = None, ratio: float = 3.0, minEnergy: float = 100,
+                 startMs: int = 90, endSilenceMs: int = 350, preRollMs: int = 300, calibrateMs: int = 500,
+                 maxPhraseSeconds: float = 15, adaptRate: float = 0.05):
+        self.source        = source
+        self.calibration   = calibration
+        self.ratio         = ratio
+        self.minEnergy     = minEnergy
+        self.startFrames   = max(1, startMs // FRAME_MS)
+        self.endFrames     = max(1, endSilenceMs // FRAME_MS)
+        self.preRollFrames = max(1, preRollMs // FRAME_MS)
+        self.calibrateMs   = calibrateMs
+        self.maxFrames     = int(maxPhraseSeconds * 1000 / FRAME_MS)
+        self.adaptRate     = adaptRate
+        self.frames        = source.frames()
+        self.noiseFloor    = calibration.get(source.key) if calibration else None
+        self.savedFloor    = self.noiseFloor
+        self.stats         = {"utterances": 0, "calibrations": 0, "lastSpeechMs": 0.0, "lastSilenceMs": 0.0}
+
+    @property
+    def threshold(self) -> float:
+        return max(self.minEnergy, (self.noiseFloor or 0) * self.ratio)
+
+    def calibrate(self):
+        """
+        Measure the noise floor from calibrateMs of audio (only needed when nothing is cached).
+        """
+        levels = [frameRms(frame) for _, frame in zip(range(max(1, self.calibrateMs // FRAME_MS)), self.frames)]
+        self.noiseFloor = float(np.median(levels)) if levels else 0.0
+        self.stats["calibrations"] += 1
+        self._save()
+
+    def stream(self, timeout: float = None):
+        """
+        Yield the frames of the next utterance as they are captured; stops at its endpoint.
+        Yields nothing if no speech starts within timeout seconds or the source ends.
+        """
+        if hasattr(self.source, "flush"):
+            self.source.flush()
+        if self.noiseFloor is None:
+            self.calibrate()
+        preRoll = deque(maxlen=self.preRollFrames)
+        waited  = 0
+        onset   = 0
+        for frame in self.frames:
+            level = frameRms(frame)
+            preRoll.append(frame)
+            if level >= self.threshold:
+                onset += 1
+                if onset >= self.startFrames:
+                    break
+            else:
+                onset = 0
+                self.noiseFloor += self.adaptRate * (level - self.noiseFloor)
+            waited += 1
+            if timeout is not None and waited * FRAME_MS >= timeout * 1000:
+                return
+        else:
+            return
+
+        yield from preRoll
+        silence = 0
+        count   = len(preRoll)
+        for frame in self.frames:
+            yield frame
+            count += 1
+            silence = 0 if frameRms(frame) >= self.threshold else silence + 1
+            if silence >= self.endFrames or count >= self.maxFrames:
+                break
+        self.stats["utterances"] += 1
+        self.stats["lastSpeechMs"] = (count - silence) * FRAME_MS
+        self.stats["lastSilenceMs"] = silence * FRAME_MS
+        if self.savedFloor is None or abs(self.noiseFloor - self.savedFloor) > 0.1 * max(self.savedFloor, 1.0):
+            self._save()
+
+    def listen(self, timeout: float = None):
+        """
+        Capture the next utterance as 16-bit PCM bytes at SAMPLE_RATE, or None if there was none.
+        """
+        audio = b"".join(self.stream(timeout))
+        return audio or None
+
+    def close(self):
+        self.source.close()
+
+    def _save(self):
+        self.savedFloor = self.noiseFloor
+        if self.calibration:
+            self.calibration.put(self.source.key, self.noiseFloor)
@@ -1,32 +1,85 @@
 
-import pyttsx4
 import os
-import speech_recognition as sr
 import re
-from Utils.Config import ASSISTANT_NAME, ASSISTANT_GENDER, SPEAKING_RATE, SPEAKING_PITCH, SPEAKING_VOLUME
+from Utils.Config import ASSISTANT_NAME, STT_BACKEND, MICROPHONE_INDEX, END_SILENCE_MS, WAKE_WORD_DIR, WAKE_WORD_THRESHOLD, WAKE_WORD_MIN_ENERGY
+from Utils.SpeechStream import SpeechStreamer
+from Echo.TTSManager import TTSManager, SPEECH_TEMPLATES
+from Echo.WakeWord import WakeWordDetector, SAMPLE_RATE
+from Echo.SpeechToText import getSTTBackend, transcribeStream
+from Echo.Capture import AudioCapture, MicrophoneSource, Calibration
+from Utils.Tracing import span
 
-# Initialize the text-to-speech engine
-engine = pyttsx4.init()
+# The text-to-speech engine runs on its own thread; the voice is configured once
+tts = TTSManager()
+for template in SPEECH_TEMPLATES:
+    tts.registerTemplate(template)
 
-# Initialize the speech recognizer
-recognizer = sr.Recognizer()
+# Speech-to-text engine and microphone capture, created on first use
+stt     = None
+capture = None
 
-def listen():
-    with sr.Microphone() as source:
-        print(f"{ASSISTANT_NAME.title()} is listening...")
-        audio = recognizer.listen(source)
+# Drop captures that don't start with the assistant's name before they are sent for recognition
+wakeWord = WakeWordDetector.fromDirectory(WAKE_WORD_DIR, threshold=WAKE_WORD_THRESHOLD, minEnergy=WAKE_WORD_MIN_ENERGY) if WAKE_WORD_DIR else WakeWordDetector()
+
+def getSTT():
+    global stt
+    if stt is None:
+        stt = getSTTBackend(STT_BACKEND)
+    return stt
+
+def getCapture():
+    """
+    The microphone stream stays open between turns; its noise calibration is cached on disk.
+    """
+    global capture
+    if capture is None:
+        calibration = Calibration(os.path.join(os.getenv('CACHE_DIR', '.cache'), 'Calibration.json'))
+        capture     = AudioCapture(MicrophoneSource(MICROPHONE_INDEX), calibration, endSilenceMs=END_SILENCE_MS)
+    return capture
+
+def listen(onPartial=None):
+    """
+    Capture one phrase and return it without the assistant's name, or None if it wasn't addressed to the assistant.
+    With a streaming backend, onPartial receives the addressed text recognised so far while the user is still speaking.
+    """
+    backend = getSTT()
+    source  = getCapture()
+    print(f"{ASSISTANT_NAME.title()} is listening...")
     try:
-        text = recognizer.recognize_google(audio)
-        print(f"You said:\n{text}")
-        text = text.lower()
-        if ASSISTANT_NAME in text:
-            # Remove assistant name (and possible comma after it) from beginning of phrase
-            cleaned = text.replace(ASSISTANT_NAME, "", 1).lstrip(",. ").strip()
-            return cleaned
-        return None
+        if backend.streaming:
+            # Recognised locally while it is captured, so there is no upload to gate
+            with span("stt", backend=backend.name, streaming=True):
+                text = transcribeStream(backend, source.stream(), _partialHandler(onPartial))
+        else:
+            audio = source.listen()
+            if audio is None or not wakeWord.detect(audio, SAMPLE_RATE):
+                return None
+            with span("stt", backend=backend.name, audioMs=len(audio) * 1000 // (SAMPLE_RATE * 2)):
+                text = backend.transcribe(audio)
     except Exception as e:
         print(f"Sorry, I didn't catch that. {e}")
         return None
+    if not text:
+        print("Sorry, I didn't catch that.")
+        return None
+    print(f"You said:\n{text}")
+    return _addressed(text.lower())
+
+def _addressed(text):
+    if ASSISTANT_NAME in text:
+        # Remove assistant name (and possible comma after it) from beginning of phrase
+        cleaned = text.replace(ASSISTANT_NAME, "", 1).lstrip(",. ").strip()
+        return cleaned
+    return None
+
+def _partialHandler(onPartial):
+    if onPartial is None:
+        return None
+    def handle(text):
+        cleaned = _addressed(text.lower())
+        if cleaned:
+            onPartial(cleaned)
+    return handle
 
 
 def keyboard():
@@ -40,17 +93,38 @@ def cleanForSpeech(text):
 
 def speak(text):
     print(f"{ASSISTANT_NAME.title()}:\n{text}")
-    cleaned = cleanForSpeech(text)
-    voices = engine.getProperty('voices')
-    # If ASSISTANT_GENDER is 'male', use 0, else use 1
-    voice = 0 if ASSISTANT_GENDER == "male" else 1
-    if len(voices) > voice:
-        engine.setProperty('voice', voices[voice].id)
-    else:
-        engine.setProperty('voice', voices[0].id)  # fallback if only 1 voice
-    engine.setProperty('rate', SPEAKING_RATE)  # Set speech rate
-    engine.setProperty('pitch', SPEAKING_PITCH) # Set pitch (not supported in pyttsx3, but is supported in pyttsx4)
-    engine.setProperty('volume', SPEAKING_VOLUME)  # Set volume to maximum
-    engine.say(cleaned)
-    engine.runAndWait()
+    say(cleanForSpeech(text))
+
+def speakStream(tokens):
+    """
+    Speak a stream of tokens sentence by sentence while it is still being generated.
+    Returns the full response text once it has all been spoken.
+    """
+    print(f"{ASSISTANT_NAME.title()}:")
+    text = SpeechStreamer(say, cleanForSpeech).speak(_echoTokens(tokens))
+    print()
+    return text
+
+def _echoTokens(tokens):
+    for token in tokens:
+        print(token, end="", flush=True)
+        yield token
+
+def say(cleaned):
+    """
+    Speak already-cleaned text without printing it. Blocks until playback ends or stopSpeaking is called.
+    """
+    with span("tts", chars=len(cleaned)):
+        tts.say(cleaned)
+
+def stopSpeaking():
+    """
+    Interrupt the utterance currently being spoken (used for barge-in).
+    """
+    tts.stop()
 
+def prerenderPhrases(phrases=("Exiting. Goodbye!",)):
+    """
+    Render fixed replies into the TTS audio cache in the background, so their first use plays at once.
+    """
+    return tts.prerender(cleanForSpeech(phrase) for phrase in phrases)
@@ -0,0 +1,167 @@
+import json
+import logging
+
+import numpy as np
+
+import Utils.Config as Config
+from Echo.WakeWord import readWav, toSamples, SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# Audio is passed around as 16-bit little-endian mono PCM at SAMPLE_RATE
+SAMPLE_WIDTH = 2
+
+
+class STTBackend:
+    """
+    Interface for speech-to-text engines.
+    - transcribe(audio): whole-phrase recognition of PCM bytes, returns the text ("" if nothing was understood)
+    - stream(chunks):    consumes PCM chunks as they are captured and yields (text, isFinal) hypotheses
+    Backends that can't recognise incrementally keep the default stream, which waits for the
+    whole phrase and yields a single final result.
+    """
+    name      = "base"
+    streaming = False
+
+    def transcribe(self, audio: bytes) -> str:
+        raise NotImplementedError
+
+    def stream(self, chunks):
+        yield self.transcribe(b"".join(chunks)), True
+
+
+class GoogleBackend(STTBackend):
+    """
+    Google's free web recognizer through SpeechRecognition (needs the network).
+    """
+    name = "google"
+
+    def __init__(self):
+        import speech_recognition as sr
+        self.sr         = sr
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio: bytes) -> str:
+        try:
+            return self.recognizer.recognize_google(self.sr.AudioData(audio, SAMPLE_RATE, SAMPLE_WIDTH))
+        except self.sr.UnknownValueError:
+            return ""
+
+
+class VoskBackend(STTBackend):
+    """
+    Offline Kaldi models through vosk (pip install vosk, then download a model folder).
+    Recognises frame by frame, so partial hypotheses are available while the user is still speaking.
+    """
+    name      = "vosk"
+    streaming = True
+
+    def __init__(self, modelPath: str):
+        from vosk import Model, SetLogLevel
+        SetLogLevel(-1)
+        self.model = Model(modelPath)
+
+    def _recognizer(self):
+        from vosk import KaldiRecognizer
+        return KaldiRecognizer(self.model, SAMPLE_RATE)
+
+    def transcribe(self, audio: bytes) -> str:
+        recognizer = self._recognizer()
+        recognizer.AcceptWaveform(audio)
+        return json.loads(recognizer.FinalResult()).get("text", "")
+
+    def stream(self, chunks):
+        recognizer = self._recognizer()
+        segments   = []
+        for chunk in chunks:
+            if recognizer.AcceptWaveform(chunk):
+                # Vosk closed a segment at a pause; keep it and carry on
+                text = json.loads(recognizer.Result()).get("text", "")
+                if text:
+                    segments.append(text)
+                    yield " ".join(segments), False
+            else:
+                partial = json.loads(recognizer.PartialResult()).get("partial", "")
+                if partial:
+                    yield " ".join(segments + [partial]), False
+        text = json.loads(recognizer.FinalResult()).get("text", "")
+        yield " ".join(segments + ([text] if text else [])), True
+
+
+class WhisperBackend(STTBackend):
+    """
+    Offline Whisper models on the CPU through faster-whisper (pip install faster-whisper).
+    The model is loaded once. While streaming, the audio so far is re-decoded every
+    partialSeconds of new speech to produce partial hypotheses (0 disables them).
+    """
+    name      = "whisper"
+    streaming = True
+
+    def __init__(self, model: str = "base.en", partialSeconds: float = 1.5, computeType: str = "int8"):
+        from faster_whisper import WhisperModel
+        self.model          = WhisperModel(model, device="cpu", compute_type=computeType)
+        self.partialSeconds = partialSeconds
+
+    def transcribe(self, audio: bytes) -> str:
+        segments, _ = self.model.transcribe(toSamples(audio), language="en", beam_size=1, vad_filter=False)
+        return "".join(segment.text for segment in segments).strip()
+
+    def stream(self, chunks):
+        buffer  = bytearray()
+        decoded = 0
+        step    = int(self.partialSeconds * SAMPLE_RATE * SAMPLE_WIDTH)
+        for chunk in chunks:
+            buffer += chunk
+            if step and len(buffer) - decoded >= step:
+                decoded = len(buffer)
+                text = self.transcribe(bytes(buffer))
+                if text:
+                    yield text, False
+        yield self.transcribe(bytes(buffer)), True
+
+
+BACKENDS = {
+    "google": GoogleBackend,
+    "vosk": lambda: VoskBackend(Config.VOSK_MODEL_PATH),
+    "whisper": lambda: WhisperBackend(Config.WHISPER_MODEL),
+}
+
+
+def getSTTBackend(name: str) -> STTBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unsupported STT backend: {name}")
+    return BACKENDS[name]()
+
+
+def pcmChunks(samples: np.ndarray, chunkMs: int = 100):
+    """
+    Split float samples at SAMPLE_RATE into 16-bit PCM chunks of chunkMs, like a microphone delivers them.
+    """
+    pcm  = (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+    size = SAMPLE_RATE * chunkMs // 1000 * SAMPLE_WIDTH
+    for start in range(0, len(pcm), size):
+        yield pcm[start:start + size]
+
+
+def wavChunks(path: str, chunkMs: int = 100):
+    """
+    Stream a WAV fixture as microphone-sized PCM chunks, so any backend can be tested without a microphone.
+    """
+    samples, rate = readWav(path)
+    yield from pcmChunks(toSamples(samples, rate), chunkMs)
+
+
+def transcribeStream(backend: STTBackend, chunks, onPartial=None) -> str:
+    """
+    Run chunks through the backend, passing each partial hypothesis to onPartial. Returns the final text.
+    """
+    final = ""
+    for text, isFinal in backend.stream(chunks):
+        if isFinal:
+            final = text
+        elif onPartial:
+            try:
+                onPartial(text)
+            except Exception:
+                logger.error("Error handling partial transcript:", exc_info=True)
+    return final
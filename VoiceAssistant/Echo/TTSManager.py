@@ -0,0 +1,550 @@
+import os
+import re
+import sys
+import json
+import time
+import wave
+import queue
+import hashlib
+import threading
+import logging
+import subprocess
+from collections import OrderedDict
+
+import Utils.Config as Config
+from Echo.AudioCache import AudioCache, templateFragments, readWav, joinFragments
+
+logger = logging.getLogger(__name__)
+
+# Replies the skills give in a fixed shape, assembled from cached pieces when TTS_CACHE is on:
+# the time and date of Skills/User/date_time.py (hours, minutes and days with a leading zero
+# are left out, so the engine never reads "09" as "zero nine") and the weather lines of
+# Skills/Agent/get_weather.py
+SPEECH_TEMPLATES = [
+    r"(1\d|2[0-3]|[1-9]):([1-5]\d)",
+    r"([1-3]\d|[1-9])-([A-Za-z]+)-(\d{4})",
+    r"Current temperature: (-?[\d.]+) C / (-?[\d.]+) F",
+    r"Current humidity: (\d+)%",
+    r"Current wind speed: ([\d.]+) m/s",
+]
+
+
+def currentSettings() -> tuple:
+    """
+    The voice settings as they are in Config right now: (gender, rate, pitch, volume).
+    Read on every utterance so a change made at runtime is picked up on the next one.
+    """
+    return (Config.ASSISTANT_GENDER, Config.SPEAKING_RATE, Config.SPEAKING_PITCH, Config.SPEAKING_VOLUME)
+
+
+class TTSBackend:
+    """
+    Interface for speech engines. Every method except stop is called from the manager's worker thread.
+    Engines that can write an utterance to a WAV file implement render and set cacheable,
+    so TTS_CACHE can put an AudioCache in front of them.
+    """
+    name      = "base"
+    cacheable = False
+
+    def applySettings(self, settings: tuple):
+        pass
+
+    def speak(self, text: str):
+        raise NotImplementedError
+
+    def render(self, text: str, path: str):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+
+class Pyttsx4Backend(TTSBackend):
+    """
+    The local pyttsx4 engine. The engine and its voice list are created once, on the worker thread.
+    """
+    name      = "pyttsx4"
+    cacheable = True
+
+    def __init__(self):
+        self.engine = None
+        self.voices = None
+
+    def _getEngine(self):
+        if self.engine is None:
+            import pyttsx4
+            self.engine = pyttsx4.init()
+        return self.engine
+
+    def applySettings(self, settings: tuple):
+        gender, rate, pitch, volume = settings
+        engine = self._getEngine()
+        if self.voices is None:
+            self.voices = engine.getProperty('voices')
+        # If the gender is 'male', use 0, else use 1
+        voice = 0 if gender == "male" else 1
+        if len(self.voices) > voice:
+            engine.setProperty('voice', self.voices[voice].id)
+        elif self.voices:
+            engine.setProperty('voice', self.voices[0].id)  # fallback if only 1 voice
+        engine.setProperty('rate', rate)
+        engine.setProperty('pitch', pitch)  # Not supported in pyttsx3, but is supported in pyttsx4
+        engine.setProperty('volume', volume)
+
+    def speak(self, text: str):
+        engine = self._getEngine()
+        engine.say(text)
+        engine.runAndWait()
+
+    def render(self, text: str, path: str):
+        engine = self._getEngine()
+        engine.save_to_file(text, path)
+        engine.runAndWait()
+
+    def stop(self):
+        if self.engine is not None:
+            self.engine.stop()
+
+
+class NullBackend(TTSBackend):
+    """
+    Produces no audio. Optionally sleeps for the time the text would take to say,
+    so it can stand in for a real engine in benchmarks and headless runs.
+    """
+    name = "null"
+
+    def __init__(self, secondsPerChar: float = 0.0):
+        self.secondsPerChar = secondsPerChar
+        self.spoken         = []
+        self.interrupted    = threading.Event()
+
+    def speak(self, text: str):
+        self.interrupted.clear()
+        self.spoken.append(text)
+        if self.secondsPerChar:
+            self.interrupted.wait(len(text) * self.secondsPerChar)
+
+    def stop(self):
+        self.interrupted.set()
+
+
+class FileBackend(TTSBackend):
+    """
+    Writes each utterance to a WAV file (silence sized to the text) instead of playing it.
+    """
+    name = "file"
+
+    def __init__(self, directory: str, sampleRate: int = 16000, secondsPerChar: float = 0.06):
+        self.directory      = directory
+        self.sampleRate     = sampleRate
+        self.secondsPerChar = secondsPerChar
+        self.files          = []
+        os.makedirs(directory, exist_ok=True)
+
+    def speak(self, text: str):
+        name = hashlib.sha1(text.encode("utf-8")).hexdigest()[:16] + ".wav"
+        path = os.path.join(self.directory, name)
+        self.render(text, path)
+        self.files.append(path)
+
+    def render(self, text: str, path: str):
+        frames = int(len(text) * self.secondsPerChar * self.sampleRate)
+        with wave.open(path, "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(self.sampleRate)
+            out.writeframes(b"\x00\x00" * frames)
+
+
+class PyAudioPlayer:
+    """
+    Plays PCM through the default output device in 50 ms chunks, so stop() cuts it off within a chunk.
+    """
+
+    def __init__(self):
+        self.audio   = None
+        self.stopped = threading.Event()
+
+    def play(self, params: tuple, frames: bytes):
+        import pyaudio
+        channels, width, rate = params
+        if self.audio is None:
+            self.audio = pyaudio.PyAudio()
+        self.stopped.clear()
+        stream = self.audio.open(format=self.audio.get_format_from_width(width), channels=channels, rate=rate, output=True)
+        try:
+            chunk = rate // 20 * channels * width
+            for start in range(0, len(frames), chunk):
+                if self.stopped.is_set():
+                    break
+                stream.write(frames[start:start + chunk])
+        finally:
+            stream.stop_stream()
+            stream.close()
+
+    def stop(self):
+        self.stopped.set()
+
+
+class NullPlayer:
+    """
+    Plays nothing. With realtime set it waits for the clip's duration, like a speaker would.
+    """
+
+    def __init__(self, realtime: bool = False):
+        self.realtime = realtime
+        self.played   = []
+        self.stopped  = threading.Event()
+
+    def play(self, params: tuple, frames: bytes):
+        channels, width, rate = params
+        self.stopped.clear()
+        self.played.append(len(frames))
+        if self.realtime:
+            self.stopped.wait(len(frames) / (channels * width * rate))
+
+    def stop(self):
+        self.stopped.set()
+
+
+class RenderProcess(TTSBackend):
+    """
+    Renders with its own instance of an engine, in a child process (python -m Echo.TTSManager <engine>)
+    started on first use. An engine can't be interrupted in the middle of a rendering, and pyttsx4
+    keeps one engine per process, so this is what lets cache renderings run without holding up speech.
+    The child exits when this process does (its stdin closes).
+    """
+
+    def __init__(self, engine: str):
+        self.name     = engine
+        self.settings = None
+        self.process  = None
+        self._lock    = threading.Lock()
+
+    def applySettings(self, settings: tuple):
+        self.settings = settings
+
+    def render(self, text: str, path: str):
+        with self._lock:
+            if self.process is None or self.process.poll() is not None:
+                self.process = subprocess.Popen(
+                    [sys.executable, "-m", "Echo.TTSManager", self.name], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                    text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+                )
+            self.process.stdin.write(json.dumps({"settings": self.settings, "text": text, "path": path}) + "\n")
+            self.process.stdin.flush()
+            reply = self.process.stdout.readline().strip()
+        if reply != "ok":
+            raise RuntimeError(f"Rendering with {self.name} failed: {reply or 'the render process exited'}")
+
+
+class CachedBackend(TTSBackend):
+    """
+    Plays utterances from an AudioCache of renderings by the wrapped engine.
+    - Exact hit: the cached WAV plays at once, with no synthesis.
+    - Text matching a registered template (registerTemplate): built from separately cached fragments,
+      so "Current temperature: 18.4 C / 65.1 F" reuses "Current temperature:" and "C /" from earlier turns.
+    - Anything else is spoken by the engine directly. Once the same text has been seen minRepeats
+      times, or a template's fragments are missing, the renderings are queued.
+    Queued renderings are made by renderer (e.g. a RenderProcess) on a background thread, next to
+    speech; without a renderer they wait for renderPending() to be called.
+    Rendering to a file and then playing it is slower than speaking, so no reply waits for a rendering,
+    and replies that merely contain a number keep the engine's prosody.
+    Text longer than maxChars (free-form answers, unlikely to repeat) is always spoken directly.
+    If the player can't be used, everything falls back to the engine.
+    """
+    name = "cached"
+
+    def __init__(self, backend: TTSBackend, cache: AudioCache, player=None, maxChars: int = 120,
+                 minRepeats: int = 2, maxSeen: int = 1000, renderer: TTSBackend = None):
+        self.backend    = backend
+        self.cache      = cache
+        self.player     = player or PyAudioPlayer()
+        self.maxChars   = maxChars
+        self.minRepeats = minRepeats
+        self.maxSeen    = maxSeen
+        self.renderer   = renderer
+        self.seen       = OrderedDict()  # text -> times spoken, most recent last
+        self.pending    = OrderedDict()  # texts waiting to be rendered, oldest first
+        self.templates  = []
+        self.voice      = (backend.name, None)
+        self.stats      = {"exact": 0, "joined": 0, "rendered": 0, "direct": 0}
+        self.wake       = threading.Event()
+        self.thread     = None
+        self._lock      = threading.Lock()
+
+    def registerTemplate(self, pattern: str):
+        """
+        Build replies that fully match pattern (a regex, e.g. r"Current wind speed: ([\d.]+) m/s")
+        from cached fragments. The pattern's groups are the parts that change; without groups every
+        number, time and date is one.
+        """
+        self.templates.append(re.compile(pattern))
+
+    def applySettings(self, settings: tuple):
+        self.backend.applySettings(settings)
+        if self.renderer is not None:
+            self.renderer.applySettings(settings)
+        self.voice = (self.backend.name, settings)
+
+    def speak(self, text: str):
+        if self.player is None or len(text) > self.maxChars:
+            self.stats["direct"] += 1
+            return self.backend.speak(text)
+        try:
+            clip = self.clip(text)
+            if clip is not None:
+                return self.player.play(*clip)
+        except (ImportError, OSError):
+            logger.warning("Can't play cached speech, using the engine directly", exc_info=True)
+            self.player = None
+        self.stats["direct"] += 1
+        self.backend.speak(text)
+        if self.player is not None and self._seen(text) >= self.minRepeats:
+            self._queue([text])
+
+    def clip(self, text: str) -> tuple:
+        """
+        The (params, frames) to play for text, or None when it should be spoken directly.
+        """
+        path = self.cache.get(text, self.voice)
+        if path is not None:
+            self.stats["exact"] += 1
+            return readWav(path)
+        match = next((match for match in (template.fullmatch(text) for template in self.templates) if match), None)
+        if match is not None:
+            fragments = templateFragments(text, match)
+            if len(fragments) > 1:
+                paths = [self.cache.get(fragment, self.voice) for fragment in fragments]
+                if None in paths:
+                    self._queue([fragment for fragment, path in zip(fragments, paths) if path is None])
+                    return None
+                joined = joinFragments([readWav(path) for path in paths])
+                if joined is not None:
+                    self.stats["joined"] += 1
+                    return joined
+        return None
+
+    def renderPending(self, limit: int = 1) -> int:
+        """
+        Render up to limit queued texts into the cache. Returns how many were rendered.
+        """
+        rendered = 0
+        while rendered < limit:
+            with self._lock:
+                if not self.pending:
+                    break
+                text, _ = self.pending.popitem(last=False)
+            self.prerender(text, self.renderer)
+            self.stats["rendered"] += 1
+            rendered += 1
+        return rendered
+
+    def _queue(self, texts: list):
+        with self._lock:
+            for text in texts:
+                self.pending[text] = None
+            while len(self.pending) > self.maxSeen:
+                self.pending.popitem(last=False)
+        if self.renderer is None:
+            return
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._renderLoop, name="TTSRenderer", daemon=True)
+            self.thread.start()
+        self.wake.set()
+
+    def _renderLoop(self):
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            try:
+                while self.renderPending(1):
+                    pass
+            except Exception:
+                logger.error("Error rendering speech into the cache:", exc_info=True)
+
+    def _seen(self, text: str) -> int:
+        count = self.seen.pop(text, 0) + 1
+        self.seen[text] = count
+        if len(self.seen) > self.maxSeen:
+            self.seen.popitem(last=False)
+        return count
+
+    def prerender(self, text: str, engine: TTSBackend = None) -> str:
+        """
+        Make sure text is in the cache and return its path. Rendered by engine, the wrapped one by default.
+        """
+        engine = engine or self.backend
+        path   = self.cache.get(text, self.voice)
+        if path is None:
+            path = self.cache.put(text, self.voice, lambda target: engine.render(text, target))
+        return path
+
+    def stop(self):
+        if self.player is not None:
+            self.player.stop()
+        self.backend.stop()
+
+
+BACKENDS = {
+    "pyttsx4": Pyttsx4Backend,
+    "null": NullBackend,
+    "file": lambda: FileBackend(Config.TTS_OUTPUT_DIR),
+}
+
+
+def getBackend(name: str) -> TTSBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unsupported TTS backend: {name}")
+    return BACKENDS[name]()
+
+
+def defaultBackend() -> TTSBackend:
+    """
+    Config.TTS_BACKEND, behind the audio cache when TTS_CACHE is on and the engine can render to files.
+    """
+    backend = getBackend(Config.TTS_BACKEND)
+    if Config.TTS_CACHE and backend.cacheable:
+        cache   = AudioCache(Config.TTS_CACHE_DIR, Config.TTS_CACHE_MB * 1024 * 1024)
+        backend = CachedBackend(backend, cache, maxChars=Config.TTS_CACHE_MAX_CHARS, minRepeats=Config.TTS_CACHE_MIN_REPEATS,
+                                renderer=RenderProcess(Config.TTS_BACKEND))
+    return backend
+
+
+class TTSManager:
+    """
+    Owns the speech engine. Utterances are queued to one worker thread, which applies
+    the voice settings only when they differ from the ones already applied.
+    - backend:  a TTSBackend (defaults to Config.TTS_BACKEND, cached when TTS_CACHE is on)
+    - settings: callable returning the current voice settings
+    """
+
+    def __init__(self, backend: TTSBackend = None, settings=currentSettings):
+        self.backend  = backend or defaultBackend()
+        self.settings = settings
+        self.applied  = None
+        self.stats    = {"utterances": 0, "settingsApplied": 0, "applyMs": 0.0, "speakMs": 0.0}
+        self.queue    = queue.Queue()
+        self.worker   = None
+        self.lock     = threading.Lock()
+
+    def say(self, text: str, block: bool = True) -> threading.Event:
+        """
+        Queue text to be spoken. Blocks until it has been spoken (or stopped) unless block is False.
+        Returns an event that is set once the text is done.
+        """
+        done = threading.Event()
+        self._ensureWorker()
+        self.queue.put((text, done, True))
+        if block:
+            done.wait()
+        return done
+
+    def prerender(self, texts) -> threading.Event:
+        """
+        Render fixed phrases into the audio cache in the background (no-op without one).
+        Returns an event that is set once all of them are cached.
+        """
+        done = threading.Event()
+        if not hasattr(self.backend, "prerender"):
+            done.set()
+            return done
+        self._ensureWorker()
+        texts = list(texts)
+        for index, text in enumerate(texts):
+            self.queue.put((text, done if index == len(texts) - 1 else threading.Event(), False))
+        if not texts:
+            done.set()
+        return done
+
+    def registerTemplate(self, pattern: str):
+        """
+        Let the audio cache build replies matching pattern from cached fragments (no-op without one).
+        """
+        if hasattr(self.backend, "registerTemplate"):
+            self.backend.registerTemplate(pattern)
+
+    def stop(self):
+        """
+        Drop everything still queued and interrupt the utterance being spoken.
+        """
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.queue.put(None)  # Keep a pending shutdown
+                break
+            item[1].set()
+        try:
+            self.backend.stop()
+        except Exception:
+            logger.error("Error stopping TTS backend:", exc_info=True)
+
+    def shutdown(self):
+        if self.worker is not None:
+            self.queue.put(None)
+            self.worker.join()
+            self.worker = None
+
+    def _ensureWorker(self):
+        if self.worker is None:
+            with self.lock:
+                if self.worker is None:
+                    self.worker = threading.Thread(target=self._run, name="TTSWorker", daemon=True)
+                    self.worker.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            text, done, play = item
+            try:
+                self._applySettings()
+                if not play:
+                    self.backend.prerender(text)
+                    continue
+                start = time.perf_counter()
+                self.backend.speak(text)
+                self.stats["speakMs"] += (time.perf_counter() - start) * 1000
+                self.stats["utterances"] += 1
+            except Exception:
+                logger.error(f"Error speaking '{text}':", exc_info=True)
+            finally:
+                done.set()
+
+    def _applySettings(self):
+        settings = self.settings()
+        if settings == self.applied:
+            return
+        start = time.perf_counter()
+        self.backend.applySettings(settings)
+        self.applied = settings
+        self.stats["settingsApplied"] += 1
+        self.stats["applyMs"] += (time.perf_counter() - start) * 1000
+
+
+def serveRenders(engine: str):
+    """
+    The RenderProcess side: render each JSON request read from stdin and answer "ok" or the error.
+    """
+    replies, sys.stdout = sys.stdout, sys.stderr  # keep engine output off the reply channel
+    backend, applied    = getBackend(engine), None
+    for line in sys.stdin:
+        try:
+            request  = json.loads(line)
+            settings = tuple(request["settings"]) if request["settings"] is not None else None
+            if settings is not None and settings != applied:
+                backend.applySettings(settings)
+                applied = settings
+            backend.render(request["text"], request["path"])
+            replies.write("ok\n")
+        except Exception as e:
+            replies.write(f"{type(e).__name__}: {e}".replace("\n", " ") + "\n")
+        replies.flush()
+
+
+if __name__ == "__main__":
+    serveRenders(sys.argv[1])
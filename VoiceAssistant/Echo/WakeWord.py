@@ -0,0 +1,198 @@
+import os
+import glob
+import time
+import wave
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FRAME_MS    = 25
+HOP_MS      = 10
+BANDS       = 24
+
+
+def readWav(path: str):
+    """
+    Read a PCM WAV file as mono float32 samples in [-1, 1]. Returns (samples, sampleRate).
+    """
+    with wave.open(path, "rb") as wav:
+        channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported sample width in {path}: {width} bytes")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, rate
+
+
+def toSamples(audio, sampleRate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Normalise input to float32 mono at SAMPLE_RATE. Accepts 16-bit PCM bytes or a float array.
+    """
+    if isinstance(audio, (bytes, bytearray)):
+        samples = np.frombuffer(audio, dtype="<i2").astype(np.float32) / 32768
+    else:
+        samples = np.asarray(audio, dtype=np.float32)
+    if sampleRate != SAMPLE_RATE and len(samples):
+        count   = int(len(samples) * SAMPLE_RATE / sampleRate)
+        samples = np.interp(np.linspace(0, len(samples) - 1, count), np.arange(len(samples)), samples).astype(np.float32)
+    return samples
+
+
+def frames(samples: np.ndarray) -> np.ndarray:
+    size, hop = SAMPLE_RATE * FRAME_MS // 1000, SAMPLE_RATE * HOP_MS // 1000
+    if len(samples) < size:
+        samples = np.pad(samples, (0, size - len(samples)))
+    count = 1 + (len(samples) - size) // hop
+    index = np.arange(size)[None, :] + hop * np.arange(count)[:, None]
+    return samples[index]
+
+
+def frameEnergy(samples: np.ndarray) -> np.ndarray:
+    """
+    RMS of each 25 ms frame (10 ms hop), in 16-bit PCM units.
+    """
+    return np.sqrt(np.mean(frames(samples) ** 2, axis=1)) * 32768
+
+
+def _bandMatrix(size: int) -> np.ndarray:
+    # Triangular filters evenly spaced on the mel scale between 100 Hz and 7.6 kHz
+    mel   = lambda hz: 2595 * np.log10(1 + hz / 700)
+    edges = 700 * (10 ** (np.linspace(mel(100), mel(7600), BANDS + 2) / 2595) - 1)
+    freqs = np.fft.rfftfreq(size, 1 / SAMPLE_RATE)
+    bank  = np.zeros((BANDS, len(freqs)), dtype=np.float32)
+    for band in range(BANDS):
+        low, mid, high = edges[band:band + 3]
+        bank[band] = np.clip(np.minimum((freqs - low) / (mid - low), (high - freqs) / (high - mid)), 0, None)
+    return bank
+
+_BANK = _bandMatrix(SAMPLE_RATE * FRAME_MS // 1000)
+_WINDOW = np.hamming(SAMPLE_RATE * FRAME_MS // 1000).astype(np.float32)
+
+
+def bandFeatures(samples: np.ndarray) -> np.ndarray:
+    """
+    Log mel band energies per frame with the utterance mean removed, each frame unit length.
+    """
+    spectrum = np.abs(np.fft.rfft(frames(samples) * _WINDOW, axis=1)) ** 2
+    features = np.log(spectrum @ _BANK.T + 1e-8)
+    features -= features.mean(axis=0)
+    return features / (np.linalg.norm(features, axis=1, keepdims=True) + 1e-8)
+
+
+def subsequenceDTW(template: np.ndarray, query: np.ndarray, maxStart: int = None) -> float:
+    """
+    Lowest average cosine distance of the template aligned against a stretch of the query
+    that starts within its first maxStart frames (anywhere when None).
+    Steps are slope-constrained to between half and double speed, which lets each template
+    row be computed from the two before it in one vectorised pass.
+    """
+    rows, cols = len(template), len(query)
+    if cols < rows // 2 + 1:
+        return float("inf")
+    cost = 1 - template @ query.T
+    inf  = np.full(cols + 2, np.inf)
+    prev2, prev = inf.copy(), inf.copy()
+    starts = cols if maxStart is None else min(maxStart, cols)
+    prev[2:2 + starts] = cost[0, :starts]  # Free start
+    for row in range(1, rows):
+        current = inf.copy()
+        current[2:] = cost[row] + np.minimum(np.minimum(prev[1:-1], prev[:-2]), prev2[1:-1])
+        prev2, prev = prev, current
+    return float(prev[2:].min() / rows)
+
+
+class WakeWordDetector:
+    """
+    Offline keyword spotter that runs before speech recognition.
+    An energy gate drops near-silent captures, then the first searchSeconds of speech are
+    compared against recorded templates of the wake word with dynamic time warping.
+    The match has to begin within startMs of the first speech, so a name mentioned
+    later in someone else's sentence does not wake the assistant.
+    With no templates enrolled every capture is accepted.
+    - threshold:  highest average DTW distance that still counts as the wake word
+    - minEnergy:  RMS (16-bit units) a frame needs to count as speech
+    - minSpeechMs: speech needed before matching is attempted
+    """
+
+    def __init__(self, templates=None, threshold: float = 0.1, minEnergy: float = 300, minSpeechMs: int = 200, searchSeconds: float = 2.5, startMs: int = 300):
+        self.templates     = []
+        self.threshold     = threshold
+        self.minEnergy     = minEnergy
+        self.minSpeechMs   = minSpeechMs
+        self.searchSeconds = searchSeconds
+        self.startMs       = startMs
+        self.stats         = {"checked": 0, "accepted": 0, "energyRejected": 0, "templateRejected": 0, "cpuMs": 0.0}
+        for samples, sampleRate in templates or []:
+            self.enroll(samples, sampleRate)
+
+    @classmethod
+    def fromDirectory(cls, directory: str, **kwargs):
+        """
+        Build a detector from every .wav recording of the wake word in directory.
+        """
+        paths    = sorted(glob.glob(os.path.join(directory, "*.wav")))
+        detector = cls(**kwargs)
+        for path in paths:
+            detector.enroll(*readWav(path))
+        if not paths:
+            logger.warning(f"No wake word templates found in {directory}; every capture will be accepted.")
+        return detector
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.templates)
+
+    def enroll(self, samples, sampleRate: int = SAMPLE_RATE):
+        speech = self._trim(toSamples(samples, sampleRate))
+        if speech is None:
+            raise ValueError("Wake word template contains no speech")
+        self.templates.append(bandFeatures(speech))
+
+    def score(self, audio, sampleRate: int = SAMPLE_RATE) -> float:
+        """
+        Best DTW distance of the capture against the templates, or inf when it fails the energy gate.
+        """
+        speech = self._trim(toSamples(audio, sampleRate))
+        if speech is None:
+            return float("inf")
+        query = bandFeatures(speech[:int(self.searchSeconds * SAMPLE_RATE)])
+        return min(subsequenceDTW(template, query, self.startMs // HOP_MS + 1) for template in self.templates)
+
+    def detect(self, audio, sampleRate: int = SAMPLE_RATE) -> bool:
+        """
+        True when the capture starts with the wake word (or no templates are enrolled).
+        """
+        if not self.enabled:
+            return True
+        start = time.process_time()
+        score = self.score(audio, sampleRate)
+        self.stats["cpuMs"] += (time.process_time() - start) * 1000
+        self.stats["checked"] += 1
+        if score == float("inf"):
+            self.stats["energyRejected"] += 1
+            return False
+        if score > self.threshold:
+            self.stats["templateRejected"] += 1
+            return False
+        self.stats["accepted"] += 1
+        return True
+
+    def _trim(self, samples: np.ndarray):
+        """
+        Cut leading and trailing silence. Returns None when there is too little speech.
+        """
+        voiced = np.flatnonzero(frameEnergy(samples) >= self.minEnergy)
+        if len(voiced) * HOP_MS < self.minSpeechMs:
+            return None
+        hop = SAMPLE_RATE * HOP_MS // 1000
+        return samples[voiced[0] * hop:(voiced[-1] + 1) * hop + SAMPLE_RATE * FRAME_MS // 1000]
@@ -1,22 +1,13 @@
 
 import logging
-import subprocess
-import os
 import threading
 import inspect
 
 from SkillLink import ArgumentParser
 
-logger = logging.getLogger(__name__)
+from Utils.AppControl import getAppControl
 
-NAME_REPLACEMENTS = {
-    "vs code":     "code",
-    "vs studio":   "devenv",
-    "vs insiders": "code - insiders",
-    "word":        "winword",
-    "powerpoint":  "powerpnt",
-    "explorer":    "iexplore",
-}
+logger = logging.getLogger(__name__)
 
 
 ## Singleton class for managing application actions
@@ -39,11 +30,13 @@ class Apps:
 
     def _initComponents(self):
         self.argParser = ArgumentParser()
-        self.nameReplacements = NAME_REPLACEMENTS.copy()  # Copy to avoid modifying the original
+        self.appControl = getAppControl()  # Shared executable index and process table
         self.actionMap = {
             "open-app":  self._openApp,
             "close-app": self._closeApp
         }
+        # Read once here rather than with inspect on every call
+        self.paramCounts = {key: len(inspect.signature(func).parameters) for key, func in self.actionMap.items()}
 
     def _metaData(self):
         return {
@@ -58,39 +51,26 @@ class Apps:
             if actionKey is None:
                 return f"Invalid {self.__class__.__name__.lower()}Action provided: {action}"
 
-            paramCount = len(inspect.signature(actionKey).parameters)
+            paramCount = self.paramCounts[action.lower()]
             return actionKey(*args[:paramCount]) if paramCount > 0 else actionKey()
         except Exception as e:
             logger.error(f"Error executing {self.__class__.__name__.lower()}Action '{action}':", exc_info=True)
 
     def _normalizeAppName(self, appName: str) -> str:
-        app = appName.lower()
-        return next(
-            (replacement for key, replacement in self.nameReplacements.items() if key in app),
-            appName
-        )
+        return self.appControl.resolveName(appName)
 
     def _openApp(self, appName: str) -> str:
         app = self._normalizeAppName(appName)
         try:
-            os.startfile(app)
-            return f"Opened {app}"
+            return self.appControl.openApp(app)
         except Exception as e:
             logger.error(f"Error opening {app}:", exc_info=True)
             return f"An error occurred while trying to open {app}: {e}"
 
     def _closeApp(self, appName: str) -> str:
         app = self._normalizeAppName(appName)
-        if not app.lower().endswith('.exe'):
-            app += '.exe'
         try:
-            subprocess.run(
-                ["taskkill", "/f", "/im", app],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True
-            )
-            return f"Closed {app}"
+            return self.appControl.closeApp(app)
         except Exception as e:
             logger.error(f"Error closing {app}:", exc_info=True)
             return f"An error occurred while trying to close {app}: {e}"
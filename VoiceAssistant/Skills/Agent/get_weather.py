@@ -1,10 +1,11 @@
 
 import json
-import requests
 
 from SkillLink import ArgumentParser
+from Utils.WeatherData import WeatherData
 
 argParser = ArgumentParser()
+weatherData = WeatherData()
 
 
 def get_weather(latitude: float, longitude: float) -> str:
@@ -13,10 +14,7 @@ def get_weather(latitude: float, longitude: float) -> str:
     Additional Information: "Provide the temperature in both Celsius and Fahrenheit."
     """
     argParser.printArgs(__name__, locals())
-    response = requests.get(
-        f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true"
-    )
-    data = response.json()
+    data = weatherData.getForecast(latitude, longitude)
     if "current_weather" in data and "temperature" in data["current_weather"]:
         c = data["current_weather"]["temperature"]
         f = c * 9/5 + 32
@@ -32,13 +30,10 @@ def get_humidity(latitude: float, longitude: float) -> str:
     Additional Information: "Returns humidity as a percentage."
     """
     argParser.printArgs(__name__, locals())
-    response = requests.get(
-        f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true&hourly=relative_humidity_2m"
-    )
-    data = response.json()
+    data = weatherData.getForecast(latitude, longitude)
     try:
         # Returns current hour's humidity
-        humidity = data['hourly']['relative_humidity_2m'][0]
+        humidity = weatherData.currentHumidity(data)
         return f"Current humidity: {humidity}%"
     except Exception:
         return f"Could not fetch humidity. Response: {data}"
@@ -50,10 +45,7 @@ def get_wind_speed(latitude: float, longitude: float) -> str:
     Additional Information: "Returns wind speed in meters per second (m/s)."
     """
     argParser.printArgs(__name__, locals())
-    response = requests.get(
-        f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true"
-    )
-    data = response.json()
+    data = weatherData.getForecast(latitude, longitude)
     try:
         wind_speed = data['current_weather']['windspeed']
         return f"Current wind speed: {wind_speed} m/s"
@@ -1,19 +1,10 @@
 import threading
 import logging
-import subprocess
-import os
 from SkillLink import ArgumentParser
 
-logger = logging.getLogger(__name__)
+from Utils.AppControl import getAppControl
 
-APP_NAME_MAP = {
-    "vs code": "code",
-    "vs studio": "devenv",
-    "vs insiders": "code - insiders",
-    "word": "winword",
-    "powerpoint": "powerpnt",
-    "explorer": "iexplore",
-}
+logger = logging.getLogger(__name__)
 
 
 class AppManager:
@@ -35,7 +26,7 @@ class AppManager:
 
     def _initComponents(self):
         self.argParser = ArgumentParser()
-        self.nameMap = APP_NAME_MAP.copy()
+        self.appControl = getAppControl()  # Shared executable index and process table
         self.actionMap = {
             "open": self._openApp,
             "close": self._closeApp,
@@ -64,30 +55,20 @@ class AppManager:
             return f"Error: {e}"
 
     def _normalizeAppName(self, appName: str) -> str:
-        app = appName.lower()
-        return next((replacement for key, replacement in self.nameMap.items() if key in app), appName)
+        return self.appControl.resolveName(appName)
 
     def _openApp(self, appName: str) -> str:
         app = self._normalizeAppName(appName)
         try:
-            os.startfile(app)
-            return f"Opened {app}"
+            return self.appControl.openApp(app)
         except Exception as e:
             logger.error(f"Error opening {app}:", exc_info=True)
             return f"An error occurred while trying to open {app}: {e}"
 
     def _closeApp(self, appName: str) -> str:
         app = self._normalizeAppName(appName)
-        if not app.lower().endswith('.exe'):
-            app += '.exe'
         try:
-            subprocess.run(
-                ["taskkill", "/f", "/im", app],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True
-            )
-            return f"Closed {app}"
+            return self.appControl.closeApp(app)
         except Exception as e:
             logger.error(f"Error closing {app}:", exc_info=True)
             return f"An error occurred while trying to close {app}: {e}"
@@ -0,0 +1,126 @@
+"""
+Parsing the model's action selection (Utils.ActionParser) and binding it to skill signatures.
+
+Run from the VoiceAssistant directory:
+    python -m unittest discover Tests
+"""
+
+import unittest
+
+from Utils.ActionParser import ActionParser, ActionTable, ActionError, parseActions, parseCall
+
+
+def get_weather(latitude: float, longitude: float) -> str:
+    return f"{latitude},{longitude}"
+
+def set_volume(level: int, mute: bool = False) -> str:
+    return f"{level} {mute}"
+
+def getTime():
+    return "12:00"
+
+
+class AppSkill:
+    def __init__(self):
+        self.actionMap = {"open": None, "close": None}
+
+    def appSkill(self, action: str, *args):
+        return [action, *args]
+
+
+class ParseTest(unittest.TestCase):
+    def parse(self, text):
+        actions, diagnostics = parseActions(text)
+        return [str(action) for action in actions], diagnostics
+
+    def testActionList(self):
+        self.assertEqual(self.parse("['getTime()', 'get_weather(47.6, -117.4)']"), (["getTime()", "get_weather(47.6, -117.4)"], []))
+
+    def testBareCallsInFencesAndEmptyOutput(self):
+        self.assertEqual(self.parse("```python\ngetTime()\nget_weather(1, 2)\n```"), (["getTime()", "get_weather(1, 2)"], []))
+        self.assertEqual(self.parse("None"), ([], []))
+        self.assertEqual(self.parse("[]"), ([], []))
+
+    def testUnquotedTextIsAString(self):
+        self.assertEqual(self.parse("['appSkill(open, Visual Studio Code)']"), (["appSkill('open', 'Visual Studio Code')"], []))
+
+    def testBadItemIsSkippedAndReported(self):
+        actions, diagnostics = self.parse("['getTime()', 'get_weather(1, 2', 'set_volume(3)']")
+        self.assertEqual(actions, ["getTime()", "set_volume(3)"])
+        self.assertEqual(len(diagnostics), 1)
+        self.assertIn("expected ')' after the arguments of get_weather", diagnostics[0])
+
+    def testProseAroundTheList(self):
+        actions, diagnostics = self.parse("Sure! ['getTime()'] hope that helps")
+        self.assertEqual(actions, ["getTime()"])
+        self.assertEqual([message.split(": ", 1)[1] for message in diagnostics],
+                         ["ignored text before the action list", "ignored text after the action list"])
+
+    def testNoActionList(self):
+        actions, diagnostics = self.parse("I am not sure what you mean.")
+        self.assertEqual(actions, [])
+        self.assertIn("expected an action list", diagnostics[0])
+
+    def testParseCallRejectsTrailingText(self):
+        self.assertEqual(str(parseCall("set_volume(level=3)")), "set_volume(level=3)")
+        with self.assertRaises(ActionError):
+            parseCall("getTime() now")
+
+
+class BindTest(unittest.TestCase):
+    def setUp(self):
+        self.table = ActionTable({"get_weather": get_weather, "set_volume": set_volume, "getTime": getTime,
+                                  "appSkill": AppSkill().appSkill})
+
+    def bind(self, text):
+        _, args, kwargs = self.table.bind(parseCall(text))
+        return args, kwargs
+
+    def testCoercesToAnnotatedTypes(self):
+        self.assertEqual(self.bind("get_weather('47.6', -117)"), ([47.6, -117.0], {}))
+        self.assertEqual(self.bind("set_volume(4.0, mute='yes')"), ([4], {"mute": True}))
+
+    def testRejectsValuesThatDoNotFit(self):
+        for text, message in (("set_volume(4.5)", "'level' should be int"),
+                              ("set_volume(True)", "'level' should be int"),
+                              ("set_volume(3, mute='maybe')", "'mute' should be bool"),
+                              ("get_weather(north, 2)", "'latitude' should be float")):
+            with self.subTest(text), self.assertRaisesRegex(ActionError, message):
+                self.bind(text)
+
+    def testArgumentCountAndNames(self):
+        for text, message in (("getTime(1)", "takes 0 argument"),
+                              ("get_weather(1)", "missing argument\\(s\\) longitude"),
+                              ("set_volume(3, level=4)", "got 'level' twice"),
+                              ("set_volume(3, loud=True)", "has no argument 'loud'")):
+            with self.subTest(text), self.assertRaisesRegex(ActionError, message):
+                self.bind(text)
+
+    def testUnknownActionSuggestsClosest(self):
+        with self.assertRaisesRegex(ActionError, "did you mean get_weather"):
+            self.bind("get_wether(1, 2)")
+
+    def testDispatcherSubActions(self):
+        self.assertEqual(self.bind("appSkill(open, Notepad)"), (["open", "Notepad"], {}))
+        with self.assertRaisesRegex(ActionError, "has no action 'launch'"):
+            self.bind("appSkill(launch, Notepad)")
+
+
+class ActionParserTest(unittest.TestCase):
+    def setUp(self):
+        self.parser = ActionParser()
+        self.table  = ActionTable({"get_weather": get_weather, "getTime": getTime})
+
+    def testParseDropsActionsThatDoNotBind(self):
+        actions, diagnostics = self.parser.parse("['getTime()', 'get_weather(1)', 'nope()']", self.table)
+        self.assertEqual([str(action) for action in actions], ["getTime()"])
+        self.assertEqual(len(diagnostics), 2)
+        self.assertEqual(self.parser.check("['getTime()']", self.table), [])
+
+    def testExecuteReportsErrorsAsText(self):
+        self.assertEqual(self.parser.execute(self.table, "get_weather('1', 2)"), "1.0,2.0")
+        self.assertTrue(self.parser.execute(self.table, "get_weather(x, 2)").startswith("Error executing action"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Desktop entries, the process table and what AppControl agrees to close (Utils.AppControl).
+
+Run from the VoiceAssistant directory:
+    python -m unittest discover Tests
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+from Utils.AppControl import AppControl, ExecutableIndex, ProcessTable, execArgv, readDesktopFile
+
+LINUX  = sys.platform.startswith("linux")
+SCRIPT = "#!/bin/sh\ntrap 'kill $child; exit 0' TERM\nsleep 30 &\nchild=$!\nwait $child\n"
+
+
+def writeFile(folder, name, content, mode=0o644):
+    path = os.path.join(folder, name)
+    with open(path, "w") as handle:
+        handle.write(content)
+    os.chmod(path, mode)
+    return path
+
+
+class ExecArgvTest(unittest.TestCase):
+    def testDropsFieldCodesAndEnv(self):
+        self.assertEqual(execArgv("env GDK_BACKEND=x11 LANG=C /usr/bin/gimp --new-instance %U"), ["/usr/bin/gimp", "--new-instance"])
+
+    def testQuotingAndEscapedPercent(self):
+        self.assertEqual(execArgv('"/opt/My App/run" --title "100%%" %f'), ["/opt/My App/run", "--title", "100%"])
+
+    def testUnbalancedQuotes(self):
+        self.assertEqual(execArgv('/usr/bin/app "--broken'), [])
+
+
+class ReadDesktopFileTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+
+    def read(self, name, body):
+        return readDesktopFile(writeFile(self.folder, name, "[Desktop Entry]\n" + body))
+
+    def testApplication(self):
+        self.assertEqual(self.read("org.gnome.gedit.desktop", "Type=Application\nName=Text Editor\nExec=gedit %U\n"),
+                         {"name": "Text Editor", "argv": ["gedit"], "process": "gedit"})
+
+    def testWrapperTakesProcessFromWindowClassOrFileName(self):
+        flatpak = "Name=GIMP\nExec=flatpak run org.gimp.GIMP %U\n"
+        self.assertEqual(self.read("org.gimp.GIMP.desktop", flatpak + "StartupWMClass=gimp-2.10\n")["process"], "gimp-2.10")
+        self.assertEqual(self.read("org.gimp.GIMP.desktop", flatpak)["process"], "GIMP")
+
+    def testSkipsHiddenAndNonApplications(self):
+        self.assertIsNone(self.read("a.desktop", "Name=A\nExec=a\nNoDisplay=true\n"))
+        self.assertIsNone(self.read("b.desktop", "Name=B\nExec=b\nHidden=true\n"))
+        self.assertIsNone(self.read("c.desktop", "Type=Link\nName=C\nURL=https://example.com\n"))
+        self.assertIsNone(self.read("d.desktop", "Name=D\n"))
+
+    def testUnreadableFile(self):
+        self.assertIsNone(readDesktopFile(writeFile(self.folder, "e.desktop", "no section header\n")))
+
+
+class FakeProcess:
+    def __init__(self, pid, name, status):
+        self.pid  = pid
+        self.info = {"name": name, "status": status}
+
+
+class FakePsutil:
+    STATUS_ZOMBIE = "zombie"
+
+    def __init__(self, processes):
+        self.processes = processes
+
+    def process_iter(self, attributes):
+        return iter(self.processes)
+
+
+@unittest.skipUnless(LINUX, "needs /proc")
+class ProcessTableTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.table = ProcessTable()
+        self.table.psutil = None  # Scan /proc
+
+    def start(self, name, script=SCRIPT):
+        process = subprocess.Popen([writeFile(self.folder, name, script, 0o755)], stdout=subprocess.DEVNULL)
+        self.addCleanup(process.wait)
+        self.addCleanup(process.kill)
+        return process
+
+    def waitFor(self, names, present, pid):
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline and (pid in self.table.find(names)) != present:
+            time.sleep(0.01)
+        return pid in self.table.find(names)
+
+    def testTruncatedNameIsConfirmedFromCommandLine(self):
+        process = self.start("vaTestLongProcessName")
+        self.assertTrue(self.waitFor({"vatestlongprocessname"}, True, process.pid))
+        # Same first 15 characters, different program
+        self.assertNotIn(process.pid, self.table.find({"vatestlongprocessxyz"}))
+
+    def testZombieIsSkipped(self):
+        process = self.start("vaTestZombie", "#!/bin/sh\nexit 0\n")
+        deadline, state = time.monotonic() + 2, None
+        while time.monotonic() < deadline and state != "Z":
+            time.sleep(0.01)
+            with open(f"/proc/{process.pid}/stat") as handle:
+                state = handle.read().rsplit(")", 1)[1].split()[0]
+        self.assertEqual(state, "Z")  # Exited, not reaped until wait()
+        self.assertNotIn(process.pid, self.table.find({"vatestzombie"}))
+
+    def testPsutilSkipsZombies(self):
+        self.table.psutil = FakePsutil([FakeProcess(10, "Gedit", "running"),
+                                        FakeProcess(11, "gedit", "zombie"), FakeProcess(12, None, "running")])
+        self.assertEqual(self.table.find({"gedit"}), [10])
+
+
+class RecordingTable(ProcessTable):
+    def __init__(self, pids=()):
+        super().__init__()
+        self.pids    = list(pids)
+        self.lookups = []
+        self.sent    = []
+
+    def find(self, names):
+        self.lookups.append(names)
+        return self.pids
+
+    def signal(self, pids, sig=None):
+        self.sent.extend(pids)
+        return len(pids)
+
+
+@unittest.skipIf(sys.platform == "win32", "POSIX launchers")
+class CloseAppTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        binDir, desktopDir = os.path.join(self.folder, "bin"), os.path.join(self.folder, "applications")
+        os.makedirs(binDir)
+        os.makedirs(desktopDir)
+        for name in ("bash", "vatool"):
+            writeFile(binDir, name, SCRIPT, 0o755)
+        writeFile(desktopDir, "org.example.Editor.desktop", "[Desktop Entry]\nName=Editor\nExec=vaeditor %U\n")
+        self.index = ExecutableIndex(paths=[binDir], desktops=[desktopDir], appDirs=[])
+        self.table = RecordingTable([4242])
+        self.apps  = AppControl(self.index, self.table)
+
+    def testUnknownNameIsRefused(self):
+        self.assertEqual(self.apps.closeApp("python"), "Could not find an application called python")
+        self.assertEqual(self.table.lookups, [])
+
+    def testWrapperIsRefused(self):
+        self.assertTrue(self.apps.closeApp("bash").startswith("Won't close"))
+        self.assertEqual(self.table.lookups, [])
+
+    def testDesktopEntryClosesItsProcess(self):
+        self.assertEqual(self.apps.closeApp("editor"), "Closed Editor")
+        self.assertEqual(self.table.lookups, [{"vaeditor"}])
+        self.assertEqual(self.table.sent, [4242])
+
+    def testPathExecutableOnlyWhenOpenedHere(self):
+        self.assertEqual(self.apps.closeApp("vatool"), "vatool was not opened by me, so I won't close it")
+        self.assertEqual(self.apps.openApp("vatool"), "Opened vatool")
+        started = self.apps.launched[-1]
+        self.addCleanup(started.wait)
+        self.addCleanup(started.kill)
+        self.assertEqual(self.apps.closeApp("vatool"), "Closed vatool")
+        self.assertEqual(self.table.sent, [started.pid])
+        self.assertEqual(self.table.lookups, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
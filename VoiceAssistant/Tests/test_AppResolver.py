@@ -0,0 +1,98 @@
+"""
+Spoken app-name resolution (Utils.AppResolver): ranking, the match threshold and bare PATH executables.
+
+Run from the VoiceAssistant directory:
+    python -m unittest discover Tests
+"""
+
+import unittest
+
+from Utils.AppControl import AppControl
+from Utils.AppResolver import AppResolver, editDistance
+
+APPS = {
+    "firefox":       {"name": "Firefox Web Browser", "kind": "desktop"},
+    "google-chrome": {"name": "Google Chrome", "kind": "desktop"},
+    "code":          {"name": "Visual Studio Code", "kind": "desktop"},
+    "notepad":       {"name": "Notepad", "kind": "apps"},
+    "chroot":        {"name": "chroot", "kind": "path"},
+    "file":          {"name": "file", "kind": "path"},
+    "fire":          {"name": "fire", "kind": "path"},
+    "python3":       {"name": "python3", "kind": "path"},
+}
+
+
+class FakeIndex:
+    def __init__(self, apps):
+        self.apps = apps
+
+    def current(self):
+        return self.apps
+
+    def lookup(self, name):
+        return self.apps.get(name.lower())
+
+
+class AppResolverTest(unittest.TestCase):
+    def setUp(self):
+        self.resolver = AppResolver(FakeIndex(APPS), aliases={"vs code": "code"})
+
+    def best(self, spoken, **threshold):
+        return self.resolver.best(spoken, **threshold)
+
+    def testExactNameRanksFirst(self):
+        ranked = self.resolver.resolve("firefox")
+        self.assertEqual(ranked[0][:2], ("firefox", 1.0))
+        self.assertEqual([score for _, score, _ in ranked], sorted((score for _, score, _ in ranked), reverse=True))
+
+    def testAliasFillerAndWordRuns(self):
+        self.assertEqual(self.best("vs code please"), "code")
+        self.assertEqual(self.best("open the visual studio code app"), "code")
+
+    def testMisheardNames(self):
+        self.assertEqual(self.best("fire fox"), "firefox")
+        self.assertEqual(self.best("note pad"), "notepad")
+        self.assertEqual(self.best("google chrom"), "google-chrome")
+
+    def testThreshold(self):
+        _, score, _ = self.resolver.resolve("firefax", 1)[0]
+        self.assertEqual(self.best("firefax", threshold=score), "firefox")
+        self.assertIsNone(self.best("firefax", threshold=score + 0.01))
+
+    def testPathExecutablesMatchOnlyInFull(self):
+        self.assertEqual(self.best("chroot"), "chroot")
+        self.assertEqual(self.best("python3"), "python3")
+        for spoken in ("chrome", "files", "python", "fire tv", "chrot"):
+            with self.subTest(spoken):
+                targets = [target for target, _, _ in self.resolver.resolve(spoken)]
+                self.assertFalse({"chroot", "file", "fire", "python3"} & set(targets), targets)
+
+    def testEntriesWithoutKindAreApps(self):
+        resolver = AppResolver(FakeIndex({"thunderbird": {"name": "Thunderbird Mail"}}), aliases={})
+        self.assertEqual(resolver.best("thunder bird"), "thunderbird")
+
+    def testEditDistance(self):
+        self.assertEqual(editDistance("python", "pyhton"), 1)
+        self.assertEqual(editDistance("", "abc"), 3)
+        self.assertEqual(editDistance("kitten", "sitting"), 3)
+
+
+class ResolveNameTest(unittest.TestCase):
+    def setUp(self):
+        self.apps = AppControl(FakeIndex(APPS))
+        self.apps.resolver.aliases = {}
+
+    def testUnmatchedNamePassesThroughUnchanged(self):
+        # Nothing indexed comes close, so the skills get the name as spoken
+        self.assertEqual(self.apps.resolveName("photoshop"), "photoshop")
+        self.assertEqual(self.apps.resolveName("  Garage Band "), "Garage Band")
+
+    def testNameCloseOnlyToATool(self):
+        self.assertEqual(self.apps.resolveName("chrot"), "chrot")
+
+    def testMatchedName(self):
+        self.assertEqual(self.apps.resolveName("fire fox please"), "firefox")
+
+
+if __name__ == "__main__":
+    unittest.main()
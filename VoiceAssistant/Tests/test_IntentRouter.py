@@ -0,0 +1,91 @@
+"""
+Fast-path routing over a real PhraseIndex, with user skills shaped like Skills/User.
+
+Run from the VoiceAssistant directory:
+    python -m unittest discover Tests
+"""
+
+import unittest
+
+from Utils.IntentRouter import IntentRouter
+from Utils.PhraseIndex import PhraseIndex
+
+
+class DateTimeSkill:
+    def __init__(self):
+        self.actionMap = {"what is the date": self._getCurrentDate, "what is the time": self._getCurrentTime}
+
+    def _getCurrentDate(self, *args):
+        return "18-October-2026"
+
+    def _getCurrentTime(self, *args):
+        return "12:00"
+
+
+class AppsSkill:
+    def __init__(self):
+        self.actionMap = {"open": self._openApp, "close": self._closeApp}
+
+    def _openApp(self, appName: str) -> str:
+        return f"Opened {appName}"
+
+    def _closeApp(self, appName: str) -> str:
+        return f"Closed {appName}"
+
+
+class Graph:
+    def __init__(self):
+        self.phraseIndex = PhraseIndex.fromSkills([DateTimeSkill(), AppsSkill()])
+
+    def matchUserAction(self, content):
+        return self.phraseIndex.match(content)
+
+    def runUserAction(self, match, content):
+        skill, phrase, _ = match
+        return skill.actionMap[phrase](self.phraseIndex.remainder(content, phrase))
+
+
+class FastPathRoutingTest(unittest.TestCase):
+    def setUp(self):
+        graph       = Graph()
+        self.router = IntentRouter(lambda: graph, lambda ctx, verbose: "llm", threshold=0.6)
+
+    def route(self, text):
+        return self.router.route(text), self.router.lastPath
+
+    def testExactCommandTakesFastPath(self):
+        self.assertEqual(self.route("what is the time"), ("12:00", "skill"))
+
+    def testFillerDoesNotLowerConfidence(self):
+        self.assertEqual(self.route("what is the time now please"), ("12:00", "skill"))
+
+    def testArgumentTheActionIgnoresGoesToModel(self):
+        # Answering with the local time would be wrong
+        self.assertEqual(self.route("what is the time in tokyo"), ("llm", "llm"))
+
+    def testMultiWordArgumentTakesFastPath(self):
+        self.assertEqual(self.route("open visual studio code"), ("Opened visual studio code", "skill"))
+
+    def testCommandWithoutArgumentGoesToModel(self):
+        self.assertEqual(self.route("open"), ("llm", "llm"))
+
+    def testLongRequestContainingPhraseGoesToModel(self):
+        self.assertEqual(self.route("open the news and read me every headline about the election"), ("llm", "llm"))
+
+    def testPhraseInsideAWordDoesNotMatch(self):
+        self.assertEqual(self.route("reopening hours of the library"), ("llm", "llm"))
+
+
+class ConfidenceTest(unittest.TestCase):
+    def testActionWithoutArgument(self):
+        self.assertEqual(PhraseIndex.confidence(0, False), 1.0)
+        self.assertEqual(PhraseIndex.confidence(2, False), 0.0)
+
+    def testActionWithArgument(self):
+        self.assertEqual(PhraseIndex.confidence(0, True), 0.5)
+        self.assertEqual(PhraseIndex.confidence(3, True), 1.0)
+        self.assertLess(PhraseIndex.confidence(6, True), 0.6)
+
+
+if __name__ == "__main__":
+    unittest.main()
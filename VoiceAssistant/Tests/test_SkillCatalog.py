@@ -0,0 +1,135 @@
+"""
+Per-file skill loading (Utils.SkillCatalog) against SkillLink's directory loader.
+
+Run from the VoiceAssistant directory:
+    python -m unittest discover Tests
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+
+from Utils.SkillCatalog import SkillCatalog, loadSkillFile
+
+try:
+    from SkillLink.SLLoader.Loader import Loader
+except Exception:  # SkillLink needs Python 3.12+
+    Loader = None
+
+CLASS_SKILL = '''
+class Apps:
+    def __init__(self):
+        self.actionMap = {"open": self.open}
+
+    def open(self, app):
+        return f"Opened {app}"
+'''
+FUNCTION_SKILL = '''
+import os
+from os.path import join
+
+def get_time():
+    return "12:00"
+
+def _helper():
+    return None
+'''
+MAP_SKILL = '''
+actionMap = {"ping": lambda text: "pong"}
+'''
+IMPORTS_ONLY = '''
+import os
+from os.path import join
+'''
+
+
+def describe(components) -> list:
+    # Loaders name modules differently, so compare what each component is
+    return sorted(
+        f"module {sorted(name for name in vars(component) if not name.startswith('_'))}"
+        if type(component).__name__ == "module" else f"instance {type(component).__name__}"
+        for component in components
+    )
+
+
+class SkillCatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.write("apps.py", CLASS_SKILL)
+        self.write("clock.py", FUNCTION_SKILL)
+        self.write("ping.py", MAP_SKILL)
+        self.write("plain.py", IMPORTS_ONLY)
+        self.write("__init__.py", "")
+
+    def write(self, name, content, folder=None):
+        path = os.path.join(folder or self.folder, name)
+        with open(path, "w") as handle:
+            handle.write(content)
+        # Move the mtime on filesystems with coarse timestamps
+        stamp = time.time() + len(content) % 7
+        os.utime(path, (stamp, stamp))
+        return path
+
+    def catalog(self, group="User", folder=None):
+        catalog = SkillCatalog(folder or self.folder, group)
+        self.addCleanup(lambda: [sys.modules.pop(catalog._moduleName(name), None) for name in list(catalog.entries)])
+        return catalog
+
+    def testComponentsPerFile(self):
+        catalog = self.catalog()
+        self.assertEqual(sorted(catalog.refresh()["added"]), ["apps.py", "clock.py", "ping.py", "plain.py"])
+        self.assertEqual(describe(catalog.components()), ["instance Apps", "module ['actionMap']", "module ['get_time', 'join', 'os']"])
+
+    @unittest.skipIf(Loader is None, "SkillLink is not importable here")
+    def testSameComponentsAsSkillLink(self):
+        upstream = []
+        Loader()._loadSkillsFromDirectory(self.folder, upstream)
+        catalog = self.catalog()
+        catalog.refresh()
+        self.assertEqual(describe(catalog.components()), describe(upstream))
+
+    def testGroupsDoNotShareModules(self):
+        # SkillLink registers both files as _dynamic_apps; here each group keeps its own module
+        other = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, other)
+        self.write("apps.py", "def close_app(name):\n    return name\n", other)
+        user, agent = self.catalog("User"), self.catalog("Agent", other)
+        user.refresh()
+        agent.refresh()
+        self.assertIsNot(sys.modules[user._moduleName("apps.py")], sys.modules[agent._moduleName("apps.py")])
+        self.assertIn("instance Apps", describe(user.components()))
+
+    def testBrokenEditKeepsLastWorkingVersion(self):
+        catalog = self.catalog()
+        catalog.refresh()
+        before = catalog.entries["apps.py"]["components"]
+        self.write("apps.py", CLASS_SKILL + "\nthis is not python\n")
+        diff = catalog.refresh()
+        self.assertNotIn("apps.py", diff["changed"])
+        self.assertIs(catalog.entries["apps.py"]["components"], before)
+
+    def testUnchangedContentIsNotReloaded(self):
+        catalog = self.catalog()
+        catalog.refresh()
+        self.write("clock.py", FUNCTION_SKILL)
+        self.assertEqual(catalog.refresh(), {"added": [], "changed": [], "removed": []})
+
+    def testRemovedFile(self):
+        catalog = self.catalog()
+        catalog.refresh()
+        os.remove(os.path.join(self.folder, "ping.py"))
+        self.assertEqual(catalog.refresh()["removed"], ["ping.py"])
+
+    def testFailingFileRaises(self):
+        path = self.write("broken.py", "raise RuntimeError('no')\n")
+        with self.assertRaises(RuntimeError):
+            loadSkillFile(path, "_skills_test_broken")
+        self.assertNotIn("_skills_test_broken", sys.modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
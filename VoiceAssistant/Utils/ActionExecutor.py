@@ -0,0 +1,111 @@
+import time
+import asyncio
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+logger = logging.getLogger(__name__)
+
+
+class ActionExecutor:
+    """
+    Run independent actions concurrently.
+    Results come back in the same order as the actions, a failing action only
+    affects its own result and each action gets its own timeout.
+    - maxWorkers: upper bound on actions running at once
+    - timeout:    seconds allowed per action, None to wait indefinitely
+    """
+
+    def __init__(self, maxWorkers: int = 4, timeout: float = None):
+        self.maxWorkers = max(1, maxWorkers)
+        self.timeout    = timeout
+        self._pool      = None
+        self._lock      = threading.Lock()
+
+    def _getPool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.maxWorkers, thread_name_prefix="Action")
+        return self._pool
+
+    def run(self, func, items: list, timeout: float = None) -> list:
+        """
+        Call func(item) for every item on the thread pool and return the results in order.
+        Without a timeout a single item runs inline since there is nothing to overlap it with.
+        """
+        items   = list(items)
+        timeout = self.timeout if timeout is None else timeout
+        if len(items) <= 1 and timeout is None:
+            return [self._call(func, item) for item in items]
+
+        started = {}
+        futures = [self._getPool().submit(self._track, started, index, func, item) for index, item in enumerate(items)]
+        results = []
+        for index, (future, item) in enumerate(zip(futures, items)):
+            results.append(self._collect(future, item, started, index, timeout))
+        return results
+
+    async def runAsync(self, func, items: list, timeout: float = None) -> list:
+        """
+        Asyncio variant of run. Coroutine functions are awaited directly,
+        plain functions are run on the thread pool.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        limit   = asyncio.Semaphore(self.maxWorkers)
+        loop    = asyncio.get_running_loop()
+
+        async def runOne(item):
+            async with limit:
+                try:
+                    if asyncio.iscoroutinefunction(func):
+                        call = func(item)
+                    else:
+                        call = loop.run_in_executor(self._getPool(), func, item)
+                    return await asyncio.wait_for(call, timeout)
+                except asyncio.TimeoutError:
+                    logger.error(f"Action '{item}' timed out after {timeout}s")
+                    return f"Error executing action '{item}', timed out after {timeout}s"
+                except Exception as ex:
+                    logger.error(f"Error executing action '{item}'", exc_info=True)
+                    return f"Error executing action '{item}', {ex}"
+
+        return list(await asyncio.gather(*(runOne(item) for item in items)))
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=True)
+                self._pool = None
+
+    def _call(self, func, item):
+        try:
+            return func(item)
+        except Exception as ex:
+            logger.error(f"Error executing action '{item}'", exc_info=True)
+            return f"Error executing action '{item}', {ex}"
+
+    def _track(self, started: dict, index: int, func, item):
+        started[index] = time.monotonic()
+        return func(item)
+
+    def _collect(self, future, item, started: dict, index: int, timeout: float):
+        try:
+            if timeout is None:
+                return future.result()
+            # The timeout runs from when the action starts, not from when it was queued
+            while True:
+                begin = started.get(index)
+                if begin is None:
+                    try:
+                        return future.result(timeout=0.01)
+                    except FutureTimeout:
+                        continue
+                return future.result(timeout=max(0.0, begin + timeout - time.monotonic()))
+        except FutureTimeout:
+            future.cancel()
+            logger.error(f"Action '{item}' timed out after {timeout}s")
+            return f"Error executing action '{item}', timed out after {timeout}s"
+        except Exception as ex:
+            logger.error(f"Error executing action '{item}'", exc_info=True)
+            return f"Error executing action '{item}', {ex}"
@@ -0,0 +1,463 @@
+import re
+import ast
+import difflib
+import inspect
+import logging
+import typing
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# One pass over the model output; whitespace is skipped, anything unexpected is an 'other' token
+TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<string>'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")
+  | (?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?(?![\w.]))
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<punct>[()\[\],=])
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+FENCE    = re.compile(r"^\s*```[\w-]*\s*|\s*```\s*$")
+LITERALS = {"True": True, "False": False, "None": None, "true": True, "false": False, "null": None}
+EMPTY    = {"", "None", "none", "null", "[]", "No action", "No actions"}
+
+
+class ActionError(ValueError):
+    """
+    A malformed action or one that doesn't fit the skill it names.
+    """
+
+
+class ParsedAction:
+    """
+    One action call from the model output: name(*args, **kwargs). str() gives the canonical form.
+    """
+    __slots__ = ("name", "args", "kwargs", "text")
+
+    def __init__(self, name: str, args: tuple = (), kwargs: dict = None):
+        self.name   = name
+        self.args   = tuple(args)
+        self.kwargs = kwargs or {}
+        values      = [repr(value) for value in self.args] + [f"{key}={value!r}" for key, value in self.kwargs.items()]
+        self.text   = f"{name}({', '.join(values)})"
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"ParsedAction({self.text})"
+
+
+def tokenize(text: str, offset: int = 0) -> list:
+    """
+    Split text into (kind, value, column) tokens, skipping whitespace and ending with an 'end' token.
+    Punctuation tokens use the character itself as their kind.
+    """
+    tokens = []
+    for match in TOKEN.finditer(text):
+        kind = match.lastgroup
+        if kind == "space":
+            continue
+        value = match.group()
+        tokens.append((value if kind == "punct" else kind, value, match.start() + offset))
+    tokens.append(("end", "", len(text) + offset))
+    return tokens
+
+
+def unquote(token: str) -> str:
+    return token[1:-1] if "\\" not in token else ast.literal_eval(token)
+
+
+class _Parser:
+    """
+    Recursive descent over the tokens of one model output:
+        output := 'None' | '[' item (',' item)* ']' | call (','? call)*
+        item   := string holding a call | call
+        call   := name ['(' [arg (',' arg)*] ')']
+        arg    := name '=' value | value
+        value  := string | number | True/False/None | '[' values ']' | bare text up to ',' or ')'
+    Malformed items are skipped with a diagnostic; the rest of the output is still used.
+    """
+
+    def __init__(self, text: str, offset: int = 0):
+        self.text        = text
+        self.offset      = offset
+        self.tokens      = tokenize(text, offset)
+        self.last        = len(self.tokens) - 1
+        self.index       = 0
+        self.diagnostics = []
+
+    def peek(self, ahead: int = 0):
+        return self.tokens[min(self.index + ahead, self.last)]
+
+    def take(self):
+        token = self.tokens[self.index]
+        if self.index < self.last:
+            self.index += 1
+        return token
+
+    def describe(self, token) -> str:
+        return "the end" if token[0] == "end" else repr(token[1])
+
+    def note(self, message: str):
+        self.diagnostics.append(message)
+
+    def skipItem(self):
+        # Recover at the next ',' or ']' outside brackets, so one bad item doesn't lose the others
+        depth = 0
+        while True:
+            kind = self.tokens[self.index][0]
+            if kind == "end" or (depth == 0 and kind in ",]"):
+                return
+            if kind in "([":
+                depth += 1
+            elif kind in ")]":
+                depth -= 1
+            self.take()
+
+    def output(self) -> list:
+        kind, value, column = self.peek()
+        if kind == "end":
+            return []
+        if kind == "[":
+            actions = self.actionList()
+        elif kind == "name" and (self.peek(1)[0] == "(" or self.last == 1):
+            actions = self.calls()
+        else:
+            start = next((index for index, token in enumerate(self.tokens) if token[0] == "["), None)
+            if start is None:
+                self.note(f"col {column}: expected an action list like ['getTime()'], found {value!r}")
+                return []
+            self.note(f"col {column}: ignored text before the action list")
+            self.index = start
+            actions = self.actionList()
+        if self.peek()[0] != "end":
+            self.note(f"col {self.peek()[2]}: ignored text after the action list")
+        return actions
+
+    def actionList(self) -> list:
+        self.take()
+        actions = []
+        while True:
+            kind, value, column = self.tokens[self.index]
+            if kind == "]":
+                self.take()
+                return actions
+            if kind == ",":
+                self.take()
+                continue
+            if kind == "end":
+                self.note(f"col {column}: missing ']' at the end of the action list")
+                return actions
+            try:
+                action = self.item()
+                if action is not None:
+                    actions.append(action)
+            except ActionError as e:
+                self.note(str(e))
+                self.skipItem()
+
+    def calls(self) -> list:
+        actions = []
+        while self.tokens[self.index][0] == "name":
+            try:
+                actions.append(self.call())
+            except ActionError as e:
+                self.note(str(e))
+                self.skipItem()
+            if self.tokens[self.index][0] == ",":
+                self.take()
+        return actions
+
+    def item(self):
+        kind, value, column = self.tokens[self.index]
+        if kind == "string":
+            self.take()
+            content = unquote(value)
+            if content.strip() in EMPTY:
+                return None
+            inner  = _Parser(content, column + 1)
+            action = inner.call()
+            if inner.peek()[0] != "end":
+                raise ActionError(f"col {inner.peek()[2]}: unexpected {inner.peek()[1]!r} after {action.name}(...)")
+            return action
+        if kind == "name":
+            return self.call()
+        raise ActionError(f"col {column}: expected an action, found {self.describe((kind, value))}")
+
+    def call(self) -> ParsedAction:
+        kind, name, column = self.take()
+        if kind != "name":
+            raise ActionError(f"col {column}: expected an action name, found {self.describe((kind, name))}")
+        if self.tokens[self.index][0] != "(":
+            return ParsedAction(name)
+        self.take()
+        args, kwargs = [], {}
+        tokens = self.tokens
+        while tokens[self.index][0] != ")":
+            kind = tokens[self.index][0]
+            if kind == "end":
+                raise ActionError(f"col {tokens[self.index][2]}: missing ')' after the arguments of {name}")
+            if kind == "name" and self.peek(1)[0] == "=":
+                key = self.take()[1]
+                self.take()
+                kwargs[key] = self.value(name)
+            elif kwargs:
+                raise ActionError(f"col {tokens[self.index][2]}: positional argument after keyword arguments in {name}")
+            else:
+                args.append(self.value(name))
+            kind = tokens[self.index][0]
+            if kind == ",":
+                self.take()
+            elif kind != ")":
+                raise ActionError(f"col {tokens[self.index][2]}: expected ')' after the arguments of {name}, found {self.describe(tokens[self.index])}")
+        self.take()
+        return ParsedAction(name, args, kwargs)
+
+    def value(self, name: str):
+        kind, value, column = self.tokens[self.index]
+        if kind == "string":
+            self.take()
+            return unquote(value)
+        if kind == "number":
+            self.take()
+            return float(value) if "." in value or "e" in value or "E" in value else int(value)
+        if kind == "name" and value in LITERALS and self.peek(1)[0] in ",)":
+            self.take()
+            return LITERALS[value]
+        if kind == "[":
+            self.take()
+            values = []
+            while self.tokens[self.index][0] != "]":
+                if self.tokens[self.index][0] == "end":
+                    raise ActionError(f"col {column}: missing ']' in the arguments of {name}")
+                values.append(self.value(name))
+                if self.tokens[self.index][0] == ",":
+                    self.take()
+            self.take()
+            return values
+        if kind in ("end", ",", ")"):
+            raise ActionError(f"col {column}: missing a value in the arguments of {name}")
+        if kind == "other" and value in "'\"":
+            raise ActionError(f"col {column}: unterminated string in the arguments of {name}")
+        # Unquoted text (appSkill(open-app, Notepad)): everything up to the next ',' or ')' as a string
+        start, depth = column - self.offset, 0
+        while True:
+            kind, value, column = self.tokens[self.index]
+            if kind == "end" or (depth == 0 and kind in ",)"):
+                break
+            if kind in "([":
+                depth += 1
+            elif kind in ")]":
+                depth -= 1
+            self.take()
+        return self.text[start:column - self.offset].strip()
+
+
+def parseActions(text: str) -> tuple:
+    """
+    Parse model output into ([ParsedAction], [diagnostic]) in a single pass.
+    Accepts a Python-style list of call strings (['getDate()', 'get_weather(47.6, -117.4)']),
+    bare calls separated by commas or newlines, and output wrapped in code fences or prose.
+    """
+    if text is None:
+        return [], []
+    text = FENCE.sub("", str(text)).strip()
+    if text in EMPTY:
+        return [], []
+    parser  = _Parser(text)
+    actions = parser.output()
+    return actions, parser.diagnostics
+
+
+@lru_cache(maxsize=512)
+def parseCall(text: str) -> ParsedAction:
+    """
+    Parse one action string ("get_weather(47.6588, -117.426)"). Raises ActionError when malformed.
+    Cached, since the executor receives the strings parseActions just produced.
+    """
+    parser = _Parser(text.strip())
+    action = parser.call()
+    if parser.peek()[0] != "end":
+        raise ActionError(f"col {parser.peek()[2]}: unexpected {parser.peek()[1]!r} after {action.name}(...)")
+    return action
+
+
+def _toFloat(value):
+    if isinstance(value, bool):
+        raise ValueError
+    return float(value.strip() if isinstance(value, str) else value)
+
+def _toInt(value):
+    if isinstance(value, bool):
+        raise ValueError
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError
+        return int(value)
+    return int(value.strip() if isinstance(value, str) else value)
+
+def _toBool(value):
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "yes", "1"):
+            return True
+        if lowered in ("false", "no", "0"):
+            return False
+        raise ValueError
+    if value in (0, 1):
+        return bool(value)
+    raise ValueError
+
+def _toStr(value):
+    if isinstance(value, (list, dict)):
+        raise ValueError
+    return value if isinstance(value, str) else str(value)
+
+
+COERCERS = {float: _toFloat, int: _toInt, bool: _toBool, str: _toStr}
+
+
+class ActionSpec:
+    """
+    Signature metadata of one skill function, read once when the table is built:
+    parameter names, which are required, the coercion for each annotated type, and for
+    dispatcher skills (appSkill(action, *args)) the sub-actions of their actionMap.
+    """
+    __slots__ = ("func", "params", "coercers", "required", "varPositional", "varKeyword", "subActions")
+
+    def __init__(self, func):
+        signature = inspect.signature(func)
+        try:
+            hints = typing.get_type_hints(func)
+        except Exception:
+            hints = getattr(func, "__annotations__", {})
+        self.func          = func
+        self.params        = []
+        self.coercers      = {}
+        self.required      = []
+        self.varPositional = False
+        self.varKeyword    = False
+        for param in signature.parameters.values():
+            if param.kind is param.VAR_POSITIONAL:
+                self.varPositional = True
+                continue
+            if param.kind is param.VAR_KEYWORD:
+                self.varKeyword = True
+                continue
+            self.params.append(param.name)
+            if param.default is param.empty:
+                self.required.append(param.name)
+            coercer = COERCERS.get(hints.get(param.name))
+            if coercer:
+                self.coercers[param.name] = coercer
+        owner     = getattr(func, "__self__", None)
+        actionMap = getattr(owner, "actionMap", None)
+        self.subActions = set(actionMap) if isinstance(actionMap, dict) and self.params and self.params[0] == "action" else None
+
+
+class ActionTable:
+    """
+    Dispatch table from action names to skill functions, with each function's signature
+    metadata precomputed, so executing an action is a dict lookup plus argument coercion.
+    Build it once per skill load (SkillGraph keeps it with its skill tables).
+    """
+
+    def __init__(self, actions: dict):
+        self.actions = dict(actions)
+        self.specs   = {}
+        for name, func in self.actions.items():
+            try:
+                self.specs[name] = ActionSpec(func)
+            except (TypeError, ValueError):
+                logger.debug(f"No signature for action '{name}', it is called with its arguments as given")
+
+    def __contains__(self, name):
+        return name in self.actions
+
+    def bind(self, action: ParsedAction) -> tuple:
+        """
+        Check the action against its skill's signature and return (func, args, kwargs) with the
+        arguments coerced to the annotated types. Raises ActionError explaining what doesn't fit.
+        """
+        func = self.actions.get(action.name)
+        if func is None:
+            close = difflib.get_close_matches(action.name, self.actions, n=1)
+            hint  = f", did you mean {close[0]}?" if close else ""
+            raise ActionError(f"unknown action '{action.name}'{hint}")
+        spec = self.specs.get(action.name)
+        if spec is None:
+            return func, list(action.args), dict(action.kwargs)
+
+        args = list(action.args)
+        if len(args) > len(spec.params) and not spec.varPositional:
+            raise ActionError(f"{action.name} takes {len(spec.params)} argument(s), got {len(args)}")
+        for index, name in enumerate(spec.params[:len(args)]):
+            args[index] = self._coerce(spec, action.name, name, args[index])
+        kwargs = {}
+        for name, value in action.kwargs.items():
+            if name in spec.params[:len(args)]:
+                raise ActionError(f"{action.name} got '{name}' twice")
+            if name not in spec.params and not spec.varKeyword:
+                raise ActionError(f"{action.name} has no argument '{name}' (expected {', '.join(spec.params) or 'none'})")
+            kwargs[name] = self._coerce(spec, action.name, name, value)
+        missing = [name for name in spec.required if name not in kwargs and name not in spec.params[:len(args)]]
+        if missing:
+            raise ActionError(f"{action.name} is missing argument(s) {', '.join(missing)}")
+        if spec.subActions is not None:
+            sub = args[0] if args else kwargs.get("action")
+            if str(sub).lower() not in spec.subActions:
+                raise ActionError(f"{action.name} has no action {sub!r} (expected one of {', '.join(sorted(spec.subActions))})")
+        return func, args, kwargs
+
+    def _coerce(self, spec: ActionSpec, action: str, name: str, value):
+        coercer = spec.coercers.get(name)
+        if coercer is None:
+            return value
+        try:
+            return coercer(value)
+        except (TypeError, ValueError):
+            raise ActionError(f"{action}: '{name}' should be {coercer.__name__[3:].lower()}, got {value!r}") from None
+
+
+class ActionParser:
+    """
+    Parses the model's action selection and executes it against an ActionTable.
+    - parse:   model output -> ([ParsedAction], [diagnostic]), unknown or ill-fitting actions dropped
+    - check:   the diagnostics for an output, empty when every action is valid
+    - execute: run one action (a string or a ParsedAction) and format its result like SkillLink does
+    """
+
+    def parse(self, text: str, table: ActionTable = None) -> tuple:
+        actions, diagnostics = parseActions(text)
+        if table is None:
+            return actions, diagnostics
+        valid = []
+        for action in actions:
+            try:
+                table.bind(action)
+                valid.append(action)
+            except ActionError as e:
+                diagnostics.append(str(e))
+        return valid, diagnostics
+
+    def check(self, text: str, table: ActionTable = None) -> list:
+        return self.parse(text, table)[1]
+
+    def execute(self, table: ActionTable, action):
+        try:
+            parsed = action if isinstance(action, ParsedAction) else parseCall(str(action))
+            func, args, kwargs = table.bind(parsed)
+            result = func(*args, **kwargs)
+        except ActionError as e:
+            logger.warning(f"Invalid action '{action}': {e}")
+            return f"Error executing action '{action}', {e}"
+        except Exception as ex:
+            logger.error(f"Error executing action '{action}'", exc_info=True)
+            return f"Error executing action '{action}', {ex}"
+        if isinstance(result, list):
+            return "\n".join(map(str, result))
+        if isinstance(result, dict):
+            return str(result)
+        return result
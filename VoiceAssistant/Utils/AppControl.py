@@ -0,0 +1,338 @@
+import os
+import sys
+import time
+import shlex
+import signal
+import logging
+import threading
+import subprocess
+import configparser
+
+from Utils.Config import APP_DIRS, APP_INDEX_REFRESH
+from Utils.AppResolver import AppResolver
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = sys.platform == "win32"
+
+# Desktop-entry field codes (%f, %U, ...) are filled by the launcher with files to open; there are none here
+FIELD_CODES = {"%f", "%F", "%u", "%U", "%i", "%c", "%k", "%d", "%D", "%n", "%N", "%v", "%m"}
+# Launchers whose process name says nothing about the app; closing by their name would hit every app they started
+WRAPPERS = {"flatpak", "snap", "gtk-launch", "sh", "bash", "python", "python3", "java"}
+
+
+def desktopDirs() -> list:
+    """
+    The XDG application directories, most specific first.
+    """
+    dataHome = os.getenv("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    dataDirs = (os.getenv("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":")
+    return [os.path.join(folder, "applications") for folder in [dataHome, *dataDirs] if folder]
+
+
+def pathDirs() -> list:
+    return [folder for folder in os.getenv("PATH", "").split(os.pathsep) if folder]
+
+
+def appKey(name: str) -> str:
+    key = name.strip().lower()
+    if WINDOWS:
+        for ext in os.getenv("PATHEXT", ".EXE").lower().split(";"):
+            if ext and key.endswith(ext):
+                return key[:-len(ext)]
+    return key
+
+
+def execArgv(command: str) -> list:
+    """
+    The argv of a desktop entry's Exec line, without field codes or a leading `env VAR=...`.
+    """
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return []
+    argv = [arg.replace("%%", "%") for arg in argv if arg not in FIELD_CODES]
+    if argv and os.path.basename(argv[0]) == "env":
+        argv = argv[1:]
+        while argv and "=" in argv[0] and not argv[0].startswith("-"):
+            argv = argv[1:]
+    return argv
+
+
+def readDesktopFile(path: str) -> dict:
+    """
+    Name, argv and process name of a launchable .desktop application, or None for hidden entries and non-applications.
+    """
+    parser = configparser.RawConfigParser(interpolation=None, strict=False)
+    parser.optionxform = str
+    try:
+        parser.read(path, encoding="utf-8")
+        entry = parser["Desktop Entry"]
+    except (configparser.Error, KeyError, UnicodeDecodeError):
+        return None
+    if entry.get("Type", "Application") != "Application" or entry.get("NoDisplay") == "true" or entry.get("Hidden") == "true":
+        return None
+    argv = execArgv(entry.get("Exec", ""))
+    if not argv:
+        return None
+    process = os.path.basename(argv[0])
+    if process in WRAPPERS:
+        process = entry.get("StartupWMClass") or os.path.basename(path)[:-8].split(".")[-1]
+    return {"name": entry.get("Name", ""), "argv": argv, "process": process}
+
+
+class ExecutableIndex:
+    """
+    Launchable applications by lower-case name: .desktop entries, executables in APP_DIRS and on PATH.
+    Each entry's 'kind' says which of those it came from ("desktop", "apps" or "path"); a bare PATH
+    executable may be any command-line tool, so the resolver and closeApp treat those more strictly.
+    Each directory is listed once and kept with its mtime; refresh() stats the directories and
+    re-lists only those whose contents changed (a directory's mtime moves when files are added,
+    removed or renamed), then swaps in a new merged table. Lookups never touch the filesystem.
+    """
+
+    def __init__(self, paths: list = None, desktops: list = None, appDirs: list = None):
+        self.paths    = paths
+        self.desktops = desktops
+        self.appDirs  = appDirs
+        self.dirs     = {}  # directory -> (mtime_ns, {key: entry})
+        self.apps     = {}  # key -> {'name', 'argv', 'process', 'source', 'kind'}
+        self.checked  = 0.0
+        self._lock    = threading.Lock()
+
+    def _folders(self) -> list:
+        paths    = pathDirs() if self.paths is None else self.paths
+        desktops = desktopDirs() if self.desktops is None else self.desktops
+        appDirs  = APP_DIRS if self.appDirs is None else self.appDirs
+        # Desktop entries come first so their display names and launch commands win over bare executables
+        return [(folder, "desktop") for folder in desktops] + [(folder, "apps") for folder in appDirs] + [(folder, "path") for folder in paths]
+
+    def _scan(self, folder: str, source: str) -> dict:
+        entries = {}
+        try:
+            with os.scandir(folder) as scan:
+                for item in scan:
+                    if source == "desktop":
+                        if not item.name.endswith(".desktop"):
+                            continue
+                        desktop = readDesktopFile(item.path)
+                        if desktop is None:
+                            continue
+                        entry = {"name": desktop["name"] or item.name[:-8], "argv": desktop["argv"], "process": desktop["process"],
+                                 "source": item.path, "kind": source}
+                        for key in (appKey(desktop["name"]), appKey(item.name[:-8]), appKey(desktop["process"])):
+                            if key:
+                                entries.setdefault(key, entry)
+                    else:
+                        try:
+                            if not item.is_file() or not os.access(item.path, os.X_OK):
+                                continue
+                        except OSError:
+                            continue
+                        key = appKey(item.name)
+                        if key != item.name.lower() or not WINDOWS:
+                            entries.setdefault(key, {"name": item.name, "argv": [item.path], "process": item.name, "source": item.path, "kind": source})
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            pass
+        return entries
+
+    def refresh(self, force: bool = False) -> list:
+        """
+        Re-list the directories that changed since the last refresh. Returns those directories.
+        """
+        with self._lock:
+            changed = []
+            dirs    = {}
+            for folder, source in self._folders():
+                if folder in dirs:
+                    continue
+                try:
+                    mtime = os.stat(folder).st_mtime_ns
+                except OSError:
+                    mtime = None
+                known = self.dirs.get(folder)
+                if known is not None and known[0] == mtime and not force:
+                    dirs[folder] = known
+                    continue
+                dirs[folder] = (mtime, self._scan(folder, source) if mtime is not None else {})
+                if known is None or known[1] or dirs[folder][1]:
+                    changed.append(folder)
+            if changed or dirs.keys() != self.dirs.keys():
+                apps = {}
+                for _, entries in dirs.values():
+                    for key, entry in entries.items():
+                        apps.setdefault(key, entry)
+                self.apps = apps
+            self.dirs    = dirs
+            self.checked = time.monotonic()
+            return changed
+
+    def current(self) -> dict:
+        """
+        The app table, refreshed first when it is older than APP_INDEX_REFRESH. A refresh that finds
+        changes swaps in a new dict, so callers can cache what they derive from it by identity.
+        """
+        if not self.dirs or (APP_INDEX_REFRESH and time.monotonic() - self.checked > APP_INDEX_REFRESH):
+            self.refresh()
+        return self.apps
+
+    def lookup(self, name: str) -> dict:
+        """
+        The entry for an application name.
+        """
+        return self.current().get(appKey(name))
+
+
+class ProcessTable:
+    """
+    Finds and signals running processes in-process: psutil when it is installed, otherwise /proc.
+    """
+
+    def __init__(self):
+        try:
+            import psutil
+            self.psutil = psutil
+        except ImportError:
+            self.psutil = None
+
+    def find(self, names: set) -> list:
+        """
+        Pids of live processes whose executable name is in names (lower case, without .exe).
+        Zombies (exited, not yet reaped by their parent) are skipped.
+        """
+        own = os.getpid()
+        if self.psutil is not None:
+            pids = []
+            for process in self.psutil.process_iter(["name", "status"]):
+                if process.pid != own and process.info["status"] != self.psutil.STATUS_ZOMBIE and appKey(process.info["name"] or "") in names:
+                    pids.append(process.pid)
+            return pids
+
+        # /proc/<pid>/stat gives the name and state in one read. The kernel keeps only the first 15 bytes
+        # of a name, so longer names are confirmed against the command line (argv[0], or argv[1] for a
+        # script started through its interpreter)
+        truncated = {name[:15] for name in names if len(name) > 15}
+        pids = []
+        with os.scandir("/proc") as scan:
+            for item in scan:
+                if not item.name.isdigit():
+                    continue
+                pid = int(item.name)
+                if pid == own:
+                    continue
+                try:
+                    with open(f"/proc/{pid}/stat", "rb") as handle:
+                        stat = handle.read(128)
+                    close = stat.rfind(b")")
+                    comm  = stat[stat.find(b"(") + 1:close].decode(errors="replace").lower()
+                    if stat[close + 2:close + 3] == b"Z" or (comm not in names and comm not in truncated):
+                        continue
+                    if len(comm) < 15:
+                        pids.append(pid)
+                        continue
+                    with open(f"/proc/{pid}/cmdline", "rb") as handle:
+                        argv = handle.read().split(b"\0", 2)[:2]
+                    if any(os.path.basename(arg.decode(errors="replace")).lower() in names for arg in argv):
+                        pids.append(pid)
+                except OSError:
+                    continue  # Exited while scanning, or not ours to read
+        return pids
+
+    def signal(self, pids: list, sig=signal.SIGTERM) -> int:
+        sent = 0
+        for pid in pids:
+            try:
+                os.kill(pid, sig)
+                sent += 1
+            except (ProcessLookupError, PermissionError):
+                continue
+        return sent
+
+
+class AppControl:
+    """
+    Opens applications from the executable index and closes them through the process table,
+    without a helper process per request. Spoken names go through the fuzzy AppResolver first.
+    Closing only ever targets an index entry's own process: names that aren't in the index and
+    launchers (WRAPPERS) are refused, and a bare PATH executable is closed only when it was opened here.
+    On Windows opening goes through os.startfile, and closing falls back to taskkill when psutil
+    is not installed.
+    """
+
+    def __init__(self, index: ExecutableIndex = None, processes: ProcessTable = None):
+        self.index     = index or ExecutableIndex()
+        self.processes = processes or ProcessTable()
+        self.resolver  = AppResolver(self.index)
+        self.launched  = []  # Popen of apps started here, reaped once they exit so they don't linger as zombies
+        self._lock     = threading.Lock()
+
+    def _reap(self, started=None):
+        with self._lock:
+            self.launched = [process for process in self.launched if process.poll() is None]
+            if started is not None:
+                self.launched.append(started)
+
+    def resolveName(self, appName: str) -> str:
+        """
+        The program a spoken app name most likely means, or the name itself when nothing scores high enough.
+        """
+        return self.resolver.best(appName) or appName.strip()
+
+    def openApp(self, app: str) -> str:
+        entry = self.index.lookup(app)
+        if WINDOWS:
+            os.startfile(entry["argv"][0] if entry else app)
+            return f"Opened {entry['name'] if entry else app}"
+        if entry is None:
+            return f"Could not find an application called {app}"
+        self._reap(subprocess.Popen(
+            entry["argv"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,  # Outlives the assistant and doesn't get its terminal signals
+        ))
+        return f"Opened {entry['name']}"
+
+    def closeApp(self, app: str) -> str:
+        entry = self.index.lookup(app)
+        if entry is None:
+            return f"Could not find an application called {app}"
+        process = appKey(entry["process"])
+        if process in WRAPPERS or appKey(app) in WRAPPERS:
+            return f"Won't close {entry['name']}, {process} runs other programs too"
+        self._reap()
+        if entry.get("kind") == "path":
+            # Could be any command-line tool or service; only stop the copies started by openApp
+            with self._lock:
+                pids = [started.pid for started in self.launched if started.args[0] == entry["argv"][0]]
+            if not pids:
+                return f"{entry['name']} was not opened by me, so I won't close it"
+        elif WINDOWS and self.processes.psutil is None:
+            image = process + ".exe"
+            subprocess.run(["taskkill", "/f", "/im", image], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            return f"Closed {entry['name']}"
+        else:
+            pids = self.processes.find({process})
+        if not pids:
+            return f"{entry['name']} is not running"
+        sent = self.processes.signal(pids)
+        if not sent:
+            return f"Not allowed to close {entry['name']}"
+        return f"Closed {entry['name']}"
+
+
+_appControl = None
+_appControlLock = threading.Lock()
+
+
+def getAppControl() -> AppControl:
+    """
+    The AppControl shared by the app skills, so the executable index and name resolver are built once.
+    """
+    global _appControl
+    if _appControl is None:
+        with _appControlLock:
+            if _appControl is None:
+                _appControl = AppControl()
+    return _appControl
@@ -0,0 +1,206 @@
+import re
+import json
+import logging
+import threading
+from itertools import chain
+from collections import Counter
+
+from Utils.Config import APP_ALIASES, APP_MATCH_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# Spoken names that differ from the program's name; APP_ALIASES entries are added on top
+DEFAULT_ALIASES = {
+    "vs code":     "code",
+    "vs studio":   "devenv",
+    "vs insiders": "code - insiders",
+    "word":        "winword",
+    "powerpoint":  "powerpnt",
+    "explorer":    "iexplore",
+}
+
+# Words people put around an app name that are never part of it
+FILLER = {"please", "the", "my", "a", "an", "app", "application", "program", "up", "for", "me", "now", "can", "you"}
+
+NON_WORD = re.compile(r"[^a-z0-9]+")
+CANDIDATES = 12  # Best trigram matches re-ranked by edit distance
+DICE_WEIGHT = 0.3  # Share of trigram overlap in a fuzzy score, the rest is edit distance (overlap is harsh on short names)
+EMPTY = {}
+
+
+def normalize(text: str) -> str:
+    return " ".join(NON_WORD.sub(" ", text.lower()).split())
+
+
+def squash(text: str) -> str:
+    # Recognizers split and join words freely ("note pad", "powerpoint" / "power point")
+    return text.replace(" ", "")
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def editDistance(first: str, second: str) -> int:
+    """
+    Insertions, deletions, substitutions and swaps of neighbouring letters ("pyhton") needed to turn one
+    into the other (optimal string alignment distance).
+    Bit-parallel (Hyyro 2003): one column of the distance table per character of second, held as bit
+    vectors of +1/-1 steps, so the cost is a handful of integer operations per character.
+    """
+    length = len(first)
+    if not length:
+        return len(second)
+    masks = {}
+    for i, char in enumerate(first):
+        masks[char] = masks.get(char, 0) | 1 << i
+    full, top = (1 << length) - 1, 1 << (length - 1)
+    vp, vn, d0, last, distance = full, 0, 0, 0, length
+    for char in second:
+        pm = masks.get(char, 0)
+        d0 = ((((~d0 & pm) << 1) & last) | (((pm & vp) + vp) ^ vp) | pm | vn) & full
+        hp = (vn | ~(d0 | vp)) & full
+        hn = d0 & vp
+        if hp & top:
+            distance += 1
+        elif hn & top:
+            distance -= 1
+        hp   = (hp << 1) | 1
+        vn   = hp & d0
+        vp   = ((hn << 1) | ~(d0 | hp)) & full
+        last = pm
+    return distance
+
+
+def loadAliases(path: str = APP_ALIASES) -> dict:
+    """
+    DEFAULT_ALIASES with the user's {spoken name: program} JSON file on top.
+    """
+    aliases = dict(DEFAULT_ALIASES)
+    if not path:
+        return aliases
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            aliases.update({str(alias): str(target) for alias, target in json.load(file).items()})
+    except FileNotFoundError:
+        logger.warning(f"App alias file not found: {path}")
+    except (OSError, ValueError, AttributeError):
+        logger.error(f"Could not read app aliases from {path}", exc_info=True)
+    return aliases
+
+
+class AppResolver:
+    """
+    Maps spoken app names to programs: aliases and every name in the executable index (file name,
+    .desktop Name, process name), looked up three ways and merged by score (0-1):
+    - exact match of the cleaned-up text (1.0)
+    - exact match of a run of its words, for "vs code please" or "microsoft word document"
+    - trigram overlap (Dice) through an inverted index, best few re-ranked with edit distance,
+      for misrecognized names ("note pad", "fire fox", "chromium browsr")
+    Only aliases and apps (.desktop entries, APP_DIRS) are matched by a run of words or fuzzily.
+    Bare PATH executables are mostly command-line tools with short names that nearly match anything
+    ("chrome" ~ chroot, "files" ~ file, "fire tv" ~ fire), so they must be the whole name said.
+    The tables are built on first use and rebuilt whenever the executable index swaps in a new table.
+    """
+
+    def __init__(self, index=None, aliases: dict = None):
+        self.index    = index
+        self.aliases  = loadAliases() if aliases is None else aliases
+        self.source   = None
+        self.names    = {}  # normalized name -> target
+        self.exact    = set()  # names only matched in full (bare PATH executables)
+        self.texts    = []  # candidate id -> normalized name
+        self.squashed = []  # candidate id -> normalized name without spaces
+        self.sizes    = []  # candidate id -> trigram count
+        self.postings = {}  # trigram -> candidate ids
+        self._lock    = threading.Lock()
+
+    def build(self, apps: dict):
+        names, fuzzy = {}, set()
+        # Aliases first: the user's spoken names win over whatever the index holds under the same text
+        for alias, target in self.aliases.items():
+            names.setdefault(normalize(alias), target)
+            fuzzy.add(normalize(alias))
+        for key, entry in apps.items():
+            for text in (normalize(key), normalize(entry["name"])):
+                names.setdefault(text, key)
+                if entry.get("kind") != "path":
+                    fuzzy.add(text)
+        names.pop("", None)
+
+        exact    = names.keys() - fuzzy
+        texts    = [text for text in names if text in fuzzy]
+        squashed = [squash(text) for text in texts]
+        sizes, postings = [], {}
+        for number, text in enumerate(squashed):
+            grams = trigrams(text)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(number)
+        # Swapped together, so a concurrent resolve sees either the old tables or the new ones
+        self.names, self.exact, self.texts, self.squashed, self.sizes, self.postings = names, exact, texts, squashed, sizes, postings
+        self.source = apps
+
+    def _current(self):
+        apps = self.index.current() if self.index is not None else EMPTY
+        if apps is not self.source:
+            with self._lock:
+                if apps is not self.source:
+                    self.build(apps)
+        return self.names, self.exact, self.texts, self.squashed, self.sizes, self.postings
+
+    def resolve(self, spoken: str, limit: int = 5) -> list:
+        """
+        Ranked [(target, score, matched name)] for a spoken app name, best first.
+        """
+        names, exact, texts, squashed, sizes, postings = self._current()
+        words = [word for word in normalize(spoken).split() if word not in FILLER]
+        query = " ".join(words)
+        if not query:
+            return []
+        found = {}
+
+        def offer(text, score):
+            target = names[text]
+            if target not in found or found[target][0] < score:
+                found[target] = (score, text)
+
+        if query in names:
+            offer(query, 1.0)
+        # Every run of words, longest first; a match covering more of what was said scores higher
+        for size in range(len(words) - 1, 0, -1):
+            for start in range(len(words) - size + 1):
+                span = " ".join(words[start:start + size])
+                if span in names and span not in exact:
+                    offer(span, 0.6 + 0.3 * len(span) / len(query))
+
+        compact = squash(query)
+        grams   = trigrams(compact)
+        shared  = Counter(chain.from_iterable(postings.get(gram, ()) for gram in grams))
+        # Most shared trigrams first (counted in C), then ordered by the best score each could still reach:
+        # the length difference alone sets a floor on the edit distance
+        bounds = []
+        for number, count in shared.most_common(CANDIDATES * 4):
+            dice    = 2 * count / (len(grams) + sizes[number])
+            longest = max(len(compact), len(squashed[number]))
+            bounds.append((0.95 * (DICE_WEIGHT * dice + (1 - DICE_WEIGHT) * (1 - abs(len(compact) - len(squashed[number])) / longest)), dice, number))
+        bounds.sort(reverse=True)
+        for bound, dice, number in bounds[:CANDIDATES]:
+            # Edit distance is the expensive part; skip it once a candidate can't reach the top `limit`
+            floor = sorted(score for score, _ in found.values())[-limit] if len(found) >= limit else 0.0
+            if bound <= floor:
+                break
+            text  = squashed[number]
+            close = 1 - editDistance(compact, text) / max(len(compact), len(text))
+            offer(texts[number], 0.95 * (DICE_WEIGHT * dice + (1 - DICE_WEIGHT) * close))
+
+        ranked = sorted(found.items(), key=lambda item: -item[1][0])[:limit]
+        return [(target, round(score, 3), text) for target, (score, text) in ranked]
+
+    def best(self, spoken: str, threshold: float = APP_MATCH_THRESHOLD) -> str:
+        """
+        The best target scoring at least threshold, or None.
+        """
+        ranked = self.resolve(spoken, 1)
+        return ranked[0][0] if ranked and ranked[0][1] >= threshold else None
@@ -10,5 +10,55 @@ ASSISTANT_GENDER = os.getenv("ASSISTANT_GENDER", "female").lower()
 SPEAKING_RATE = int(os.getenv("SPEAKING_RATE", 150))
 SPEAKING_PITCH = int(os.getenv("SPEAKING_PITCH", 100))  # Set pitch (not supported in pyttsx3, but is supported in pyttsx4)
 SPEAKING_VOLUME = float(os.getenv("SPEAKING_VOLUME", 1.0))
+TTS_BACKEND = os.getenv("TTS_BACKEND", "pyttsx4").lower()  # pyttsx4, null (silent) or file (writes WAVs)
+TTS_OUTPUT_DIR = os.getenv("TTS_OUTPUT_DIR", "tts_output")  # Where the file backend writes
+TTS_CACHE = os.getenv("TTS_CACHE", "False") == "True"  # Play repeated and templated replies from pre-rendered audio
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(os.getenv("CACHE_DIR", ".cache"), "tts"))
+TTS_CACHE_MB = int(os.getenv("TTS_CACHE_MB", 64))  # Least recently played renderings are deleted past this size
+TTS_CACHE_MAX_CHARS = int(os.getenv("TTS_CACHE_MAX_CHARS", 120))  # Longer replies are spoken directly, not cached
+TTS_CACHE_MIN_REPEATS = int(os.getenv("TTS_CACHE_MIN_REPEATS", 2))  # Times a reply is spoken directly before it is cached
 
-VERBOSE = os.getenv("VERBOSE", "False")
\ No newline at end of file
+STT_BACKEND = os.getenv("STT_BACKEND", "google").lower()  # google (online), vosk or whisper (offline, stream partial results)
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "models/vosk")
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base.en")
+
+MICROPHONE_INDEX = int(os.getenv("MICROPHONE_INDEX")) if os.getenv("MICROPHONE_INDEX") else None  # Input device, default when unset
+END_SILENCE_MS = int(os.getenv("END_SILENCE_MS", 350))  # Silence that ends an utterance
+
+WAKE_WORD_DIR = os.getenv("WAKE_WORD_DIR", "")  # Folder of .wav recordings of the assistant's name, empty disables the local gate
+WAKE_WORD_THRESHOLD = float(os.getenv("WAKE_WORD_THRESHOLD", 0.1))  # Highest template distance accepted as the wake word; untuned, set it from your own recordings
+WAKE_WORD_MIN_ENERGY = float(os.getenv("WAKE_WORD_MIN_ENERGY", 300))  # Frame RMS (16-bit) counted as speech
+
+VERBOSE = os.getenv("VERBOSE", "False") == "True"
+
+SPECULATIVE_TURNS = os.getenv("SPECULATIVE_TURNS", "True") == "True"  # Start the answer request alongside action selection
+TOOL_CALLING = os.getenv("TOOL_CALLING", "False") == "True"  # Select skills with the provider's native function calling instead of the text prompt
+TIMING_WINDOW = int(os.getenv("TIMING_WINDOW", 500))  # Number of samples kept per stage for p50/p95/p99 timings
+TRACING = os.getenv("TRACING", "False") == "True"  # Trace every stage of a turn (STT, skills, model calls, TTS)
+TRACE_FILE = os.getenv("TRACE_FILE", "")  # Append finished spans to this JSONL file when tracing
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "False") == "True"  # Speak each sentence as soon as it is generated
+
+SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SERVER_PORT", 8765))
+MAX_CONCURRENT_TURNS = int(os.getenv("MAX_CONCURRENT_TURNS", 8))  # Turns processed at once (server mode)
+MAX_QUEUED_TURNS = int(os.getenv("MAX_QUEUED_TURNS", 32))  # Turns allowed to wait for a slot before requests get 503
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", 1000))
+SESSION_IDLE_TIMEOUT = float(os.getenv("SESSION_IDLE_TIMEOUT", 900))  # Seconds before an unused session is dropped
+SESSION_MEMORY_TOKENS = int(os.getenv("SESSION_MEMORY_TOKENS", 1200))  # Token budget for earlier turns of each server session
+
+MEMORY_TOKENS = int(os.getenv("MEMORY_TOKENS", 0))  # Token budget for earlier turns in each answer request, 0 disables memory
+MEMORY_TURNS = int(os.getenv("MEMORY_TURNS", 20))  # Turns kept verbatim before the oldest are summarized
+MEMORY_SUMMARY_TOKENS = int(os.getenv("MEMORY_SUMMARY_TOKENS", 300))  # Part of the budget for the summary of older turns
+
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "False") == "True"  # Reuse action plans and skill-free answers for repeated utterances
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 256))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 3600))  # Seconds
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", 0))  # Cosine threshold for near-duplicate hits, 0 disables
+
+APP_DIRS = [folder for folder in os.getenv("APP_DIRS", "").split(os.pathsep) if folder]  # Extra folders of launchable programs, besides PATH and the .desktop folders
+APP_INDEX_REFRESH = float(os.getenv("APP_INDEX_REFRESH", 30))  # Seconds between checks of the app folders for added or removed programs, 0 to index once
+APP_ALIASES = os.getenv("APP_ALIASES", "")  # JSON file of {"spoken name": "program"} added to the built-in aliases
+APP_MATCH_THRESHOLD = float(os.getenv("APP_MATCH_THRESHOLD", 0.6))  # Lowest score (0-1) at which a spoken name is taken to mean an app
+
+FAST_PATH = os.getenv("FAST_PATH", "True") == "True"  # Answer clear user-skill commands without calling the model
+FAST_PATH_CONFIDENCE = float(os.getenv("FAST_PATH_CONFIDENCE", 0.6))  # Minimum phrase-match confidence (0-1) for the fast path
@@ -0,0 +1,129 @@
+import re
+import threading
+from collections import deque
+
+
+def estimateTokens(text: str) -> int:
+    """
+    Rough token count (about four characters per token for English), good enough for budgeting.
+    """
+    return (len(text) + 3) // 4 if text else 0
+
+
+def firstWords(text: str, limit: int) -> str:
+    words = text.split()
+    return " ".join(words[:limit]) + (" ..." if len(words) > limit else "")
+
+
+def extractiveSummary(turn: dict) -> str:
+    """
+    One summary line per turn: what was asked and the first sentence of the answer.
+    """
+    answer = re.split(r"(?<=[.!?])\s", turn["assistant"].strip(), maxsplit=1)[0]
+    return f"- User: {firstWords(turn['user'], 20)} / Assistant: {firstWords(answer, 25)}"
+
+
+class ConversationMemory:
+    """
+    Bounded multi-turn context for the answer request.
+    - Recent turns are kept verbatim in a ring buffer of maxTurns.
+    - When they no longer fit in budget tokens, the oldest half is folded into a running summary
+      (summarize(turn) -> line, extractive by default) that is itself capped at summaryTokens.
+      Folding in batches keeps the assembled context append-only between compactions, so the
+      request prefix (system, summary, earlier turns) stays identical and provider prompt caching hits.
+    - Nothing here is a system message: providers that fold system messages into one instruction
+      (Anthropic, Google) would otherwise get a different instruction every turn. The summary is a
+      user/assistant pair in a fixed slot right after the system prompt, and each turn's skill
+      results travel inside that turn's user message.
+    - Skill results already present in the window are not stored again, so a repeated weather
+      or time lookup doesn't repeat the same text; each result is capped at resultTokens.
+    """
+
+    SUMMARY_HEADER = "Summary of the earlier conversation:"
+    SUMMARY_ACK    = "Understood, I'll keep that in mind."
+    RESULTS_HEADER = "Results of the actions called for that request:"
+
+    def __init__(self, budget: int = 1200, maxTurns: int = 20, summaryTokens: int = 300, resultTokens: int = 120, summarize=None):
+        self.budget        = budget
+        self.summaryTokens = min(summaryTokens, budget // 2)
+        self.resultTokens  = resultTokens
+        self.summarize     = summarize or extractiveSummary
+        self.turns         = deque()
+        self.maxTurns      = maxTurns
+        self.summary       = deque()
+        self.lock          = threading.Lock()
+        self.stats         = {"turns": 0, "compactions": 0, "folded": 0, "dedupedResults": 0}
+
+    def __len__(self):
+        return len(self.turns)
+
+    def add(self, user: str, assistant: str, results: list = None):
+        """
+        Record a finished turn with the skill results its answer was built from.
+        """
+        with self.lock:
+            seen = {result for turn in self.turns for result in turn["results"]}
+            kept = []
+            for result in results or []:
+                result = self._cap(str(result).strip())
+                if not result or result in seen:
+                    self.stats["dedupedResults"] += bool(result)
+                    continue
+                seen.add(result)
+                kept.append(result)
+            turn = {"user": user, "assistant": assistant or "", "results": kept}
+            turn["tokens"] = sum(estimateTokens(message["content"]) for message in self._turnMessages(turn))
+            self.turns.append(turn)
+            self.stats["turns"] += 1
+            if len(self.turns) > self.maxTurns or self._windowTokens() > self.budget - self._summaryTokens():
+                self._compact()
+
+    def context(self) -> list:
+        """
+        Messages to place between the system prompt and the new user message, oldest first.
+        """
+        with self.lock:
+            messages = []
+            if self.summary:
+                messages.append({"role": "user", "content": "\n".join([self.SUMMARY_HEADER, *self.summary])})
+                messages.append({"role": "assistant", "content": self.SUMMARY_ACK})
+            for turn in self.turns:
+                messages.extend(self._turnMessages(turn))
+            return messages
+
+    def tokens(self) -> int:
+        with self.lock:
+            return self._windowTokens() + self._summaryTokens()
+
+    def clear(self):
+        with self.lock:
+            self.turns.clear()
+            self.summary.clear()
+
+    def _compact(self):
+        # Fold the oldest turns until the window is down to half its share of the budget
+        target = (self.budget - self.summaryTokens) // 2
+        while self.turns and (len(self.turns) > self.maxTurns // 2 or self._windowTokens() > target):
+            self.summary.append(self.summarize(self.turns.popleft()))
+            self.stats["folded"] += 1
+            if len(self.turns) <= 1:
+                break
+        while len(self.summary) > 1 and self._summaryTokens() > self.summaryTokens:
+            self.summary.popleft()
+        self.stats["compactions"] += 1
+
+    def _turnMessages(self, turn: dict) -> list:
+        user = turn["user"]
+        if turn["results"]:
+            user = "\n\n".join([user, "\n".join([self.RESULTS_HEADER, *turn["results"]])])
+        return [{"role": "user", "content": user}, {"role": "assistant", "content": turn["assistant"]}]
+
+    def _windowTokens(self) -> int:
+        return sum(turn["tokens"] for turn in self.turns)
+
+    def _summaryTokens(self) -> int:
+        return estimateTokens("\n".join([self.SUMMARY_HEADER, *self.summary, self.SUMMARY_ACK])) if self.summary else 0
+
+    def _cap(self, text: str) -> str:
+        limit = self.resultTokens * 4
+        return text if len(text) <= limit else text[:limit].rstrip() + " ..."
@@ -0,0 +1,103 @@
+import time
+import threading
+import logging
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+class IntentRouter:
+    """
+    Pre-LLM router. Asks the user skills first and answers directly when one of them
+    matches the utterance with enough confidence, otherwise falls back to the LLM path.
+    Records which path served each turn and how long it took.
+    - getGraph:  callable returning the SkillGraph that provides matchUserAction and runUserAction
+    - fallback:  callable(ctx, verbose) returning the LLM answer (Core.processInput)
+    - streamFallback: optional callable(ctx, verbose) yielding the LLM answer (Core.processInputStream)
+    - threshold: minimum match confidence for the fast path
+    - memory:    optional ConversationMemory; fast-path turns are added to it so later LLM turns
+                 see them (the fallbacks add their own turns)
+    """
+
+    def __init__(self, getGraph, fallback, streamFallback=None, threshold: float = 0.6, memory=None):
+        self.getGraph       = getGraph
+        self.fallback       = fallback
+        self.streamFallback = streamFallback
+        self.threshold      = threshold
+        self.memory         = memory
+        self.lastPath       = None
+        self.prefetched     = None
+        self.counts         = defaultdict(int)
+        self.latencies      = defaultdict(list)
+        self.lock           = threading.Lock()
+
+    def route(self, ctx: str, verbose: bool = False, stream: bool = False):
+        """
+        Serve one turn. Returns the answer text, or a token generator when stream is set
+        and the turn goes to the LLM.
+        """
+        start  = time.perf_counter()
+        answer = self.tryFastPath(ctx, verbose)
+        if answer is not None:
+            self._record("skill", start)
+            if self.memory is not None:
+                self.memory.add(ctx, answer)
+            return answer
+        if stream and self.streamFallback:
+            self._record("llm", None)
+            return self.streamFallback(ctx, verbose)
+        answer = self.fallback(ctx, verbose)
+        self._record("llm", start)
+        return answer
+
+    def prefetch(self, partial: str):
+        """
+        Match a partial transcript while the user is still speaking.
+        The next turn reuses the match when its final text is the same.
+        """
+        try:
+            self.prefetched = (partial, self.getGraph().matchUserAction(partial))
+        except Exception:
+            logger.error(f"Error matching partial transcript '{partial}':", exc_info=True)
+
+    def tryFastPath(self, ctx: str, verbose: bool = False):
+        """
+        Run the best-matching user skill if it clears the threshold. Returns its result or None.
+        """
+        prefetched, self.prefetched = self.prefetched, None
+        match = prefetched[1] if prefetched and prefetched[0] == ctx else self.getGraph().matchUserAction(ctx)
+        if not match:
+            return None
+        skill, phrase, confidence = match
+        if verbose:
+            print(f"Fast path candidate: {skill.__class__.__name__} '{phrase}' ({confidence:.2f})")
+        if confidence < self.threshold:
+            return None
+        try:
+            result = self.getGraph().runUserAction(match, ctx)
+        except Exception:
+            logger.error(f"Error executing fast path for '{ctx}':", exc_info=True)
+            return None
+        return None if result is None else str(result)
+
+    def stats(self) -> dict:
+        """
+        Turns served per path with their average latency in milliseconds.
+        Streamed LLM turns are counted but not timed.
+        """
+        with self.lock:
+            return {
+                path: {
+                    "turns": self.counts[path],
+                    "avgMs": sum(self.latencies[path]) / len(self.latencies[path]) * 1000 if self.latencies[path] else None,
+                }
+                for path in self.counts
+            }
+
+    def _record(self, path: str, start):
+        with self.lock:
+            self.lastPath = path
+            self.counts[path] += 1
+            if start is not None:
+                self.latencies[path].append(time.perf_counter() - start)
+                del self.latencies[path][:-500]
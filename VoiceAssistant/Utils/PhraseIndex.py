@@ -0,0 +1,143 @@
+import re
+import inspect
+from collections import deque
+
+WORD = re.compile(r"\w+")
+# Words around a command that carry no argument ("open word please", "what is the time now")
+FILLER = {"please", "the", "a", "an", "my", "now", "just", "can", "could", "you", "me", "for", "up", "hey", "ok", "okay"}
+ARGUMENT_WORDS = 3  # Words an action's argument may take before the match gets less certain
+
+
+def takesArgument(action) -> bool:
+    """
+    Whether an action uses the text after its phrase: it has a named positional parameter
+    (apps' _openApp(appName)), rather than only *args (date_time's _getCurrentTime).
+    """
+    try:
+        parameters = inspect.signature(action).parameters.values()
+    except (TypeError, ValueError):
+        return True
+    return any(p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in parameters)
+
+
+class PhraseIndex:
+    """
+    Compiled matcher for user-skill trigger phrases.
+    An Aho-Corasick automaton over words, so one pass over the utterance finds every
+    trigger phrase it contains, however many skills and phrases are registered.
+    Phrases match on whole words: "open" matches "open word" but not "reopen".
+    """
+
+    def __init__(self):
+        self.goto     = [{}]
+        self.fail     = [0]
+        self.outputs  = [[]]
+        self.entries  = []  # (skill, phrase, wordCount, argument) per phrase id
+        self.compiled = True
+
+    @classmethod
+    def fromSkills(cls, skills):
+        """
+        Build the index from every skill exposing an actionMap of trigger phrases.
+        """
+        index = cls()
+        for skill in skills:
+            for phrase, action in (getattr(skill, 'actionMap', None) or {}).items():
+                index.add(phrase, skill, takesArgument(action))
+        index.compile()
+        return index
+
+    @staticmethod
+    def tokenize(text: str) -> list:
+        return WORD.findall(text.lower())
+
+    @staticmethod
+    def confidence(extraWords: int, argument: bool) -> float:
+        """
+        How much of the utterance the phrase and its action account for, from the words outside
+        the phrase that aren't filler:
+        - an action without an argument ignores them, so any such word ("what is the time in tokyo")
+          means the request asks for more than the action does: 0.0
+        - an action with an argument takes up to ARGUMENT_WORDS of them ("open visual studio code")
+          at 1.0, dropping with every word past that; with none it has nothing to act on: 0.5
+        """
+        if not argument:
+            return 0.0 if extraWords else 1.0
+        if not extraWords:
+            return 0.5
+        return 1.0 / (1.0 + 0.25 * max(0, extraWords - ARGUMENT_WORDS))
+
+    def add(self, phrase: str, skill, argument: bool = True):
+        words = self.tokenize(phrase)
+        if not words:
+            return
+        state = 0
+        for word in words:
+            nextState = self.goto[state].get(word)
+            if nextState is None:
+                nextState = len(self.goto)
+                self.goto[state][word] = nextState
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            state = nextState
+        self.outputs[state].append(len(self.entries))
+        self.entries.append((skill, phrase, len(words), argument))
+        self.compiled = False
+
+    def compile(self):
+        """
+        Compute failure links breadth-first and fold suffix outputs into each state.
+        """
+        queue = deque()
+        for state in self.goto[0].values():
+            self.fail[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for word, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(word, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+        self.compiled = True
+
+    def match(self, text: str):
+        """
+        Return (skill, phrase, confidence) for the best phrase in the text, or None.
+        The best phrase covers the most words; ties go to the phrase registered first.
+        """
+        if not self.compiled:
+            self.compile()
+        words = self.tokenize(text)
+        best  = None
+        end   = 0
+        state = 0
+        for position, word in enumerate(words):
+            while state and word not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(word, 0)
+            for entryId in self.outputs[state]:
+                if best is None or self.entries[entryId][2] > self.entries[best][2] or (
+                    self.entries[entryId][2] == self.entries[best][2] and entryId < best
+                ):
+                    best, end = entryId, position + 1
+        if best is None:
+            return None
+        skill, phrase, phraseWords, argument = self.entries[best]
+        extra = sum(word not in FILLER for word in words[:end - phraseWords] + words[end:])
+        return skill, phrase, self.confidence(extra, argument)
+
+    @classmethod
+    def remainder(cls, text: str, phrase: str) -> str:
+        """
+        The text with the first whole-word occurrence of the phrase removed, lower-cased, as the
+        argument for the phrase's action ("open word please" minus "open" is "word please").
+        """
+        pattern = r"\b" + r"\W+".join(re.escape(word) for word in cls.tokenize(phrase)) + r"\b"
+        return " ".join(re.sub(pattern, " ", text.lower(), count=1).split())
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,128 @@
+import re
+import math
+import time
+import zlib
+import threading
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """
+    Cache of action plans and answers for repeated utterances.
+    - Exact tier: keyed by the normalized utterance.
+    - Similarity tier (optional): character-trigram hashing vectors compared by cosine,
+      used when similarity is above 0 and no exact entry exists. Only entries whose plan has
+      no actions can match this way: "close word" is close to "open word" by spelling, but
+      must not replay its plan.
+    Entries are evicted least-recently-used past maxEntries and expire after ttl seconds.
+
+    Each entry holds the action plan and, only for plans without actions, the answer.
+    Answers built from skill results (time, date, weather...) are never stored,
+    so a hit on such an utterance still runs the skills and the final call.
+    """
+
+    def __init__(self, maxEntries: int = 256, ttl: float = 3600, similarity: float = 0.0, dimensions: int = 1024):
+        self.maxEntries = maxEntries
+        self.ttl        = ttl
+        self.similarity = similarity
+        self.dimensions = dimensions
+        self.entries    = OrderedDict()
+        self.lock       = threading.Lock()
+        self.counters   = {"exactHits": 0, "similarHits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        text = re.sub(r"[^\w\s]", " ", text.lower())
+        return " ".join(text.split())
+
+    def get(self, utterance: str):
+        """
+        Return the cached entry as {'plan': [...], 'response': str or None}, or None on a miss.
+        """
+        key = self.normalize(utterance)
+        now = time.monotonic()
+        with self.lock:
+            entry = self._live(key, now)
+            if entry is not None:
+                self.counters["exactHits"] += 1
+                return self._public(entry)
+            if self.similarity > 0:
+                vector = self._embed(key)
+                best, bestScore = None, self.similarity
+                for otherKey in list(self.entries):
+                    other = self._live(otherKey, now, touch=False)
+                    if other is None or other["plan"]:
+                        continue
+                    score = self._cosine(vector, other["vector"])
+                    if score >= bestScore:
+                        best, bestScore = otherKey, score
+                if best is not None:
+                    self.entries.move_to_end(best)
+                    self.counters["similarHits"] += 1
+                    return self._public(self.entries[best])
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, utterance: str, plan: list, response: str = None):
+        """
+        Store the action plan for an utterance. The response is only kept when the plan is empty.
+        """
+        key = self.normalize(utterance)
+        if not key:
+            return
+        entry = {
+            "plan":     list(plan or []),
+            "response": None if plan else response,
+            "expires":  time.monotonic() + self.ttl,
+            "vector":   self._embed(key) if self.similarity > 0 else None,
+        }
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self.counters["stores"] += 1
+            while len(self.entries) > self.maxEntries:
+                self.entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            stats = dict(self.counters)
+            stats["entries"] = len(self.entries)
+        lookups = stats["exactHits"] + stats["similarHits"] + stats["misses"]
+        stats["hitRate"] = (stats["exactHits"] + stats["similarHits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            for name in self.counters:
+                self.counters[name] = 0
+
+    def _live(self, key: str, now: float, touch: bool = True):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry["expires"] <= now:
+            del self.entries[key]
+            self.counters["evictions"] += 1
+            return None
+        if touch:
+            self.entries.move_to_end(key)
+        return entry
+
+    def _public(self, entry: dict) -> dict:
+        return {"plan": list(entry["plan"]), "response": entry["response"]}
+
+    def _embed(self, text: str) -> dict:
+        padded = f"  {text} "
+        counts = {}
+        for i in range(len(padded) - 2):
+            bucket = zlib.crc32(padded[i:i + 3].encode()) % self.dimensions
+            counts[bucket] = counts.get(bucket, 0) + 1
+        norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+        return {bucket: v / norm for bucket, v in counts.items()}
+
+    def _cosine(self, a: dict, b: dict) -> float:
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(v * b.get(bucket, 0.0) for bucket, v in a.items())
@@ -0,0 +1,144 @@
+import os
+import sys
+import inspect
+import hashlib
+import logging
+import importlib.util
+
+logger = logging.getLogger(__name__)
+
+
+def loadSkillFile(path: str, moduleName: str) -> list:
+    """
+    Load one skill module from its file and return its components, the way SkillLink's
+    Loader._loadSkillsFromDirectory does for each file of a directory: an instance of every class
+    defined in the module, plus the module itself when it has an actionMap or public top-level
+    functions. SkillLink only loads whole directories, so this is the same per-file step on its own
+    (Tests/test_SkillCatalog.py checks both give the same components). It differs in three ways:
+    - moduleName is qualified by group (SkillLink registers every file as _dynamic_<stem>, so
+      User/apps.py and Agent/apps.py replace each other in sys.modules)
+    - a module that fails to load raises instead of being skipped, so the catalog can keep its
+      last working version, and the previous sys.modules entry is put back
+    - it only loads files; SkillLink's loading of skills from an importable package is not used here
+    """
+    spec     = importlib.util.spec_from_file_location(moduleName, path)
+    module   = importlib.util.module_from_spec(spec)
+    previous = sys.modules.get(moduleName)
+    sys.modules[moduleName] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        # The previous version stays registered, its functions still resolve their module
+        if previous is not None:
+            sys.modules[moduleName] = previous
+        else:
+            sys.modules.pop(moduleName, None)
+        raise
+
+    components = []
+    for _, cls in inspect.getmembers(module, inspect.isclass):
+        if cls.__module__ != moduleName:
+            continue
+        try:
+            components.append(cls())
+        except Exception:
+            logger.error(f"Failed to instantiate {cls.__name__} in {os.path.basename(path)}", exc_info=True)
+    actionMap = getattr(module, "actionMap", None) or getattr(module, "ACTION_MAP", None)
+    publicFuncs = [
+        fn for name, fn in inspect.getmembers(module, inspect.isfunction)
+        if fn.__module__ == moduleName and not name.startswith("_")
+    ]
+    if isinstance(actionMap, dict) or publicFuncs:
+        components.append(module)
+    return components
+
+
+class SkillCatalog:
+    """
+    The skill modules of one directory, tracked per file.
+    refresh() stats the directory (one scandir, no file reads when nothing changed), re-reads
+    only files whose size or mtime moved, and reloads a module only when its content hash
+    differs, so the cost of a reload follows the number of edited files, not the number of skills.
+    Each file keeps its own components and lazily built prompt parts (capabilities, metadata).
+    """
+
+    def __init__(self, directory: str, group: str):
+        self.directory = directory
+        self.group     = group
+        self.entries   = {}  # file name -> {'stat', 'hash', 'components', 'parts'}
+
+    def refresh(self) -> dict:
+        """
+        Bring the catalog in line with the directory. Returns {'added', 'changed', 'removed'} file names.
+        """
+        diff    = {"added": [], "changed": [], "removed": []}
+        found   = {}
+        # Copy on write: readers keep iterating the previous table while this one is built
+        entries = dict(self.entries)
+        try:
+            with os.scandir(self.directory) as scan:
+                for item in scan:
+                    if item.name.endswith(".py") and item.name != "__init__.py" and item.is_file():
+                        stat = item.stat()
+                        found[item.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            logger.error(f"Skills directory not found: {self.directory}")
+
+        for name in [name for name in entries if name not in found]:
+            del entries[name]
+            sys.modules.pop(self._moduleName(name), None)
+            diff["removed"].append(name)
+
+        for name, stat in sorted(found.items()):
+            entry = entries.get(name)
+            if entry is not None and entry["stat"] == stat:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "rb") as f:
+                    digest = hashlib.sha1(f.read()).hexdigest()
+            except OSError:
+                continue
+            if entry is not None and entry["hash"] == digest:
+                # Touched or saved without edits: nothing to reload
+                entries[name] = {**entry, "stat": stat}
+                continue
+            try:
+                components = loadSkillFile(path, self._moduleName(name))
+            except Exception:
+                # Keep serving the last good version until the file is fixed
+                logger.warning(f"Could not load module from {path}", exc_info=True)
+                entries[name] = {**entry, "stat": stat} if entry else {"stat": stat, "hash": digest, "components": [], "parts": {}}
+                continue
+            entries[name] = {"stat": stat, "hash": digest, "components": components, "parts": {}}
+            diff["changed" if entry is not None else "added"].append(name)
+        self.entries = entries
+        return diff
+
+    def components(self) -> list:
+        entries = self.entries
+        return [component for name in sorted(entries) for component in entries[name]["components"]]
+
+    def part(self, key: str, build, entries: dict = None) -> list:
+        """
+        A prompt part (a list) for the whole catalog, built per file with build(components) and
+        cached with that file, so only new or edited modules are introspected again.
+        entries can be an earlier table (see refresh) to get the part as it was before a reload.
+        """
+        result  = []
+        entries = self.entries if entries is None else entries
+        for name in sorted(entries):
+            parts = entries[name]["parts"]
+            if key not in parts:
+                parts[key] = build(entries[name]["components"])
+            result.extend(parts[key])
+        return result
+
+    def fingerprint(self, digest):
+        entries = self.entries
+        for name in sorted(entries):
+            digest.update(f"{self.group}/{name}:{entries[name]['hash']}".encode())
+
+    def _moduleName(self, name: str) -> str:
+        # Qualified by group so User/apps.py and Agent/apps.py don't replace each other in sys.modules
+        return f"_skills_{self.group.lower()}_{name[:-3]}"
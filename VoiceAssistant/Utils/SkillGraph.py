@@ -1,14 +1,20 @@
 
 import json
 import re
+import time
 import inspect
 import os
+import hashlib
 import threading
 import logging
 from dotenv import load_dotenv
-from pathlib import Path
 
 from SkillLink import SkillLink # Dont for get to pip install SkillLink
+from Utils.ActionExecutor import ActionExecutor
+from Utils.ActionParser import ActionParser, ActionTable
+from Utils.PhraseIndex import PhraseIndex
+from Utils.SkillCatalog import SkillCatalog
+from Utils.Tracing import span, propagate
 
 load_dotenv()
 
@@ -37,7 +43,19 @@ class SkillGraph:
         self.baseSkillsDir     = self.getDir('Skills')
         self.printCapabilities = os.getenv('SHOW_CAPABILITIES', 'False') == 'True'
         self.printMetaData     = os.getenv('SHOW_METADATA', 'False') == 'True'
+        self.maxWorkers        = int(os.getenv('MAX_WORKERS', 4))
+        self.actionTimeout     = float(os.getenv('ACTION_TIMEOUT', 0)) or None
+        self.actionExecutor    = ActionExecutor(self.maxWorkers, self.actionTimeout)
+        self.actionParser      = ActionParser()
+        self.promptCacheFile   = self.getDir(os.getenv('CACHE_DIR', '.cache'), 'SkillPrompt.json')
+        self.promptCache       = {}
+        self.promptLock        = threading.Lock()
+        self.reloadLock        = threading.Lock()
+        self.reloadInterval    = float(os.getenv('SKILL_RELOAD_INTERVAL', 0))
+        self.watcher           = None
         self.loadAllComponents()
+        if self.reloadInterval > 0:
+            self.startWatching(self.reloadInterval)
 
     def getDir(self, *paths):
         return self.skillLink.getDir(*paths)
@@ -47,63 +65,154 @@ class SkillGraph:
         Load all components from the specified directories.
         This method loads skills and tools from the 'Skills' directory.
         It also loads custom tools for the agent.
-        """
-        self.userSkills  = []
-        self.agentSkills = []
-
-        self.skillLink.loadComponents(
-            paths=[
-                [self.getDir(self.baseSkillsDir, 'User')],
-                [self.getDir(self.baseSkillsDir, 'Agent')],
-            ],
-            components=[
-                self.userSkills,
-                self.agentSkills,
-            ],
-            reloadable=[
-                False,
-                False,
-            ]
-        )
+        Each directory is a SkillCatalog that tracks its modules per file, so reloadSkills
+        only has to load the files that changed.
+        """
+        with self.reloadLock:
+            self.catalogs = {
+                'User': SkillCatalog(self.getDir(self.baseSkillsDir, 'User'), 'User'),
+                'Agent': SkillCatalog(self.getDir(self.baseSkillsDir, 'Agent'), 'Agent'),
+            }
+            for catalog in self.catalogs.values():
+                catalog.refresh()
+            self._swapTables(rebuildIndex=True)
+
+    # The skill tables are replaced as a whole on reload, so a turn that already
+    # holds them keeps a consistent set until it finishes
+    @property
+    def userSkills(self):
+        return self.tables['userSkills']
+
+    @property
+    def agentSkills(self):
+        return self.tables['agentSkills']
+
+    @property
+    def phraseIndex(self):
+        return self.tables['phraseIndex']
+
+    def _swapTables(self, rebuildIndex: bool):
+        userSkills = self.catalogs['User'].components()
+        self.tables = {
+            'userSkills': userSkills,
+            'agentSkills': self.catalogs['Agent'].components(),
+            'phraseIndex': PhraseIndex.fromSkills(userSkills) if rebuildIndex else self.phraseIndex,
+        }
+        self.invalidatePromptCache()
 
     def getUserActions(self, content):
         """
         Get user actions based on the provided content.
         This method combines dynamic, static, and restricted user skills to return the available actions.
         Use only if you want to get user actions based on the content provided.
-        """
-        skills = (
-            self.userSkills
-        )
+        The phrase index picks the matching skill and action in one pass; skills without an actionMap are still asked in turn.
+        """
+        match = self.phraseIndex.match(content)
+        if match:
+            try:
+                result = self.runUserAction(match, content)
+            except Exception:
+                logger.error(f"Error executing user action '{match[1]}' for '{content}':", exc_info=True)
+                result = None
+            if result is not None:
+                return result
+        skills = [
+            skill for skill in self.userSkills
+            if not getattr(skill, 'actionMap', None)
+        ]
         return self.skillLink.getComponents(skills, content)
 
+    def matchUserAction(self, content):
+        """
+        Find the user skill whose trigger phrase best matches the content, without executing it.
+        Returns (skill, phrase, confidence) or None. Confidence measures how much of the content the
+        phrase and its action's argument cover (see PhraseIndex.confidence), so "open word" scores higher
+        than a long request that merely contains "open", and "what is the time in tokyo" scores 0.
+        Uses the phrase index compiled from all user skills at load time.
+        """
+        return self.phraseIndex.match(content)
+
+    def runUserAction(self, match, content):
+        """
+        Run the action a phrase-index match points at, with the rest of the content as its argument.
+        Dispatches straight to the matched phrase, so the skill's own substring scan (which would find
+        "open" inside "reopen") never runs.
+        """
+        skill, phrase, _ = match
+        return skill.actionMap[phrase](self.phraseIndex.remainder(content, phrase))
+
     def getAgentActions(self):
         """
         Get self actions based on the skills available.
         This method combines dynamic, static, and restricted self skills.
+        Resolved once per skill load and kept with the skill tables.
         """
-        skills = (
-            self.agentSkills
-        )
-        return self.skillLink.getComponents(skills)
+        return self.getActionTable().actions
 
-    def reloadSkills(self):
+    def getActionTable(self):
+        """
+        The name -> callable dispatch table of the agent skills, with their signatures precomputed.
         """
-        Reload all skills and print any new skills added.
+        tables = self.tables
+        if 'actionTable' not in tables:
+            skills = (
+                self.agentSkills
+            )
+            tables['actionTable'] = ActionTable(self.skillLink.getComponents(skills))
+        return tables['actionTable']
+
+    def _tableFor(self, actions):
+        table = self.getActionTable()
+        return table if actions is None or actions is table.actions else ActionTable(actions)
+
+    def reloadSkills(self):
         """
-        original = self.getMetaData()
-        self.skillLink.reloadSkills()
-        new = self.getMetaData()
-        for skill in new:
-            if skill not in original:
+        Reload the skill modules that were added, edited or removed since the last load and print any new skills added.
+        Unchanged files are not read again, and files whose content hash is unchanged are not reloaded.
+        Returns the changed file names per group (empty when nothing changed).
+        """
+        with self.reloadLock:
+            previous = self.catalogs['Agent'].entries
+            diffs = {group: catalog.refresh() for group, catalog in self.catalogs.items()}
+            if not any(files for diff in diffs.values() for files in diff.values()):
+                return {}
+            self._swapTables(rebuildIndex=any(diffs['User'].values()))
+        original = {skill['className'] for skill in self._agentMetaData(previous)}
+        for skill in self._agentMetaData():
+            if skill['className'] not in original:
                 print(f"I've added the new skill {skill['className']} That {skill['description']}.\n")
+        return {group: diff for group, diff in diffs.items() if any(diff.values())}
+
+    def startWatching(self, interval: float = 2.0):
+        """
+        Poll the skill directories every interval seconds and reload changed modules on a daemon thread.
+        """
+        if self.watcher is not None:
+            return self.watcher
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    changed = self.reloadSkills()
+                    if changed:
+                        logger.info(f"Reloaded skills: {changed}")
+                except Exception:
+                    logger.error("Error reloading skills:", exc_info=True)
+        self.watcher = threading.Thread(target=watch, name="SkillWatcher", daemon=True)
+        self.watcher.start()
+        return self.watcher
 
     def getMetaData(self):
         """Get metadata for all skills."""
-        metaData = (
-                self.agentSkills
-        )
-        return self.skillLink.getMetaData(metaData, self.printMetaData)
+        def build():
+            metaData = self._agentMetaData()
+            if self.printMetaData:
+                self.skillLink.printMetaDataInfo(metaData)
+            return metaData
+        return self._cachedPrompt('metaData', build)
+
+    def _agentMetaData(self, entries: dict = None):
+        return self.catalogs['Agent'].part('metaData', lambda skills: self.skillLink.getMetaData(skills), entries)
 
     # ----- Skills -----
     def getAgentCapabilities(self):
@@ -112,39 +221,80 @@ class SkillGraph:
         This method retrieves the capabilities of the agent's skills and returns them in a structured format.
         """
         description = False
-        capabitites = (
-            self.agentSkills
-        )
-        return self.skillLink.getCapabilities(capabitites, self.printCapabilities, description)
+        def build():
+            # Parsed per module and cached with it, so a reload only introspects the edited files
+            capabilities = self.catalogs['Agent'].part('capabilities', lambda skills: self.skillLink.parseCapabilities(skills, description))
+            if self.printCapabilities:
+                self.skillLink.printSkillInfo(capabilities)
+            return "\n\n".join(capabilities)
+        return self._cachedPrompt('capabilities', build)
 
     def checkActions(self, action: str) -> str:
         """
         Check if the given action is valid based on the agent's skills.
-        Returns a string indicating whether the action is valid or not.
+        Returns a string indicating whether the action is valid or not:
+        empty when it is, otherwise one line per problem (syntax, unknown skill, wrong arguments).
         """
-        return self.skillLink.actionParser.checkActions(action)
+        return "\n".join(self.actionParser.check(action, self.getActionTable()))
+
+    def parseActions(self, action: str) -> tuple:
+        """
+        Parse the model's action selection into (actions, diagnostics).
+        Actions are canonical action strings that fit a known skill's signature; everything that
+        was malformed or didn't fit is described in diagnostics (and logged) instead.
+        """
+        actions, diagnostics = self.actionParser.parse(action, self.getActionTable())
+        for problem in diagnostics:
+            logger.warning(f"Action selection {action!r}: {problem}")
+        return [str(parsed) for parsed in actions], diagnostics
 
     def getActions(self, action: str) -> list:
         """
         Get a list of actions based on the given action string.
-        This method uses the skills manager's action parser to retrieve actions that match the given string.
+        This method uses the action parser to retrieve actions that match the given string.
         If the action is not found, it returns an empty list.
         """
-        return self.skillLink.actionParser.getActions(action)
+        return self.parseActions(action)[0]
 
     def executeAction(self, actions, action):
         """
         Execute a single action based on the provided actions and action string.
         You must create your own for loop if you want to execute multiple actions.
         """
-        return self.skillLink.actionParser.executeAction(actions, action)
+        return self.actionParser.execute(self._tableFor(actions), action)
 
     def executeActions(self, actions, action):
         """
         Execute both single and multiple actions based on the provided actions and action string.
         The for loop is handled internally, so you can pass a single action or a list of actions.
         """
-        return self.skillLink.actionParser.executeActions(actions, action)
+        items = self._actionList(action)
+        table = self._tableFor(actions)
+        with span("skills", actions=len(items)):
+            return [self.actionParser.execute(table, item) for item in items]
+
+    def executeActionsConcurrent(self, actions, action, timeout: float = None):
+        """
+        Execute independent actions in parallel on a bounded thread pool (MAX_WORKERS).
+        Results keep the order of the actions, an action that raises or exceeds its timeout
+        (ACTION_TIMEOUT, in seconds) returns an error string without affecting the others.
+        """
+        return self.actionExecutor.run(propagate(lambda item: self._tracedAction(actions, item)), self._actionList(action), timeout)
+
+    async def executeActionsAsync(self, actions, action, timeout: float = None):
+        """
+        Asyncio variant of executeActionsConcurrent for callers already running an event loop.
+        """
+        return await self.actionExecutor.runAsync(propagate(lambda item: self._tracedAction(actions, item)), self._actionList(action), timeout)
+
+    def _tracedAction(self, actions, item):
+        with span("skill", action=item):
+            return self.executeAction(actions, item)
+
+    def _actionList(self, action):
+        if isinstance(action, str):
+            return [a.strip() for a in action.strip().splitlines() if a.strip()]
+        return list(action)
 
     def skillInstructions(self):
         """
@@ -152,8 +302,8 @@ class SkillGraph:
         """
         # If you want to use the default skill instructions without examples, uncomment the next line
         # and comment the line below it.
-        #return self.skillLink.skillInstructions(self.getAvaCapabilities())
-        return self.skillLink.skillInstructions(self.getAvaCapabilities(), self.skillExamples())
+        #return self._cachedPrompt('instructions', lambda: self.skillLink.skillInstructions(self.getAgentCapabilities()))
+        return self._cachedPrompt('instructions', lambda: self.skillLink.skillInstructions(self.getAgentCapabilities(), self.skillExamples()))
 
     def skillExamples(self):
         """
@@ -172,6 +322,168 @@ class SkillGraph:
         )
 
 
+    # ----- Native tool calling -----
+    def getTools(self):
+        """
+        The agent skill functions by name, for native tool calling.
+        Kept with the skill tables, so a reload rebuilds them along with everything else.
+        """
+        tables = self.tables
+        if 'tools' not in tables:
+            tables['tools'] = self.skillLink.getTools(self.agentSkills)
+        return tables['tools']
+
+    def getToolSchemas(self):
+        """
+        JSON schemas ({'name', 'description', 'parameters'}) of the agent skill functions,
+        built from their signatures and docstrings. Cached per fingerprint like the skill prompt,
+        so they are introspected once and providers convert them to their own format.
+        """
+        return self._cachedPrompt('tools', lambda: self._toolSchemas(self.getTools()))
+
+    def _toolSchemas(self, tools):
+        schemas, _ = self.skillLink.getJsonTools(tools, "responses")
+        for schema in schemas:
+            schema.pop('type', None)
+            func       = tools[schema['name']]
+            owner      = getattr(func, '__self__', None)
+            parameters = inspect.signature(func).parameters
+            properties = schema['parameters']['properties']
+            for name, param in parameters.items():
+                if param.kind is param.VAR_POSITIONAL:
+                    properties[name] = {"type": "array", "items": {"type": "string"}, "description": "Arguments of the chosen action, in order"}
+                elif param.kind is param.VAR_KEYWORD:
+                    properties.pop(name, None)
+                if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD) and name in schema['parameters']['required']:
+                    schema['parameters']['required'].remove(name)
+            # Dispatcher skills (appSkill(action, *args)) get their actions as an enum
+            actionMap = getattr(owner, 'actionMap', None)
+            first     = next(iter(parameters), None)
+            if isinstance(actionMap, dict) and first in properties:
+                properties[first]['enum'] = list(actionMap)
+            if not schema['description'] and hasattr(owner, '_metaData'):
+                schema['description'] = owner._metaData().get('description', '')
+        return schemas
+
+    def toolArguments(self, func, arguments: dict) -> list:
+        """
+        Positional arguments for func from the model's named arguments, in signature order.
+        Raises ValueError when a required argument is missing.
+        """
+        values = []
+        for param in inspect.signature(func).parameters.values():
+            if param.kind is param.VAR_POSITIONAL:
+                extra = arguments.get(param.name, [])
+                values.extend(extra if isinstance(extra, list) else [extra])
+            elif param.name in arguments:
+                values.append(arguments[param.name])
+            elif param.default is param.empty:
+                raise ValueError(f"missing argument '{param.name}'")
+            else:
+                break
+        return values
+
+    def toolAction(self, name: str, arguments: dict):
+        """
+        The call as an action string ("get_weather(47.6588, -117.426)"), as the text mode would have
+        selected it, or None when the tool or a required argument is missing.
+        """
+        func = self.getTools().get(name)
+        try:
+            values = self.toolArguments(func, arguments or {}) if func else None
+        except ValueError:
+            values = None
+        if values is None:
+            return None
+        return f"{name}({', '.join(repr(value) for value in values)})"
+
+    def executeToolCalls(self, calls: list, timeout: float = None) -> list:
+        """
+        Run the model's (name, arguments) tool calls concurrently, like executeActionsConcurrent.
+        Returns one result string per call; unknown tools and bad arguments are reported back to the model.
+        """
+        tools = self.getTools()
+        def run(call):
+            name, arguments = call
+            with span("skill", action=name):
+                func = tools.get(name)
+                if func is None:
+                    return f"Unknown tool '{name}'"
+                try:
+                    values = self.toolArguments(func, arguments or {})
+                except ValueError as e:
+                    return f"Error calling '{name}', {e}"
+                result = func(*values)
+                if isinstance(result, list):
+                    return "\n".join(map(str, result))
+                return "" if result is None else str(result)
+        return self.actionExecutor.run(propagate(run), calls, timeout)
+
+
+    # ----- Prompt cache -----
+    def getFingerprint(self):
+        """
+        Hash of the skill module sources and the skill examples.
+        Cached capabilities, metadata and instructions are only reused while it stays the same.
+        Built from the per-file content hashes the catalogs already hold.
+        """
+        digest = hashlib.sha1()
+        for catalog in self.catalogs.values():
+            catalog.fingerprint(digest)
+        digest.update(self.skillExamples().encode())
+        return digest.hexdigest()
+
+    def invalidatePromptCache(self):
+        """
+        Drop the cached capabilities, metadata and instructions and re-fingerprint the skills.
+        Called whenever skills are loaded or reloaded.
+        """
+        with self.promptLock:
+            self.fingerprint = self.getFingerprint()
+            self.promptCache = {}
+
+    def _cachedPrompt(self, key, build):
+        """
+        Return a cached prompt part, building it once per fingerprint.
+        Entries are persisted to disk so a cold start with unchanged skills skips the introspection.
+        Bypassed while SHOW_CAPABILITIES or SHOW_METADATA is on so the debug output still prints.
+        """
+        if self.printCapabilities or self.printMetaData:
+            return build()
+        with self.promptLock:
+            if not self.promptCache:
+                self.promptCache = self._readPromptCache()
+            if key in self.promptCache:
+                return self.promptCache[key]
+        value = build()
+        with self.promptLock:
+            self.promptCache[key] = value
+            self._writePromptCache()
+        return value
+
+    def _readPromptCache(self):
+        try:
+            with open(self.promptCacheFile, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('fingerprint') == self.fingerprint:
+                return data.get('entries', {})
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.warning(f"Ignoring unreadable prompt cache {self.promptCacheFile}", exc_info=True)
+        return {}
+
+    def _writePromptCache(self):
+        try:
+            os.makedirs(os.path.dirname(self.promptCacheFile), exist_ok=True)
+            tmpFile = f"{self.promptCacheFile}.tmp"
+            with open(tmpFile, 'w', encoding='utf-8') as f:
+                json.dump({'fingerprint': self.fingerprint, 'entries': self.promptCache}, f)
+            os.replace(tmpFile, self.promptCacheFile)
+        except Exception:
+            logger.warning(f"Could not write prompt cache {self.promptCacheFile}", exc_info=True)
+
+
     # ----- Can be used with both skills and tools -----
     def isStructured(self, *args):
         """
@@ -0,0 +1,89 @@
+import re
+import queue
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A sentence ends at . ! ? or ; followed by whitespace, or at a line break.
+# Requiring whitespace keeps numbers like 21.5 in one piece.
+SENTENCE_END = re.compile(r'[.!?;]+["\')\]]*\s+|\n+')
+
+
+def segmentSentences(tokens, minChars: int = 12, maxChars: int = 200):
+    """
+    Group a stream of text tokens into speakable chunks.
+    A chunk is emitted at the first sentence boundary past minChars characters,
+    or at the last space before maxChars when a sentence runs too long.
+    Whatever is left when the stream ends is emitted as the final chunk.
+    """
+    buffer = ""
+    for token in tokens:
+        if not token:
+            continue
+        buffer += token
+        while buffer:
+            cut = _findCut(buffer, minChars, maxChars)
+            if cut is None:
+                break
+            chunk, buffer = buffer[:cut].strip(), buffer[cut:]
+            if chunk:
+                yield chunk
+    tail = buffer.strip()
+    if tail:
+        yield tail
+
+
+def _findCut(buffer: str, minChars: int, maxChars: int):
+    for match in SENTENCE_END.finditer(buffer):
+        if match.end() >= minChars:
+            return match.end()
+    if len(buffer) >= maxChars:
+        space = buffer.rfind(" ", 0, maxChars)
+        return space + 1 if space > 0 else maxChars
+    return None
+
+
+class SpeechStreamer:
+    """
+    Speak a token stream chunk by chunk.
+    The calling thread pulls tokens and segments them while a consumer thread
+    speaks the previous chunk, so chunk N plays while chunk N+1 is generated.
+    - sink:    callable that speaks one chunk and returns when it is done
+    - cleaner: optional callable applied to each chunk before it is spoken
+    """
+
+    def __init__(self, sink, cleaner=None, minChars: int = 12, maxChars: int = 200):
+        self.sink     = sink
+        self.cleaner  = cleaner
+        self.minChars = minChars
+        self.maxChars = maxChars
+
+    def speak(self, tokens) -> str:
+        """
+        Speak the stream and return the full text once everything has been spoken.
+        """
+        chunks  = queue.Queue()
+        spoken  = []
+        worker  = threading.Thread(target=self._consume, args=(chunks,), daemon=True)
+        worker.start()
+        try:
+            for chunk in segmentSentences(tokens, self.minChars, self.maxChars):
+                spoken.append(chunk)
+                cleaned = self.cleaner(chunk) if self.cleaner else chunk
+                if cleaned.strip():
+                    chunks.put(cleaned)
+        finally:
+            chunks.put(None)
+            worker.join()
+        return " ".join(spoken)
+
+    def _consume(self, chunks: queue.Queue):
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                return
+            try:
+                self.sink(chunk)
+            except Exception:
+                logger.error(f"Error speaking chunk '{chunk}':", exc_info=True)
@@ -0,0 +1,243 @@
+"""
+Turn-level tracing.
+Spans time the stages of a turn (speech recognition, action selection, action parsing,
+each skill, the final answer, speech output) with the monotonic clock, carry attributes
+such as token counts, and feed per-stage histograms (p50/p95/p99).
+With TRACE_FILE set, every finished span is also appended to a JSONL file.
+When TRACING is off, span() returns a shared no-op object and nothing is recorded;
+timer() keeps only the coarse always-on stage timings.
+"""
+
+import json
+import time
+import uuid
+import logging
+import threading
+import itertools
+import contextvars
+from collections import defaultdict, deque
+
+from Utils.Config import TRACING, TRACE_FILE, TIMING_WINDOW
+
+logger = logging.getLogger(__name__)
+
+_currentSpan = contextvars.ContextVar("currentSpan", default=None)
+_spanIds     = itertools.count(1)
+
+
+class _NoopSpan:
+    """Returned by span() while tracing is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+_NOOP = _NoopSpan()
+
+
+class _Timer:
+    """Returned by timer() while tracing is disabled: only feeds the stage histogram."""
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer, name: str):
+        self.tracer = tracer
+        self.name   = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, time.perf_counter() - self.start)
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+class Span:
+    __slots__ = ("tracer", "name", "attributes", "traceId", "spanId", "parentId", "start", "seconds", "_token")
+
+    def __init__(self, tracer, name: str, attributes: dict):
+        self.tracer     = tracer
+        self.name       = name
+        self.attributes = attributes
+        self.seconds    = None
+
+    def __enter__(self):
+        parent        = _currentSpan.get()
+        self.traceId  = parent.traceId if parent else uuid.uuid4().hex[:16]
+        self.parentId = parent.spanId if parent else None
+        self.spanId   = next(_spanIds)
+        self._token   = _currentSpan.set(self)
+        self.start    = time.perf_counter()
+        return self
+
+    def __exit__(self, excType, exc, tb):
+        self.seconds = time.perf_counter() - self.start
+        _currentSpan.reset(self._token)
+        if exc is not None:
+            self.attributes["error"] = repr(exc)
+        self.tracer._finish(self)
+        return False
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+class Tracer:
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(Tracer, cls).__new__(cls)
+                    cls._instance.initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, 'initialized', False):
+            return
+        self._initComponents()
+        self.initialized = True
+
+    def _initComponents(self):
+        self.enabled    = TRACING
+        self.exportPath = TRACE_FILE or None
+        self.histograms = defaultdict(lambda: deque(maxlen=TIMING_WINDOW))
+        self.histLock   = threading.Lock()
+        self.fileLock   = threading.Lock()
+        self.file       = None
+        self.origin     = time.perf_counter()
+
+    def configure(self, enabled: bool = None, exportPath: str = None):
+        """
+        Turn tracing on or off at runtime and optionally change the JSONL file ("" disables export).
+        """
+        if enabled is not None:
+            self.enabled = enabled
+        if exportPath is not None:
+            with self.fileLock:
+                if self.file is not None:
+                    self.file.close()
+                    self.file = None
+                self.exportPath = exportPath or None
+
+    def span(self, name: str, **attributes):
+        if not self.enabled:
+            return _NOOP
+        return Span(self, name, attributes)
+
+    def timer(self, name: str, **attributes):
+        """
+        Like span, but still records the stage duration in the histogram while tracing is off.
+        Used for the few coarse stages (turn, select, skills, final) that are always timed.
+        """
+        if not self.enabled:
+            return _Timer(self, name)
+        return Span(self, name, attributes)
+
+    def annotate(self, **attributes):
+        """
+        Add attributes to the span that is currently open on this thread, if any.
+        """
+        if self.enabled:
+            span = _currentSpan.get()
+            if span is not None:
+                span.attributes.update(attributes)
+
+    def record(self, name: str, seconds: float):
+        with self.histLock:
+            self.histograms[name].append(seconds)
+
+    def summary(self) -> dict:
+        """
+        Count, p50, p95 and p99 in milliseconds per stage.
+        """
+        with self.histLock:
+            stages = {name: list(values) for name, values in self.histograms.items() if values}
+        return {
+            name: {
+                "count": len(values),
+                "p50": percentile(values, 50) * 1000,
+                "p95": percentile(values, 95) * 1000,
+                "p99": percentile(values, 99) * 1000,
+            }
+            for name, values in stages.items()
+        }
+
+    def reset(self):
+        with self.histLock:
+            self.histograms.clear()
+
+    def _finish(self, span: Span):
+        self.record(span.name, span.seconds)
+        if not self.exportPath:
+            return
+        entry = {
+            "trace": span.traceId,
+            "span": span.spanId,
+            "parent": span.parentId,
+            "name": span.name,
+            "startMs": round((span.start - self.origin) * 1000, 3),
+            "ms": round(span.seconds * 1000, 3),
+            "thread": threading.current_thread().name,
+        }
+        entry.update(span.attributes)
+        try:
+            line = json.dumps(entry, default=str)
+            with self.fileLock:
+                if self.file is None:
+                    self.file = open(self.exportPath, "a", encoding="utf-8")
+                self.file.write(line + "\n")
+                self.file.flush()
+        except Exception:
+            logger.warning(f"Could not write trace to {self.exportPath}", exc_info=True)
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+tracer = Tracer()
+
+
+def span(name: str, **attributes):
+    """
+    Time a block as a stage: `with span("stt", backend="vosk") as s: ...; s.set(chars=12)`.
+    """
+    if not tracer.enabled:
+        return _NOOP
+    return Span(tracer, name, attributes)
+
+
+def timer(name: str, **attributes):
+    return tracer.timer(name, **attributes)
+
+
+def annotate(**attributes):
+    tracer.annotate(**attributes)
+
+
+def propagate(func):
+    """
+    Wrap func so it runs inside the caller's current span when handed to another thread.
+    """
+    if not tracer.enabled:
+        return func
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # A fresh copy per call, so the wrapper can run on several threads at once
+        return context.copy().run(func, *args, **kwargs)
+    return run
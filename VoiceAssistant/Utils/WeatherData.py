@@ -0,0 +1,122 @@
+import os
+import time
+import threading
+import logging
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+
+
+## Singleton class shared by the weather skills
+class WeatherData:
+    """
+    Forecast data layer for the weather skills.
+    One keep-alive session, one combined Open-Meteo request for current weather
+    and hourly humidity, and a short-TTL cache keyed by rounded coordinates.
+    Concurrent requests for the same location wait on a single fetch.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super(WeatherData, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, 'initialized', False):
+            return
+        self._initComponents()
+        self.initialized = True
+
+    def _initComponents(self):
+        self.baseUrl   = os.getenv('OPEN_METEO_URL', OPEN_METEO_URL)
+        self.ttl       = float(os.getenv('WEATHER_CACHE_TTL', 120))
+        self.timeout   = float(os.getenv('WEATHER_TIMEOUT', 5))
+        self.precision = 2  # Decimal places kept for the cache key, roughly 1 km
+        self.session   = self._buildSession()
+        self.cache     = {}
+        self.inflight  = {}
+        self.fetches   = 0
+        self.cacheLock = threading.Lock()
+
+    def _buildSession(self) -> requests.Session:
+        session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], allowed_methods=["GET"])
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def getForecast(self, latitude: float, longitude: float) -> dict:
+        """
+        Get the combined forecast payload for the given coordinates.
+        Served from the cache when a fresh entry exists, otherwise fetched once
+        even when several skills ask for the same location at the same time.
+        Returns {'error': ...} if the request fails; errors are never cached.
+        """
+        key = (round(float(latitude), self.precision), round(float(longitude), self.precision))
+        while True:
+            with self.cacheLock:
+                entry = self.cache.get(key)
+                if entry and entry[0] > time.monotonic():
+                    return entry[1]
+                pending = self.inflight.get(key)
+                if pending is None:
+                    pending = self.inflight[key] = threading.Event()
+                    break
+            pending.wait(self.timeout * 2)
+
+        try:
+            data = self._fetch(*key)
+            if "current_weather" in data:
+                with self.cacheLock:
+                    self.cache[key] = (time.monotonic() + self.ttl, data)
+            return data
+        finally:
+            with self.cacheLock:
+                self.inflight.pop(key, None)
+            pending.set()
+
+    def _fetch(self, latitude: float, longitude: float) -> dict:
+        self.fetches += 1
+        try:
+            response = self.session.get(
+                self.baseUrl,
+                params={
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "current_weather": "true",
+                    "hourly": "relative_humidity_2m",
+                    "windspeed_unit": "ms",  # get_wind_speed reports m/s
+                },
+                timeout=self.timeout,
+            )
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error fetching forecast for {latitude}, {longitude}:", exc_info=True)
+            return {"error": str(e)}
+
+    def currentHumidity(self, data: dict):
+        """
+        Pick the hourly humidity value for the hour of the current weather reading.
+        Falls back to the first hourly value when the times can't be matched.
+        """
+        hourly = data['hourly']
+        current = data.get('current_weather', {}).get('time', '')[:13]
+        times = hourly.get('time', [])
+        index = next((i for i, t in enumerate(times) if t[:13] == current), 0) if current else 0
+        return hourly['relative_humidity_2m'][index]
+
+    def clearCache(self):
+        with self.cacheLock:
+            self.cache.clear()
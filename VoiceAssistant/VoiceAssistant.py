@@ -1,25 +1,72 @@
-from Echo.Echo import listen, keyboard, speak
-from Core.Core import processInput
-from Utils.Config import ASSISTANT_NAME, VERBOSE
+import asyncio
+from Echo.Echo import listen, keyboard, speak, speakStream, say, stopSpeaking, cleanForSpeech, prerenderPhrases
+from Core.Core import processInput, processInputStream, getGraph, warmUp, getTimings, conversation
+from Core.Session import AssistantSession
+from Utils.IntentRouter import IntentRouter
+from Utils.Config import ASSISTANT_NAME, VERBOSE, STREAM_RESPONSES, FAST_PATH, FAST_PATH_CONFIDENCE, TRACING
 
 
-def getInput(mode):
-    return listen() if mode == "voice" else keyboard()
+def getInput(mode, onPartial=None):
+    return listen(onPartial) if mode == "voice" else keyboard()
 
-if __name__ == "__main__":
-    # Choose mode at the start (could be command line, menu, or flag)
-    mode = input("Type 'v' for voice or 'k' for keyboard input: ").strip().lower()
-    mode = "voice" if mode == "v" else "keyboard"
+def speakChunk(chunk):
+    print(chunk, flush=True)
+    say(chunk)
 
+def runLoop(router, mode, read=None):
+    """
+    One turn at a time: listen or read, answer, then speak or print.
+    read replaces the microphone/keyboard, e.g. with a scripted source in benchmarks.
+    """
     while True:
-        userInput = getInput(mode)
+        userInput = read() if read else getInput(mode, router.prefetch)
         if userInput is None:
             continue
         if userInput in ["exit", "quit", "q"]:
             speak("Exiting. Goodbye!")
             break
-        response = processInput(userInput, verbose=VERBOSE)
-        if mode == "voice":
+        response = router.route(userInput, verbose=VERBOSE, stream=mode == "voice" and STREAM_RESPONSES)
+        if VERBOSE:
+            print(f"Served by: {router.lastPath}")
+        if mode == "voice" and isinstance(response, str):
             speak(response)
+        elif mode == "voice":
+            speakStream(response)
         else:
             print(f"{ASSISTANT_NAME.title()}:\n{response}\n")
+
+def printTimings():
+    print(f"{'stage':<12}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, stats in getTimings().items():
+        print(f"{stage:<12}{stats['count']:>7}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}")
+
+def runSession(router):
+    """
+    Voice and keyboard on one event loop: keeps listening while thinking or talking,
+    and a new utterance interrupts the current reply.
+    """
+    session = AssistantSession(
+        [lambda: listen(router.prefetch), keyboard],
+        lambda ctx: router.route(ctx, verbose=VERBOSE, stream=True),
+        speakChunk,
+        stop=stopSpeaking,
+        cleaner=cleanForSpeech,
+    )
+    asyncio.run(session.run())
+
+if __name__ == "__main__":
+    # Load skills and the provider client while the user picks a mode
+    warmUp()
+    # Choose mode at the start (could be command line, menu, or flag)
+    mode = input("Type 'v' for voice, 'k' for keyboard or 'b' for both with barge-in: ").strip().lower()
+    mode = {"v": "voice", "b": "both"}.get(mode, "keyboard")
+    if mode != "keyboard":
+        prerenderPhrases()
+    # Answer simple commands from the user skills without calling the model
+    router = IntentRouter(getGraph, processInput, processInputStream, FAST_PATH_CONFIDENCE if FAST_PATH else float("inf"), conversation)
+    if mode == "both":
+        runSession(router)
+    else:
+        runLoop(router, mode)
+    if TRACING:
+        printTimings()